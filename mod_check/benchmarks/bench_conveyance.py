@@ -0,0 +1,119 @@
+'''
+@summary: Benchmark the floodmodeller_api cross section conveyance calculation.
+
+Compares the "segments" method of calculate_cross_section_conveyance (one
+reduction over every panel and wetted sub-section) with the "loop" method
+(looping over each panel and sub-section in turn). Both are run on all of
+the RIVER sections in the floodmodeller_api test_data .dat files and on a
+synthetic model of river sections with channels, floodplains and panels.
+
+Usage:
+    python bench_conveyance.py [number of synthetic sections]
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import sys
+import glob
+import time
+
+import numpy as np
+
+# floodmodeller_api is imported from the dependencies folder (see menu.py)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'dependencies'))
+from floodmodeller_api import DAT
+from floodmodeller_api.units.conveyance import calculate_cross_section_conveyance
+
+TEST_DATA = os.path.join(
+    os.path.dirname(__file__), '..', 'dependencies', 'floodmodeller_api', 'test', 'test_data'
+)
+
+# Largest difference allowed between the methods, relative to the conveyance
+TOLERANCE = 1e-9
+
+
+def testDataSections():
+    """Get the x, y, n, rpl and panel arrays of every RIVER section in the test data."""
+    sections = []
+    for dat_path in sorted(glob.glob(os.path.join(TEST_DATA, '*.dat'))):
+        try:
+            dat = DAT(dat_path)
+        except Exception:
+            continue
+        for unit in dat.sections.values():
+            if unit.unit != 'RIVER':
+                continue
+            data = unit.data
+            sections.append((
+                data.X.to_numpy(dtype=np.float64), data.Y.to_numpy(dtype=np.float64),
+                data['Mannings n'].to_numpy(dtype=np.float64),
+                data.RPL.to_numpy(dtype=np.float64), data.Panel.to_numpy(dtype=bool),
+            ))
+    return sections
+
+
+def syntheticSections(count, seed=1):
+    """River sections with a channel, floodplains on each side and panels at the banks."""
+    rand = np.random.default_rng(seed)
+    sections = []
+    for _ in range(count):
+        channel = rand.integers(8, 30)
+        floodplain = rand.integers(5, 40)
+        points = 2 * floodplain + channel
+        x = np.cumsum(rand.uniform(0.5, 5, points))
+        bank_height = rand.uniform(1, 4)
+        y = np.concatenate([
+            bank_height + np.linspace(2, 0, floodplain) + rand.normal(0, 0.1, floodplain),
+            bank_height * np.sin(np.linspace(0, np.pi, channel)) * -1 + bank_height,
+            bank_height + np.linspace(0, 2, floodplain) + rand.normal(0, 0.1, floodplain),
+        ]) + rand.uniform(0, 50)
+        n = np.where(
+            (np.arange(points) >= floodplain) & (np.arange(points) < floodplain + channel),
+            0.035, 0.06
+        )
+        rpl = np.ones(points)
+        panels = np.zeros(points, dtype=bool)
+        panels[[floodplain, floodplain + channel]] = True
+        sections.append((x, y, n, rpl, panels))
+    return sections
+
+
+def compare(sections, label):
+    start = time.perf_counter()
+    loop = [calculate_cross_section_conveyance(*s, method='loop') for s in sections]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    segments = [calculate_cross_section_conveyance(*s, method='segments') for s in sections]
+    segments_time = time.perf_counter() - start
+
+    mismatches = 0
+    for a, b in zip(loop, segments):
+        if (
+            len(a) != len(b) or not np.array_equal(a.index, b.index) or
+            not np.allclose(a.values, b.values, rtol=TOLERANCE, atol=TOLERANCE)
+        ):
+            mismatches += 1
+    print('{0}: {1} sections'.format(label, len(sections)))
+    print('    loop:     {0:.2f}s'.format(loop_time))
+    print('    segments: {0:.2f}s ({1:.1f}x faster)'.format(
+        segments_time, loop_time / segments_time if segments_time > 0 else 0
+    ))
+    print('    mismatched sections: {0}'.format(mismatches))
+    return mismatches
+
+
+def main(synthetic_count):
+    mismatches = compare(testDataSections(), 'test_data RIVER sections')
+    mismatches += compare(syntheticSections(synthetic_count), 'Synthetic model')
+    return mismatches
+
+
+if __name__ == '__main__':
+    synthetic_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    sys.exit(1 if main(synthetic_count) else 0)
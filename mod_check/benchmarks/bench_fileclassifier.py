@@ -0,0 +1,129 @@
+'''
+@summary: Benchmark the model file audit classifier on a synthetic listing.
+
+Compares the shared classifier in tools/fileclassifier.py with the original
+per-instance SomeFile classification (compiling four regular expressions and
+setting eight flags for every file).
+
+Usage:
+    python bench_fileclassifier.py [number of file names]
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from mod_check.tools import fileclassifier as fcl
+
+
+NAMES = [
+    '2d_code_M01_001', '2d_zln_M01_002', '2d_bc_hx_M01_001', 'DEM_5m', 'Design_100yr',
+    'Q100_001', 'Model_v2', 'River_Reach_01', 'Results_h_Max', 'Run_001_PO',
+]
+SUFFIXES = [
+    '.shp', '.dbf', '.shx', '.prj', '.mif', '.mid', '.tcf', '.tgc', '.tbc', '.ief',
+    '.dat', '.zzn', '.csv', '.tlf', '.tsf', '.qgs', '.asc', '.flt', '.tif', '.xmdf',
+    '_empty_L.shp', '_messages_P.shp', '_check_R.mif', '_DEM_Z.flt', '_h_Max.flt',
+    '_ccA_R.shp', '_PLOT_L.shp', '_MB.csv', '.log', '.txt', '.py', '.SHP',
+]
+
+
+class LegacySomeFile(object):
+    '''
+        Original SomeFile classification, kept here for comparison
+    '''
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.path, self.name = os.path.split(filepath)
+        self.fileExt = self.name.rsplit('.',1)[-1].lower()
+
+        self.empty_re = re.compile(r'._empty_[LPRlpr]\.(shp|mif|mid|sql|sqlite)$')
+        self.messages_re = re.compile(r'.messages_?[LPRlpr]?\.(shp|mif|mid|sql|sqlite)$')
+        self.check_re = re.compile(r'.(check|DEM_M|DEM_Z)_?[LPRlpr]?\.(shp|mif|mid|flt|asc|tiff{0,1}|sql|sqlite)$')
+        self.result_re = re.compile(r'_(ccA|mmH|mmQ|mmV|PLOT_[LPRlpr]|TS|[dhvDHV]_Max|T(Dur|Exc)|ZUK|input_layers).*\.(shp|mif|mid|sql|sqlite|flt|xml)$')
+
+        self.ignoreFile = self.fileExt in fcl.ignore_file_exts
+        self.tuflow_modelFile = self.fileExt in fcl.tuflow_model_file_exts
+        self.fm_modelFile = self.fileExt in fcl.fm_model_file_exts
+        self.gisFile = self.fileExt in fcl.gis_file_exts
+        self.resultFile = self.fileExt in fcl.result_file_exts
+        self.logFile = self.fileExt in fcl.log_file_exts
+        self.csvFile = self.fileExt == 'csv'
+        self.workspaceFile = self.fileExt in fcl.workspace_file_exts
+
+    def isGisFile(self):
+        if self.gisFile:
+            if re.search(self.empty_re, self.name):
+                return False
+            if re.search(self.messages_re, self.name):
+                return False
+            if re.search(self.check_re, self.name):
+                return False
+            if re.search(self.result_re, self.name):
+                return False
+            return True
+        return False
+
+    def category(self):
+        if self.ignoreFile:
+            return fcl.IGNORE
+        elif self.tuflow_modelFile:
+            return fcl.TUFLOW_MODEL
+        elif self.fm_modelFile:
+            return fcl.FM_MODEL
+        elif self.isGisFile():
+            return fcl.GIS
+        elif self.logFile:
+            return fcl.LOG
+        elif self.resultFile:
+            return fcl.RESULT
+        elif self.workspaceFile:
+            return fcl.WORKSPACE
+        elif self.csvFile:
+            return fcl.CSV
+        else:
+            return fcl.OTHER
+
+
+def syntheticListing(count, seed=1):
+    rand = random.Random(seed)
+    return [
+        'C:/Model/{0}/{1}_{2}{3}'.format(
+            i % 500, rand.choice(NAMES), i, rand.choice(SUFFIXES)
+        ) for i in range(count)
+    ]
+
+
+def main(count):
+    paths = syntheticListing(count)
+    print('Classifying {0} file names'.format(len(paths)))
+
+    start = time.perf_counter()
+    legacy = [LegacySomeFile(p).category() for p in paths]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    shared = [fcl.classifyFile(os.path.split(p)[1])[1] for p in paths]
+    shared_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(legacy, shared) if a != b)
+    print('Legacy SomeFile:    {0:.2f}s'.format(legacy_time))
+    print('Shared classifier:  {0:.2f}s ({1:.1f}x faster)'.format(
+        shared_time, legacy_time / shared_time
+    ))
+    print('Mismatched categories: {0}'.format(mismatches))
+    return mismatches
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    sys.exit(1 if main(count) else 0)
@@ -0,0 +1,177 @@
+'''
+@summary: Benchmark the FMP stability check on synthetic node results.
+
+Compares checkStability in tools/fmpstabilitycheck.py with the original
+per-node loops from FmpStabilityCheckDialog.checkStability. The original is
+only run on a sample of the nodes (it's far too slow to run on all of them)
+and the time is scaled up to the full set for comparison.
+
+The spectral check (checkSpectralStability) is timed as well, along with how
+many of the nodes with added oscillations each check finds.
+
+Usage:
+    python bench_fmpstability.py [number of nodes] [number of timesteps]
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+# floodmodeller_api is imported from the dependencies folder (see menu.py)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'dependencies'))
+from mod_check.tools import fmpstabilitycheck as fmps_check
+
+# Number of nodes the original loops are run on
+LEGACY_SAMPLE = 40
+
+
+def legacyCheckStability(data, times, save_interval, series_type):
+    '''
+        Original FmpStabilityCheckDialog.checkStability, kept here for comparison
+    '''
+    TOL = 1.5
+    SMOOTH_TIME_WINDOW = 0.5
+    if series_type == 'Flow':
+        DY2_MIN_TOL = 1
+    else:
+        DY2_MIN_TOL = 0.2
+
+    DX = save_interval
+    derivs = []
+    failed_nodes = []
+    for i, series in enumerate(data):
+        window_length = -1
+        found_timewindow = False
+        found_hourlength = False
+        for j, t in enumerate(times):
+            if found_timewindow and found_hourlength:
+                break
+
+            if not found_timewindow and t - times[0] >= SMOOTH_TIME_WINDOW:
+                window_length = j
+                found_timewindow = True
+            if t - times[0] >= 1:
+                hour_length = j
+                found_hourlength = True
+
+        new_series = []
+        count = 0
+        for j, s in enumerate(series):
+            if j > window_length:
+                mysum = sum(series[j-window_length:j])
+                mylen = len(series[j-window_length:j])
+            else:
+                mysum = sum(series[j-count:j])
+                mylen = len(series[j-count:j])
+
+            if j == 0:
+                new_series.append(s)
+            else:
+                new_series.append(mysum / mylen)
+            count += 1
+        dy = np.diff(new_series, n=1) / DX
+        dy2 = np.diff(new_series, n=2) / DX
+
+        status = 'Passed'
+        fail_times = []
+        for j, val in enumerate(dy2):
+            if j > hour_length:
+                maxdy2 = max(dy2[j-hour_length:j])
+                mindy2 = min(dy2[j-hour_length:j])
+                maxdy = max(dy[j-hour_length:j])
+                mindy = min(dy[j-hour_length:j])
+
+                abs_dy2 = abs(maxdy2 - mindy2)
+                abs_dy = abs(maxdy - mindy)
+                abscheck = abs_dy2 > (abs_dy * TOL)
+
+                if (maxdy2 > DY2_MIN_TOL or mindy2 < (DY2_MIN_TOL * -1)) and abscheck:
+                    status = 'Failed'
+                    fail_times.append(round(times[j], 3))
+
+        if status == 'Failed':
+            failed_nodes.append(i)
+        derivs.append({
+            'dy2': dy2, 'f': new_series, 'dy': dy, 'status': status, 'fail_times': fail_times,
+        })
+    return derivs, failed_nodes
+
+
+def syntheticFlows(nodes, steps, save_interval, seed=1):
+    """Smooth flood hydrographs with short bursts of oscillation added to some nodes.
+
+    Return:
+        tuple(list, ndarray, set) - the times, nodes x timesteps flows and the
+            indices of the nodes with oscillations.
+    """
+    rand = np.random.default_rng(seed)
+    times = np.arange(steps) * save_interval
+    peak_times = rand.uniform(0.3, 0.6, size=(nodes, 1)) * times[-1]
+    peaks = rand.uniform(5, 200, size=(nodes, 1))
+    flows = 1 + peaks * np.exp(-((times - peak_times) / (0.15 * times[-1])) ** 2)
+    flows += rand.normal(0, 0.01, size=(nodes, steps))
+
+    # Add a 5 to 60 minute long oscillation to about a quarter of the nodes
+    unstable = np.flatnonzero(rand.random(nodes) < 0.25)
+    for node in unstable:
+        length = rand.integers(5, min(60, steps // 2))
+        start = rand.integers(0, steps - length)
+        amplitude = rand.uniform(0.5, 20)
+        flows[node, start:start + length] += amplitude * np.where(np.arange(length) % 2, 1, -1)
+    return times.tolist(), flows, set(unstable.tolist())
+
+
+def main(nodes, steps):
+    save_interval = 1 / 60.0
+    times, flows, unstable = syntheticFlows(nodes, steps, save_interval)
+    print('Checking {0} nodes x {1} timesteps'.format(nodes, steps))
+
+    sample = min(LEGACY_SAMPLE, nodes)
+    start = time.perf_counter()
+    legacy_derivs, legacy_failed = legacyCheckStability(flows[:sample], times, save_interval, 'Flow')
+    legacy_time = (time.perf_counter() - start) * nodes / sample
+
+    start = time.perf_counter()
+    derivs, failed = fmps_check.checkStability(flows, times, save_interval, 'Flow')
+    numpy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    spectral_derivs, spectral_failed = fmps_check.checkSpectralStability(flows, times, save_interval, 'Flow')
+    spectral_time = time.perf_counter() - start
+
+    mismatches = 0
+    for legacy, new in zip(legacy_derivs, derivs[:sample]):
+        if (
+            legacy['status'] != new['status'] or legacy['fail_times'] != new['fail_times'] or
+            not np.allclose(legacy['f'], new['f']) or not np.allclose(legacy['dy2'], new['dy2'])
+        ):
+            mismatches += 1
+    if legacy_failed != [i for i in failed if i < sample]:
+        mismatches += 1
+
+    print('Nodes with oscillations: {0}'.format(len(unstable)))
+    print('    per-node loops: {0:.1f}s (estimated from {1} nodes)'.format(legacy_time, sample))
+    print('    numpy engine:   {0:.2f}s ({1:.0f}x faster), {2} failed, {3} with oscillations'.format(
+        numpy_time, legacy_time / numpy_time, len(failed), len(unstable.intersection(failed))
+    ))
+    print('    spectral check: {0:.2f}s ({1:.0f}x faster), {2} failed, {3} with oscillations'.format(
+        spectral_time, legacy_time / spectral_time, len(spectral_failed),
+        len(unstable.intersection(spectral_failed))
+    ))
+    print('Mismatched nodes: {0}'.format(mismatches))
+    return mismatches
+
+
+if __name__ == '__main__':
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    sys.exit(1 if main(nodes, steps) else 0)
@@ -0,0 +1,102 @@
+'''
+@summary: Benchmark loading TUFLOW MB csv files on synthetic long runs.
+
+Compares readMbColumns in tools/tuflowstabilitycheck.py with the original
+csv.reader loader (converting every requested cell with float() and appending
+it to a list).
+
+Usage:
+    python bench_mbloader.py [number of rows]
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import csv
+import sys
+import time
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from mod_check.tools import tuflowstabilitycheck as tmb_check
+
+
+def legacyLoadMbFile(mb_path, headers):
+    '''
+        Original TuflowStabilityCheck.loadMbFile, kept here for comparison
+    '''
+    results = {'Time (h)': []}
+    col_lookup = {'Time (h)': -1}
+    for h in headers:
+        results[h] = []
+        col_lookup[h] = -1
+
+    with open(mb_path, 'r') as mb_file:
+        reader = csv.reader(mb_file, delimiter=',')
+        count = 0
+        for r in reader:
+            if count == 0:
+                for i, col in enumerate(r):
+                    strip_col = col.strip()
+                    for l in col_lookup.keys():
+                        if l == strip_col: col_lookup[l] = i
+            else:
+                for res in results.keys():
+                    results[res].append(float(r[col_lookup[res]]))
+            count += 1
+
+    if len(results['Time (h)']) < 2:
+        return None
+    else:
+        return results
+
+
+def writeSyntheticMbFile(mb_path, rows, seed=1):
+    """Write an _MB.csv file with the standard TUFLOW columns and random values."""
+    headers, _, _ = tmb_check.getMbHeaders(mb_path)
+    rand = np.random.default_rng(seed)
+    data = rand.normal(0, 100, size=(rows, len(headers) + 1))
+    data[:, 0] = np.arange(rows) / 3600.0
+    with open(mb_path, 'w', newline='') as outfile:
+        outfile.write(','.join(['Time (h)'] + [' ' + h for h in headers]) + '\n')
+        np.savetxt(outfile, data, delimiter=',', fmt='%.6g')
+    return headers
+
+
+def main(rows):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        mb_path = os.path.join(temp_dir, 'Synthetic_Run_001_MB.csv')
+        all_headers = writeSyntheticMbFile(mb_path, rows)
+        print('Loading {0} rows ({1:.0f} MB file)'.format(rows, os.path.getsize(mb_path) / 1e6))
+
+        mismatches = 0
+        for headers in (['Cum ME (%)', 'dVol'], all_headers):
+            start = time.perf_counter()
+            legacy = legacyLoadMbFile(mb_path, headers)
+            legacy_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            loaded = tmb_check.readMbColumns(mb_path, ['Time (h)'] + headers)
+            numpy_time = time.perf_counter() - start
+
+            for h in legacy.keys():
+                if not np.array_equal(np.asarray(legacy[h]), loaded[h]):
+                    mismatches += 1
+            print('{0} columns:'.format(len(headers) + 1))
+            print('    csv.reader loader: {0:.2f}s'.format(legacy_time))
+            print('    numpy loader:      {0:.2f}s ({1:.1f}x faster)'.format(
+                numpy_time, legacy_time / numpy_time
+            ))
+        print('Mismatched series: {0}'.format(mismatches))
+    return mismatches
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    sys.exit(1 if main(rows) else 0)
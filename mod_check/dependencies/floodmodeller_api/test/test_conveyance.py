@@ -97,3 +97,42 @@ def test_calculate_geometry():
     assert_array_almost_equal(total_area, np.array([0, 2.185, 13.65]))
     assert_array_almost_equal(total_length, np.array([0, 6.808522, 15.145467]))
     assert_array_almost_equal(total_mannings, np.array([0, 28.383004, 34.959038]))
+
+
+@pytest.mark.parametrize("section", ["a", "a2", "b", "b2", "c", "d", "d2", "e", "e2", "e3"])
+def test_segment_method_matches_loop(section: str, dat: DAT):
+    data = dat.sections[section].data
+    args = (
+        data.X.values,
+        data.Y.values,
+        data["Mannings n"].values,
+        data.RPL.values,
+        data.Panel.values,
+    )
+    segments = calculate_cross_section_conveyance(*args, method="segments")
+    loop = calculate_cross_section_conveyance(*args, method="loop")
+    assert_array_almost_equal(segments.index, loop.index)
+    assert_array_almost_equal(segments.values, loop.values)
+
+
+def test_segment_method_matches_loop_with_panels():
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        size = rng.integers(3, 40)
+        x = np.sort(rng.uniform(0, 50, size))
+        y = rng.uniform(0, 5, size)
+        n = rng.uniform(0.02, 0.08, size)
+        rpl = rng.choice([0.0, 1.0, 2.0], size)
+        panel_markers = rng.random(size) < 0.25
+        segments = calculate_cross_section_conveyance(x, y, n, rpl, panel_markers)
+        loop = calculate_cross_section_conveyance(x, y, n, rpl, panel_markers, method="loop")
+        np.testing.assert_allclose(segments.values, loop.values, rtol=1e-10, atol=1e-10)
+
+
+def test_unknown_conveyance_method():
+    x = np.array([0, 1, 2])
+    y = np.array([2, 1, 2])
+    n = np.array([0.03, 0.03, 0.03])
+    flags = np.array([False, False, False])
+    with pytest.raises(ValueError, match="Unknown conveyance method"):
+        calculate_cross_section_conveyance(x, y, n, np.ones(3), flags, method="fast")
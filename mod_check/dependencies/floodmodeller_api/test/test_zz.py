@@ -3,10 +3,12 @@
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from floodmodeller_api import IEF, ZZN, ZZX
+from floodmodeller_api.zz import get_reader
 
 
 @pytest.fixture()
@@ -141,3 +143,93 @@ def test_meta_is_read_only(zzx: ZZN):
         zzx.meta["variables"] = "hi"
 
     zzx._meta["variables"] = "hi"
+
+
+def test_native_meta(zzn: ZZN, zzx: ZZX):
+    for file_obj in (zzn, zzx):
+        assert file_obj.meta["nnodes"] == 86
+        assert file_obj.meta["labels"][:3] == ["resin", "CS26", "CS25"]
+        assert len(file_obj.meta["labels"]) == 86
+        assert file_obj.meta["dt"] == 20
+        assert file_obj.meta["save_int"] == 15
+        assert file_obj.meta["output_hrs"] == [0.0, 15.0]
+        assert file_obj.meta["savint_range"] == 180
+
+    assert zzn.meta["variables"] == ["Flow", "Stage", "Froude", "Velocity", "Mode", "State"]
+    assert zzx.meta["variables"] == [
+        "Link inflow",
+        "Left FP h",
+        "Right FP h",
+        "Left FP mode",
+        "Right FP mode",
+    ]
+
+
+def test_native_matches_dll(test_workspace: Path):
+    try:
+        get_reader()
+    except OSError:
+        pytest.skip("zzn_read DLL can't be loaded on this platform")
+
+    for name in ("network.zzn", "network.zzx"):
+        file_class = ZZN if name.endswith(".zzn") else ZZX
+        native = file_class(test_workspace / name)
+        dll = file_class(test_workspace / name, use_dll=True)
+        pd.testing.assert_frame_equal(native.to_dataframe(), dll.to_dataframe())
+        pd.testing.assert_frame_equal(
+            native.to_dataframe(result_type="max", include_time=True),
+            dll.to_dataframe(result_type="max", include_time=True),
+        )
+        assert native.meta["labels"] == dll.meta["labels"]
+
+
+def test_native_unfinished_run(test_workspace: Path, tmp_path: Path):
+    # Only the first 100 save intervals written
+    for suffix in (".zzl", ".zzn"):
+        data = (test_workspace / f"network{suffix}").read_bytes()
+        if suffix == ".zzn":
+            data = data[: 100 * 86 * 6 * 4 + 10]
+        (tmp_path / f"network{suffix}").write_bytes(data)
+
+    zzn = ZZN(tmp_path / "network.zzn")
+    flows = zzn.to_dataframe(variable="Flow")
+    assert flows.shape == (100, 86)
+    assert zzn.meta["output_hrs"][1] == pytest.approx(99 * 300 / 3600)
+    expected = ZZN(test_workspace / "network.zzn").to_dataframe(variable="Flow").iloc[:100]
+    pd.testing.assert_frame_equal(flows, expected)
+
+
+def test_get_results_slices(zzn: ZZN):
+    full = zzn.to_dataframe(variable="Flow")
+
+    flows = zzn.get_results("Flow")
+    assert flows.shape == (181, 86)
+    assert not flows.flags.owndata
+    np.testing.assert_array_equal(flows, full.to_numpy())
+
+    # Nodes next to each other in the results are still a view
+    nodes = ["CS25", "RD25Sd", "CS24"]
+    subset = zzn.get_results(["Flow", "Stage"], nodes=nodes, time_window=(1, 2))
+    assert subset.shape == (13, 3, 2)
+    assert not subset.flags.owndata
+    np.testing.assert_array_equal(subset[:, :, 0], full.loc[1:2, nodes].to_numpy())
+    np.testing.assert_array_equal(zzn.get_times((1, 2)), full.loc[1:2].index)
+
+    scattered = zzn.get_results("Stage", nodes=["CS24", "resin"], time_window=(None, 0.5))
+    expected = zzn.to_dataframe(variable="Stage").loc[:0.5, ["CS24", "resin"]]
+    np.testing.assert_array_equal(scattered, expected.to_numpy())
+
+    with pytest.raises(KeyError):
+        zzn.get_results("Flow", nodes=["not a node"])
+
+
+def test_to_dataframe_slices(zzn: ZZN):
+    nodes = ["CS26", "CS18", "resin"]
+    full = zzn.to_dataframe()
+    actual = zzn.to_dataframe(nodes=nodes, time_window=(5, 10))
+    expected = full.loc[5:10, [(v, n) for v in zzn.meta["variables"] for n in nodes]]
+    pd.testing.assert_frame_equal(actual, expected)
+
+    actual = zzn.to_dataframe(variable="Stage", nodes=nodes, multilevel_header=False)
+    expected = zzn.to_dataframe(variable="Stage", multilevel_header=False)
+    pd.testing.assert_frame_equal(actual, expected[[f"{n}_Stage" for n in nodes]])
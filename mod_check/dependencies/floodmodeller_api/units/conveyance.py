@@ -11,6 +11,8 @@ if TYPE_CHECKING:
 
 MINIMUM_PERIMETER_THRESHOLD = 1e-8
 
+CONVEYANCE_METHODS = ("segments", "loop")
+
 
 def calculate_cross_section_conveyance(
     x: NDArray[np.float64],
@@ -18,6 +20,7 @@ def calculate_cross_section_conveyance(
     n: NDArray[np.float64],
     rpl: NDArray[np.float64],
     panel_markers: NDArray[np.float64],
+    method: str = "segments",
 ) -> pd.Series:
     """
     Calculate the conveyance of a cross-section by summing the conveyance
@@ -29,6 +32,10 @@ def calculate_cross_section_conveyance(
         n (NDArray[np.float64]): Manning's n values for each segment.
         rpl (NDArray[np.float64]): Relative Path Length values for each segment.
         panel_markers (NDArray[np.float64]): Boolean array indicating the start of each panel.
+        method (str, optional): "segments" (the default) sums the geometry of every panel and
+            wetted sub-section in one pass (see sum_conveyance_by_segment). "loop" loops over
+            each panel and sub-section in turn (see sum_conveyance_by_panel). Both give the same
+            results.
 
     Returns:
         pd.Series: A pandas Series containing the conveyance values indexed by water levels.
@@ -44,6 +51,10 @@ def calculate_cross_section_conveyance(
             result = calculate_cross_section_conveyance(x, y, n, rpl, panel_markers)
             print(result)
     """
+    if method not in CONVEYANCE_METHODS:
+        msg = f"Unknown conveyance method '{method}', must be one of {CONVEYANCE_METHODS}"
+        raise ValueError(msg)
+
     water_levels = insert_intermediate_wls(np.unique(y), threshold=0.05)
     area, length, mannings = calculate_geometry(x, y, n, water_levels)
     panel = panel_markers.cumsum()[:-1]
@@ -52,7 +63,52 @@ def calculate_cross_section_conveyance(
     section_markers = np.hstack([np.full((intersection.shape[0], 1), False), intersection])
     section = section_markers.cumsum(axis=1)
 
-    conveyance = np.zeros_like(water_levels)
+    if method == "segments":
+        conveyance = sum_conveyance_by_segment(area, length, mannings, rpl, panel, section)
+    else:
+        conveyance = sum_conveyance_by_panel(area, length, mannings, rpl, panel, section)
+
+    return pd.Series(conveyance, index=water_levels)
+
+
+def _panel_conveyance(
+    total_area: NDArray[np.float64],
+    total_length: NDArray[np.float64],
+    total_mannings: NDArray[np.float64],
+    rpl_panel: NDArray[np.float64] | float,
+) -> NDArray[np.float64]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            total_length >= MINIMUM_PERIMETER_THRESHOLD,
+            total_area ** (5 / 3) * total_length ** (1 / 3) / (total_mannings * rpl_panel),
+            0,
+        )
+
+
+def sum_conveyance_by_panel(
+    area: NDArray[np.float64],
+    length: NDArray[np.float64],
+    mannings: NDArray[np.float64],
+    rpl: NDArray[np.float64],
+    panel: NDArray[np.int_],
+    section: NDArray[np.int_],
+) -> NDArray[np.float64]:
+    """
+    Sum the conveyance of each panel and wetted sub-section at every water level, one panel and
+    sub-section at a time.
+
+    Args:
+        area (NDArray[np.float64]): water levels x segments area (see calculate_geometry).
+        length (NDArray[np.float64]): water levels x segments wetted length.
+        mannings (NDArray[np.float64]): water levels x segments Manning's n times length.
+        rpl (NDArray[np.float64]): Relative Path Length values for each point.
+        panel (NDArray[np.int_]): panel number of each segment.
+        section (NDArray[np.int_]): water levels x segments wetted sub-section number.
+
+    Returns:
+        NDArray[np.float64]: The conveyance at each water level.
+    """
+    conveyance = np.zeros(area.shape[0])
 
     for i in range(panel.max() + 1):
         in_panel = panel == i
@@ -72,14 +128,68 @@ def calculate_cross_section_conveyance(
             total_length = np.where(in_panel_and_section, length, 0).sum(axis=1)
             total_mannings = np.where(in_panel_and_section, mannings, 0).sum(axis=1)
 
-            with np.errstate(divide="ignore", invalid="ignore"):
-                conveyance += np.where(
-                    total_length >= MINIMUM_PERIMETER_THRESHOLD,
-                    total_area ** (5 / 3) * total_length ** (1 / 3) / (total_mannings * rpl_panel),
-                    0,
-                )
+            conveyance += _panel_conveyance(total_area, total_length, total_mannings, rpl_panel)
 
-    return pd.Series(conveyance, index=water_levels)
+    return conveyance
+
+
+def sum_conveyance_by_segment(
+    area: NDArray[np.float64],
+    length: NDArray[np.float64],
+    mannings: NDArray[np.float64],
+    rpl: NDArray[np.float64],
+    panel: NDArray[np.int_],
+    section: NDArray[np.int_],
+) -> NDArray[np.float64]:
+    """
+    Sum the conveyance of each panel and wetted sub-section at every water level in one pass.
+
+    Panel and sub-section numbers never decrease along a cross-section, so at each water level
+    the segments with the same (panel, sub-section) are next to each other. Each run of segments
+    in the flattened water levels x segments arrays is labelled as a group and the area, length
+    and Manning's values of every group are summed with one ``np.add.reduceat`` each. Gives the
+    same results as sum_conveyance_by_panel, apart from rounding, without looping over each
+    panel and sub-section.
+
+    Args:
+        area (NDArray[np.float64]): water levels x segments area (see calculate_geometry).
+        length (NDArray[np.float64]): water levels x segments wetted length.
+        mannings (NDArray[np.float64]): water levels x segments Manning's n times length.
+        rpl (NDArray[np.float64]): Relative Path Length values for each point.
+        panel (NDArray[np.int_]): panel number of each segment.
+        section (NDArray[np.int_]): water levels x segments wetted sub-section number.
+
+    Returns:
+        NDArray[np.float64]: The conveyance at each water level.
+    """
+    n_levels, n_segments = area.shape
+    if n_levels == 0 or n_segments == 0:
+        return np.zeros(n_levels)
+
+    # A new group starts at the first segment of each level, panel and sub-section
+    starts = np.ones((n_levels, n_segments), dtype=bool)
+    starts[:, 1:] = (panel[1:] != panel[:-1]) | (section[:, 1:] != section[:, :-1])
+    group_starts = np.flatnonzero(starts)
+
+    total_area = np.add.reduceat(area.ravel(), group_starts)
+    total_length = np.add.reduceat(length.ravel(), group_starts)
+    total_mannings = np.add.reduceat(mannings.ravel(), group_starts)
+
+    # Each panel uses the RPL of its first segment
+    panel_starts = np.ones(n_segments, dtype=bool)
+    panel_starts[1:] = panel[1:] != panel[:-1]
+    panel_first = np.maximum.accumulate(np.where(panel_starts, np.arange(n_segments), 0))
+    rpl_panel = np.sqrt(rpl[:-1][panel_first])
+    rpl_panel[rpl_panel == 0] = 1
+
+    group_level, group_segment = np.divmod(group_starts, n_segments)
+    group_conveyance = _panel_conveyance(
+        total_area,
+        total_length,
+        total_mannings,
+        rpl_panel[group_segment],
+    )
+    return np.bincount(group_level, weights=group_conveyance, minlength=n_levels)
 
 
 def calculate_geometry(
@@ -162,13 +272,13 @@ def insert_intermediate_wls(arr: NDArray[np.float64], threshold: float) -> NDArr
     # Calculate the number of points needed for each gap
     num_points = (gaps // threshold).astype(int)
 
-    # Prepare lists to hold the new points and results
-    new_points = [
-        np.linspace(start, end, num + 2, endpoint=False)
-        for start, end, num in zip(arr[:-1], arr[1:], num_points)
-    ]
-    end = np.array([arr[-1]])
-    return np.concatenate([*new_points, end])
+    # Each gap is split into num + 2 equal steps (the same points as np.linspace with
+    # endpoint=False), built for every gap at once rather than one linspace call each
+    counts = num_points + 2
+    starts = np.repeat(arr[:-1], counts)
+    steps = np.repeat(gaps / counts, counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.concatenate([starts + offsets * steps, arr[-1:]])
 
 
 @lru_cache
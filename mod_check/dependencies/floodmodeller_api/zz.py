@@ -32,6 +32,21 @@ from .util import get_associated_file, handle_exception, is_windows
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
+# Layout of the .zzl file, used by the native reader. The file is made of 128 byte
+# records, with the header in the first five and the node labels packed into as
+# many of the following records as needed
+ZZL_RECORD_LENGTH = 128
+ZZL_HEADER_LENGTH = 5 * ZZL_RECORD_LENGTH
+ZZL_TITLE_LENGTH = 120
+
+# Layout of the .zzx file header. The variable names follow the fixed part and the
+# results follow the variable names
+ZZX_HEADER_LENGTH = 76
+ZZX_TITLE_LENGTH = 36
+ZZX_VARIABLE_NAME_LENGTH = 32
+
+ZZN_VARIABLES = ["Flow", "Stage", "Froude", "Velocity", "Mode", "State"]
+
 
 def get_reader() -> ct.CDLL:
     # Get zzn_dll path
@@ -230,6 +245,216 @@ def convert_meta(meta: dict[str, Any]) -> None:
         meta[key] = [x.value.decode().strip() for x in list(meta[key])]
 
 
+def _decode(raw: np.ndarray) -> str:
+    return raw.tobytes().decode("latin-1").strip()
+
+
+def read_zzl_header(zzl: Path) -> dict[str, Any]:
+    """Reads the model details from the header records of a .zzl file.
+
+    Returns:
+        dict: model_title, nnodes, label_length, dt, timestep0, ltimestep, save_int and tzero,
+            in the same format as the DLL reader.
+    """
+    header = np.fromfile(zzl, dtype=np.uint8, count=ZZL_HEADER_LENGTH)
+    if header.size < ZZL_HEADER_LENGTH:
+        msg = f"{zzl} is too short to be a .zzl file"
+        raise ValueError(msg)
+
+    ints = header.view("<i4")
+    floats = header.view("<f4")
+    return {
+        "model_title": _decode(header[:ZZL_TITLE_LENGTH]),
+        "nnodes": int(ints[32]),
+        "label_length": int(ints[99]),
+        "dt": float(floats[64]),
+        "timestep0": int(ints[65]),
+        "ltimestep": int(ints[96]),
+        "save_int": float(ints[97]),
+        "tzero": [int(x) for x in ints[100:105]],
+    }
+
+
+def read_zzl_labels(zzl: Path, nnodes: int, label_length: int) -> list[str]:
+    """Reads the node labels from a .zzl file.
+
+    Labels are packed into the records after the header, with as many whole labels as will
+    fit in each record.
+
+    Returns:
+        list[str]: the node labels, in results order.
+    """
+    per_record = ZZL_RECORD_LENGTH // label_length
+    n_records = -(-nnodes // per_record)
+    raw = np.fromfile(
+        zzl,
+        dtype=np.uint8,
+        count=n_records * ZZL_RECORD_LENGTH,
+        offset=ZZL_HEADER_LENGTH,
+    )
+    if raw.size < n_records * ZZL_RECORD_LENGTH:
+        msg = f"{zzl} does not contain labels for all {nnodes} nodes"
+        raise ValueError(msg)
+
+    records = raw.reshape(n_records, ZZL_RECORD_LENGTH)[:, : per_record * label_length]
+    return [_decode(label) for label in records.reshape(-1, label_length)[:nnodes]]
+
+
+def read_zzx_header(zzx: Path) -> dict[str, Any]:
+    """Reads the model details and variable names from the header of a .zzx file.
+
+    Returns:
+        dict: model_title, nnodes, nvars, timestep0, save_int, dt, ltimestep and variables, in
+            the same format as the DLL reader, and data_offset (the position of the results).
+    """
+    header = np.fromfile(zzx, dtype=np.uint8, count=ZZX_HEADER_LENGTH)
+    if header.size < ZZX_HEADER_LENGTH:
+        msg = f"{zzx} is too short to be a .zzx file"
+        raise ValueError(msg)
+
+    ints = header.view("<i4")
+    floats = header.view("<f4")
+    nvars = int(ints[10])
+    names = np.fromfile(
+        zzx,
+        dtype=np.uint8,
+        count=nvars * ZZX_VARIABLE_NAME_LENGTH,
+        offset=ZZX_HEADER_LENGTH,
+    )
+    if names.size < nvars * ZZX_VARIABLE_NAME_LENGTH:
+        msg = f"{zzx} does not contain names for all {nvars} variables"
+        raise ValueError(msg)
+
+    return {
+        "model_title": _decode(header[:ZZX_TITLE_LENGTH]),
+        "nnodes": int(ints[9]),
+        "nvars": nvars,
+        "timestep0": int(ints[15]),
+        "save_int": float(ints[16]),
+        "dt": float(floats[17]),
+        "ltimestep": int(ints[18]),
+        "variables": [_decode(name) for name in names.reshape(nvars, ZZX_VARIABLE_NAME_LENGTH)],
+        "data_offset": ZZX_HEADER_LENGTH + nvars * ZZX_VARIABLE_NAME_LENGTH,
+    }
+
+
+def zz_results_length(filepath: Path, offset: int, nx: int, ny: int, nz: int) -> int:
+    """Gets the number of save intervals in the results block of a .zzn or .zzx file.
+
+    If the run didn't finish, only the save intervals that have been written are counted.
+
+    Args:
+        filepath (Path): the .zzn or .zzx file.
+        offset (int): position of the first result in the file.
+        nx (int): number of nodes.
+        ny (int): number of variables.
+        nz (int): number of save intervals expected.
+
+    Returns:
+        int: the number of complete save intervals, up to nz.
+    """
+    frame = nx * ny
+    if frame == 0:
+        return 0
+    available = max(filepath.stat().st_size - offset, 0) // (4 * frame)
+    return min(nz, available)
+
+
+def map_zz_results(filepath: Path, offset: int, nx: int, ny: int, nz: int) -> np.ndarray:
+    """Memory maps the results block of a .zzn or .zzx file.
+
+    Results are stored as 32 bit floats for each save interval in turn, with all of the
+    variables for one node together. Nothing is read until the array is used, and then only
+    the parts of the file that are used.
+
+    Args:
+        filepath (Path): the .zzn or .zzx file.
+        offset (int): position of the first result in the file.
+        nx (int): number of nodes.
+        ny (int): number of variables.
+        nz (int): number of save intervals (see zz_results_length).
+
+    Returns:
+        np.ndarray: read-only float32 array of save intervals x nodes x variables.
+    """
+    return np.memmap(filepath, dtype="<f4", mode="r", offset=offset, shape=(nz, nx, ny))
+
+
+def results_extremes(results: np.ndarray) -> dict[str, np.ndarray]:
+    """Gets the max and min of each node and variable, and the save interval they occur at.
+
+    Args:
+        results (np.ndarray): save intervals x nodes x variables.
+
+    Returns:
+        dict: max_results, min_results, max_times and min_times in the same layout as the DLL
+            reader (variables x nodes, with 1 based save interval numbers).
+    """
+    return {
+        "max_results": np.asarray(results.max(axis=0)).T,
+        "min_results": np.asarray(results.min(axis=0)).T,
+        "max_times": results.argmax(axis=0).T.astype(np.int32) + 1,
+        "min_times": results.argmin(axis=0).T.astype(np.int32) + 1,
+    }
+
+
+def read_native_meta(
+    zzl: Path,
+    zzn_or_zzx: Path,
+    is_quality: bool,
+) -> tuple[dict[str, Any], int]:
+    """Reads the details of a .zzn or .zzx file (and its .zzl) without the zzn_read DLL.
+
+    Returns:
+        tuple: the meta, in the same format as run_routines after convert_meta, and the
+            position of the results in the file.
+    """
+    zzl_header = read_zzl_header(zzl)
+    meta: dict[str, Any] = {}
+    if is_quality:
+        header = read_zzx_header(zzn_or_zzx)
+        offset = header.pop("data_offset")
+        meta["zzx_name"] = str(zzn_or_zzx)
+        meta["zzl_name"] = str(zzl)
+        meta.update(header)
+        meta["label_length"] = zzl_header["label_length"] or 12
+        meta["tzero"] = zzl_header["tzero"]
+    else:
+        offset = 0
+        meta["zzn_name"] = str(zzn_or_zzx)
+        meta["zzl_name"] = str(zzl)
+        meta.update(zzl_header)
+        meta["nvars"] = len(ZZN_VARIABLES)
+        meta["variables"] = list(ZZN_VARIABLES)
+    meta["is_quality"] = is_quality
+    meta["errstat"] = 0
+    meta["labels"] = read_zzl_labels(zzl, meta["nnodes"], meta["label_length"])
+
+    save_int = int(meta["save_int"]) or 1
+    expected = (meta["ltimestep"] - meta["timestep0"]) // save_int + 1
+    nz = zz_results_length(zzn_or_zzx, offset, meta["nnodes"], meta["nvars"], expected)
+    if nz == 0:
+        msg = f"No results found in {zzn_or_zzx}"
+        raise ValueError(msg)
+
+    last_step = meta["ltimestep"] if nz == expected else meta["timestep0"] + (nz - 1) * save_int
+    last_hr = np.float32(last_step - meta["timestep0"]) * np.float32(meta["dt"]) / np.float32(3600)
+    meta["output_hrs"] = [0.0, float(last_hr)]
+    meta["aitimestep"] = [meta["timestep0"], meta["ltimestep"]]
+    meta["isavint"] = [1, nz]
+    meta["node_ID"] = -1
+    meta["savint_skip"] = 1
+    meta["savint_range"] = nz - 1
+    return meta, offset
+
+
+def _as_slice(indices: list[int]) -> slice | list[int]:
+    """Converts a run of consecutive indices to a slice, so that indexing gives a view."""
+    if indices and indices == list(range(indices[0], indices[-1] + 1)):
+        return slice(indices[0], indices[-1] + 1)
+    return indices
+
+
 class _ZZ(FMFile):
     """Base class for ZZN and ZZX."""
 
@@ -238,20 +463,30 @@ class _ZZ(FMFile):
         self,
         zzn_filepath: str | Path | None = None,
         from_json: bool = False,
+        use_dll: bool = False,
     ):
         if from_json:
             return
 
         FMFile.__init__(self, zzn_filepath)
 
-        reader = get_reader()
         zzl = get_associated_file(self._filepath, ".zzl")
 
         is_quality = self._suffix == ".zzx"
 
-        self._data, self._meta = run_routines(reader, zzl, self._filepath, is_quality)
-        convert_data(self._data)
-        convert_meta(self._meta)
+        if use_dll:
+            reader = get_reader()
+            self._data, self._meta = run_routines(reader, zzl, self._filepath, is_quality)
+            convert_data(self._data)
+            convert_meta(self._meta)
+            # Same layout as the file (nodes x variables for each save interval)
+            self._results = self._data["all_results"].transpose(0, 2, 1)
+            self._offset = None
+        else:
+            # Results are only read when they're used (see _get_results)
+            self._meta, self._offset = read_native_meta(zzl, self._filepath, is_quality)
+            self._data = {}
+            self._results = None
 
         self._nx = self._meta["nnodes"]
         self._ny = self._meta["nvars"]
@@ -262,33 +497,173 @@ class _ZZ(FMFile):
             else ["Flow", "Stage", "Froude", "Velocity", "Mode", "State"]
         )
         self._index_name = "Label" if is_quality else "Node Label"
+        self._node_lookup = {}
+        for i, label in enumerate(self._meta["labels"]):
+            self._node_lookup.setdefault(label, i)
 
     @property
     def meta(self) -> Mapping[str, Any]:
         return MappingProxyType(self._meta)  # because dictionaries are mutable
 
-    def _get_all(self, variable: str, multilevel_header: bool) -> pd.DataFrame:
+    @property
+    def times(self) -> np.ndarray:
+        """Output time (hrs) of each save interval."""
+        return np.linspace(self._meta["output_hrs"][0], self._meta["output_hrs"][1], self._nz)
+
+    def _get_results(self) -> np.ndarray:
+        """All results as save intervals x nodes x variables (memory mapped by the native reader)."""
+        if self._results is None:
+            self._results = map_zz_results(
+                self._filepath,
+                self._offset,
+                self._nx,
+                self._ny,
+                self._nz,
+            )
+        return self._results
+
+    def _get_data(self, key: str) -> np.ndarray:
+        """Gets one of the DLL style result arrays, working out the extremes when first needed."""
+        if key not in self._data:
+            if key == "all_results":
+                self._data[key] = self._get_results().transpose(0, 2, 1)
+            else:
+                self._data.update(results_extremes(self._get_results()))
+        return self._data[key]
+
+    def close(self) -> None:
+        """Releases the results file. It's opened again if the results are used."""
+        if self._offset is not None:
+            self._results = None
+            self._data = {}
+
+    def _variable_index(self, variable: str) -> int:
+        lookup = {v.lower(): i for i, v in enumerate(self._variables)}
+        try:
+            return lookup[variable.lower()]
+        except KeyError:
+            msg = f"Variable '{variable}' not found. Available variables: {self._variables}"
+            raise KeyError(msg) from None
+
+    def _node_index(self, node: str) -> int:
+        try:
+            return self._node_lookup[node]
+        except KeyError:
+            msg = f"Node '{node}' not found in {self._filepath.name}"
+            raise KeyError(msg) from None
+
+    def _time_slice(self, time_window: tuple[float | None, float | None] | None) -> slice:
+        if time_window is None:
+            return slice(None)
+        start, end = time_window
+        times = self.times
+        first = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        last = len(times) if end is None else int(np.searchsorted(times, end, side="right"))
+        return slice(first, max(first, last))
+
+    def get_results(
+        self,
+        variables: str | list[str] | None = None,
+        nodes: str | list[str] | slice | None = None,
+        time_window: tuple[float | None, float | None] | None = None,
+    ) -> np.ndarray:
+        """Gets part of the results as an array, without reading the rest of the file.
+
+        The native reader memory maps the results, so only the values for the selected save
+        intervals are read from disk. Nodes and variables given as a single name or a slice
+        (or a list of names that are next to each other in the file) give a read-only view of
+        the results, otherwise only the selected values are copied.
+
+        Args:
+            variables (str | list[str], optional): variable name or names (e.g. 'Flow'). Defaults
+                to all variables.
+            nodes (str | list[str] | slice, optional): node label, labels, or a slice of the nodes
+                in results order. Defaults to all nodes.
+            time_window (tuple, optional): (start, end) time in hours, inclusive. Either can be
+                None to start or end with the results. Defaults to all save intervals.
+
+        Returns:
+            np.ndarray: float32 array of save intervals x nodes x variables. A single variable or
+                node (given as a string) removes that dimension. The times are given by
+                get_times(time_window).
+        """
+        if variables is None:
+            var_index: int | slice | list[int] = slice(None)
+        elif isinstance(variables, str):
+            var_index = self._variable_index(variables)
+        else:
+            var_index = _as_slice([self._variable_index(v) for v in variables])
+
+        if nodes is None:
+            node_index: int | slice | list[int] = slice(None)
+        elif isinstance(nodes, slice):
+            node_index = nodes
+        elif isinstance(nodes, str):
+            node_index = self._node_index(nodes)
+        else:
+            node_index = _as_slice([self._node_index(n) for n in nodes])
+
+        results = self._get_results()[self._time_slice(time_window)]
+        if isinstance(node_index, list) and isinstance(var_index, list):
+            return results[:, node_index][:, :, var_index]
+        return results[:, node_index, var_index]
+
+    def get_times(
+        self,
+        time_window: tuple[float | None, float | None] | None = None,
+    ) -> np.ndarray:
+        """Gets the output times (hrs) of the save intervals in a time window (see get_results)."""
+        return self.times[self._time_slice(time_window)]
+
+    def _get_all(
+        self,
+        variable: str,
+        multilevel_header: bool,
+        nodes: str | list[str] | slice | None = None,
+        time_window: tuple[float | None, float | None] | None = None,
+    ) -> pd.DataFrame:
         is_all = variable == "all"
 
         variable_display_name = variable.capitalize().replace("fp", "FP")
 
-        arr = self._data["all_results"]
-        time_index = np.linspace(self._meta["output_hrs"][0], self._meta["output_hrs"][1], self._nz)
+        if is_all:
+            variables = self._variables
+        elif multilevel_header:
+            variables = [v for v in self._variables if v == variable_display_name]
+        else:
+            variables = [v for v in self._variables if v.endswith(variable_display_name)]
+        if not variables:
+            msg = f"Variable '{variable}' not found. Available variables: {self._variables}"
+            raise KeyError(msg)
+
+        if nodes is None:
+            labels = self._meta["labels"]
+        elif isinstance(nodes, slice):
+            labels = self._meta["labels"][nodes]
+        else:
+            labels = [nodes] if isinstance(nodes, str) else list(nodes)
+            nodes = labels
+
+        # Only the selected variables, nodes and times are read from the results
+        arr = self.get_results(variables, nodes, time_window)
+        time_index = self.get_times(time_window)
+        nz = len(time_index)
+        arr = arr.transpose(0, 2, 1).reshape(nz, len(variables) * len(labels))
 
         if multilevel_header:
             result = pd.DataFrame(
-                arr.reshape(self._nz, self._nx * self._ny),
+                arr,
                 index=time_index,
-                columns=pd.MultiIndex.from_product([self._variables, self._meta["labels"]]),
+                columns=pd.MultiIndex.from_product([variables, labels]),
             )
             result.index.name = "Time (hr)"
             return result if is_all else result[variable_display_name]  # type: ignore
             # ignored because it always returns a dataframe as it's a multilevel header
 
         result = pd.DataFrame(
-            arr.reshape(self._nz, self._nx * self._ny),
+            arr,
             index=time_index,
-            columns=[f"{node}_{var}" for var in self._variables for node in self._meta["labels"]],
+            columns=[f"{node}_{var}" for var in variables for node in labels],
         )
         result.index.name = "Time (hr)"
         return (
@@ -310,7 +685,7 @@ class _ZZ(FMFile):
 
         combination = f"{result_type_display_name} {variable_display_name}"
 
-        arr = self._data[f"{result_type}_results"].transpose()
+        arr = self._get_data(f"{result_type}_results").transpose()
         node_index = self._meta["labels"]
         col_names = [f"{result_type_display_name} {x}" for x in self._variables]
         result = pd.DataFrame(arr, index=node_index, columns=col_names)
@@ -320,7 +695,7 @@ class _ZZ(FMFile):
             # df[combination] is the only time we get a series in _ZZ.get_dataframe()
             return result if is_all else result[combination]
 
-        times = self._data[f"{result_type}_times"].transpose()
+        times = self._get_data(f"{result_type}_times").transpose()
         times = np.linspace(self._meta["output_hrs"][0], self._meta["output_hrs"][1], self._nz)[
             times - 1
         ]
@@ -338,11 +713,13 @@ class _ZZ(FMFile):
         variable: str = "all",
         include_time: bool = False,
         multilevel_header: bool = True,
+        nodes: str | list[str] | slice | None = None,
+        time_window: tuple[float | None, float | None] | None = None,
     ) -> pd.Series | pd.DataFrame:
         result_type = result_type.lower()
 
         if result_type == "all":
-            return self._get_all(variable, multilevel_header)
+            return self._get_all(variable, multilevel_header, nodes, time_window)
 
         if result_type in {"max", "min"}:
             return self._get_extremes(variable, result_type, include_time)
@@ -400,6 +777,8 @@ class ZZN(_ZZ):
 
     Args:
         zzn_filepath (str): Full filepath to model zzn file
+        use_dll (bool, optional): Read the results with the Flood Modeller zzn_read DLL rather
+            than the native reader. Defaults to False.
 
     Output:
         Initiates 'ZZN' class object
@@ -421,6 +800,10 @@ class ZZN(_ZZ):
             multilevel_header (bool, optional): If True, the returned dataframe will have multi-level column
                 headers with the variable as first level and node label as second header. If False, the column
                 names will be formatted "{node label}_{variable}". Defaults to True.
+            nodes (str | list[str] | slice, optional): Only include these nodes (result_type 'all' only).
+                Defaults to all nodes.
+            time_window (tuple, optional): Only include save intervals between (start, end) hours, inclusive
+                (result_type 'all' only). Defaults to all save intervals.
 
         Returns:
             pandas.DataFrame(): dataframe object of simulation results
@@ -472,6 +855,8 @@ class ZZX(_ZZ):
 
     Args:
         zzx_filepath (str): Full filepath to model zzx file
+        use_dll (bool, optional): Read the results with the Flood Modeller zzn_read DLL rather
+            than the native reader. Defaults to False.
 
     Output:
         Initiates 'ZZX' class object
@@ -493,6 +878,10 @@ class ZZX(_ZZ):
             multilevel_header (bool, optional): If True, the returned dataframe will have multi-level column
                 headers with the variable as first level and node label as second header. If False, the column
                 names will be formatted "{node label}_{variable}". Defaults to True.
+            nodes (str | list[str] | slice, optional): Only include these nodes (result_type 'all' only).
+                Defaults to all nodes.
+            time_window (tuple, optional): Only include save intervals between (start, end) hours, inclusive
+                (result_type 'all' only). Defaults to all save intervals.
 
         Returns:
             pandas.DataFrame(): dataframe object of simulation results
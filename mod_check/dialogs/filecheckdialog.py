@@ -12,9 +12,11 @@ from .dialogbase import DialogBase
 from ..forms import ui_file_check_dialog as filecheck_ui
 from ..tools import help, globaltools
 from ..tools import filecheck
+from ..tools import resultswatcher
 from ..tools import settings as mrt_settings
 
 from ..mywidgets import graphdialogs as graphs
+from ..mywidgets import filetreemodel
 from PyQt5.pyrcc_main import showHelp
 
 DATA_DIR = './data'
@@ -38,6 +40,7 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
         self.modelFolderFileWidget.setFilePath(model_root)
         self.modelFolderFileWidget.fileChanged.connect(self.updateModelRoot)
         self.reloadBtn.clicked.connect(self.checkFiles)
+        self.openLastAuditBtn.clicked.connect(self.openLastAudit)
         self.exportResultsBtn.clicked.connect(self.exportResults)
         self.saveFileTreeBtn.clicked.connect(self.saveFileTree)
         # self.elsewhereFilesTable.clicked.connect(lambda i: self.showParents(i, 'elsewhere'))
@@ -51,14 +54,9 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
         self.fileTreeSearchBtn.clicked.connect(lambda: self.searchFileTree(False))
         self.fileTreeSearchFromTopBtn.clicked.connect(lambda: self.searchFileTree(True))
         self.showFullPathsBtn.clicked.connect(self.showFullPaths)
-#         self.fileTreeTextEdit.verticalScrollbar().sliderMoved.connect(lambda i: self.treeSliderMoved(i, 'main'))
-        self.fileTreeTextEdit.verticalScrollBar().valueChanged.connect(
-            self.fileTreePathTextEdit.verticalScrollBar().setValue
-        )
-#             lambda i: self.treeSliderMoved(i, 'main'))
-        self.fileTreePathTextEdit.verticalScrollBar().valueChanged.connect(
-            self.fileTreeTextEdit.verticalScrollBar().setValue
-        )
+        self.fileTreeModel = filetreemodel.FileTreeModel(self)
+        self.fileTreeView.setModel(self.fileTreeModel)
+        self.fileTreeView.setColumnHidden(filetreemodel.FileTreeModel.PATH_COLUMN, True)
         
         # NEW 2025
         self.summaryLookup = []
@@ -68,14 +66,10 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
         self.fmpLookup = []
         self.fmpComboBox.currentIndexChanged.connect(lambda i: self.showFmpFiles(i))
 
-#         self.splitter.setCollapsable(0, False)
-#         self.splitter.setCollapsable(1, True)
-        self.splitter.setStretchFactor(0, 9)
-        self.splitter.setStretchFactor(1, 1)
-        self.splitter.setSizes([self.splitter.sizes()[0], 0])
-        self.search_results = None
+        self.result_holder = None
         self.file_check = filecheck.FileChecker()
         self.file_check.status_signal.connect(self.updateStatus)
+        resultswatcher.startWatching()
 
     def updateModelRoot(self):
         mrt_settings.saveProjectSetting('model_root', self.modelFolderFileWidget.filePath())
@@ -88,42 +82,41 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
         self.statusLabel.setText(status)
         QApplication.processEvents()
 
-    def treeSliderMoved(self, val, caller):
-        self.fileTreePathTextEdit.verticalScrollbar().setSliderPosition(
-            self.fileTreeTextEdit.verticalScrollbar().sliderPosition()
-        )
-
     def showFullPaths(self):
-        width = QApplication.primaryScreen().size().width()
-        if self.splitter.sizes()[1] > 0:
-            self.splitter.setSizes([width, 0])
-        else:
-            self.splitter.setSizes([width, width])
+        column = filetreemodel.FileTreeModel.PATH_COLUMN
+        self.fileTreeView.setColumnHidden(column, not self.fileTreeView.isColumnHidden(column))
 
     def searchFileTree(self, from_start):
-        """Search for text in the file tree text edit.
+        """Search for text in the file and folder names in the file tree.
+
+        The search is done on the FileTree names rather than the view, then
+        the view is expanded to show the next match and it's selected.
 
         Args:
-            from_start(bool): if True the search will start from the file start.
+            from_start(bool): if True the search will start from the top.
         """
-        def moveCursorToStart():
-            cursor = self.fileTreeTextEdit.textCursor()
-            cursor.movePosition(QTextCursor.Start) 
-            self.fileTreeTextEdit.setTextCursor(cursor)
-
-        if from_start:
-            moveCursorToStart()
-        search_text = self.searchFileTreeTextbox.text()
-        found = self.fileTreeTextEdit.find(search_text)
+        file_tree = self.fileTreeModel.file_tree
+        if file_tree is None: return
+
+        start = file_tree.ROOT
+        current = self.fileTreeView.currentIndex()
+        if not from_start and current.isValid():
+            start = self.fileTreeModel.nodeFromIndex(current)
+        node = file_tree.search(
+            self.searchFileTreeTextbox.text(), start, self.fileTreeModel.include_files
+        )
+        if node < 0:
+            self.updateStatus('No matches found in the file tree')
+            return
 
-        # If it isn't found try from the start
-        if not found and not from_start:
-            moveCursorToStart()
-            found = self.fileTreeTextEdit.find(search_text)
+        index = self.fileTreeModel.indexFromNode(node)
+        self.fileTreeView.setCurrentIndex(index)
+        self.fileTreeView.scrollTo(index, QAbstractItemView.PositionAtCenter)
 
-    def checkFiles(self):
-        """Search folders, load data and update dialog data."""
-        self.search_results = []
+    def clearResults(self):
+        if self.result_holder is not None and self.result_holder.store is not None:
+            self.result_holder.store.close()
+        self.result_holder = None
         self.iefs = []
         self.workspace_files = {}
         self.workspaceLookup = []
@@ -136,13 +129,39 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
         # self.missingParentList.clear()
         # self.elsewhereParentList.clear()
         # self.iefElsewhereParentList.clear()
+
+    def checkFiles(self):
+        """Search folders, load data and update dialog data."""
+        self.clearResults()
+        model_root = mrt_settings.loadProjectSetting('model_root', './temp')
+        self.iefs, search_results, self.result_holder = self.file_check.auditModelFiles(
+            model_root, full_rescan=self.fullRescanCheckbox.isChecked(),
+            find_duplicates=self.findDuplicatesCheckbox.isChecked()
+        )
+        # Filtering and exporting is done with queries on the saved results
+        self.file_check.saveResults(self.iefs, search_results, self.result_holder)
+        self.showResults()
+
+    def openLastAudit(self):
+        """Show the saved results of the last audit without scanning the folders."""
+        self.clearResults()
         model_root = mrt_settings.loadProjectSetting('model_root', './temp')
-        self.iefs, self.search_results = self.file_check.auditModelFiles(model_root)
+        loaded = self.file_check.loadResults(model_root)
+        if loaded is None:
+            QMessageBox.information(
+                self, "No saved audit", "There are no saved results for this model root. Please run the check first."
+            )
+            return
+        self.iefs, self.result_holder = loaded
+        self.showResults()
 
+    def showResults(self):
+        """Update the dialog with the results in self.result_holder."""
         self.summaryLookup = [
-            'tuflow_model', 'fm_model', 'gis', 'result', 'workspace', 'log', 'csv', 'other'
+            'tuflow_model', 'fm_model', 'gis', 'result', 'workspace', 'log', 'csv', 'other',
+            'duplicate'
         ]
-        self.summaryComboBox.addItems(['Tuflow Model', 'FM Model', 'GIS', 'Results', 'Workspaces', 'Logs', 'CSVs', 'Other'])        
+        self.summaryComboBox.addItems(['Tuflow Model', 'FM Model', 'GIS', 'Results', 'Workspaces', 'Logs', 'CSVs', 'Other', 'Duplicates'])        
         self.loadWorkspaceFiles()
         self.workspaceLookup = list(self.workspace_files.keys())
         self.logComboBox.addItems(self.workspaceLookup)
@@ -155,45 +174,39 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
         # self.updateElsewhereTable(self.elsewhereFilesTable, self.search_results.results['found'])
         # self.updateElsewhereTable(self.iefElsewhereFilesTable, self.search_results.results['found_ief'])
         # self.updateMissingTable(self.search_results.results['missing'])
-        # self.updateFileTree()
+        self.updateFileTree()
         
     def showSummaryFiles(self, i):
+        if self.result_holder is None: return
         try:
-            contents = self.search_results[self.summaryLookup[i]]
-        except KeyError:
-            return
+            category = self.summaryLookup[i]
         except IndexError:
             return
         except TypeError:
             return
+        contents = self.result_holder.store.files(categories=[category])
 
         self.summaryTable.setSortingEnabled(False)
         row_position = 0
-        self.summaryTable.setRowCount(row_position)
-        for content in contents:
-            self.summaryTable.insertRow(row_position)
-            self.summaryTable.setItem(row_position, 0, QTableWidgetItem(content.fileExt))
-            self.summaryTable.setItem(row_position, 1, QTableWidgetItem(content.name))
-            self.summaryTable.setItem(row_position, 2, QTableWidgetItem(content.filepath))
+        self.summaryTable.setRowCount(len(contents))
+        for _, extension, directory, name, _, _ in contents:
+            self.summaryTable.setItem(row_position, 0, QTableWidgetItem(extension))
+            self.summaryTable.setItem(row_position, 1, QTableWidgetItem(name))
+            self.summaryTable.setItem(row_position, 2, QTableWidgetItem(os.path.join(directory, name)))
             row_position += 1
         self.summaryTable.setSortingEnabled(True)
         
     def findAllFiles(self, include_files=[], exclude_files=[]):
-        all_files = {}
-        for fname, ftype in self.search_results.items():
-            if include_files and fname not in include_files: continue
-            if exclude_files and fname in exclude_files: continue
-            for f in ftype:
-                all_files[f.name.lower()] = f.filepath
-        return all_files
+        """Get a {lower case file name: file path} lookup for some file categories."""
+        return self.result_holder.store.fileNameLookup(
+            categories=include_files or None, exclude_categories=exclude_files
+        )
 
     def loadWorkspaceFiles(self):
-        self.workspace_files = filecheck.loadWorkspaceFiles(self.search_results['workspace'])
-        all_files = {}
-        for fname, ftype in self.search_results.items():
-            if fname in ['tree', 'log', 'workspace']: continue
-            for f in ftype:
-                all_files[f.name.lower()] = f.filepath
+        self.workspace_files = filecheck.loadWorkspaceFiles(
+            self.result_holder.storedFiles(['workspace'])
+        )
+        all_files = self.findAllFiles(exclude_files=['log', 'workspace'])
 
         for workspace, wfiles in self.workspace_files.items():
             for i, w in enumerate(wfiles):
@@ -202,7 +215,10 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
                 try:
                     newpath = all_files[w.name.lower()]
                 except KeyError:
-                    missing = 'Yes'
+                    if w.exists:
+                        newpath = str(w.path)
+                    else:
+                        missing = 'Yes'
                 self.workspace_files[workspace][i].missing = missing
                 self.workspace_files[workspace][i].newpath = newpath
 
@@ -224,18 +240,15 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
         self.logTable.setSortingEnabled(True)
         
     def loadIefFiles(self):
-        self.ief_files = filecheck.loadIefFiles(self.search_results['fm_model'])
+        self.ief_files = {Path(ief.filepath).name: filecheck.IefFile(ief) for ief in self.iefs}
+        # Keys are lower case file names
         all_files = self.findAllFiles(include_files=['fm_model', 'tuflow_model', 'result'])
-        all_files_keys = [k for k in all_files.keys()]
-        all_files_keys_lower = [k.lower() for k in all_files_keys]
         for name, ief in self.ief_files.items():
             for i, f in enumerate(ief.files):
                 missing = 'No'
-                newpath = 'Missing'
-                if f.name.lower() in all_files_keys_lower:
-                    idx = all_files_keys_lower.index(f.name.lower())
-                    newpath = all_files[all_files_keys[idx]]
-                else:
+                newpath = all_files.get(f.name.lower())
+                if newpath is None:
+                    newpath = 'Missing'
                     missing = 'Yes'
                 self.ief_files[name].files[i].missing = missing
                 self.ief_files[name].files[i].newpath = newpath
@@ -259,17 +272,9 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
 
     def updateFileTree(self):
         include_files = not self.fileTreeFoldersOnlyCheckbox.isChecked()
-        if self.search_results:
-            output, fullpaths = self.search_results.formatFileTree(
-                include_files=include_files, include_full_paths=True
-            )
-            self.fileTreeTextEdit.setPlainText(output)
-            self.fileTreePathTextEdit.setPlainText(fullpaths)
-        if include_files:
-            self.showFullPathsBtn.setEnabled(True)
-        else:
-            self.splitter.setSizes([50, 0])
-            self.showFullPathsBtn.setEnabled(False)
+        file_tree = self.result_holder.file_tree if self.result_holder else None
+        self.fileTreeModel.setFileTree(file_tree, include_files=include_files)
+        self.fileTreeView.resizeColumnToContents(filetreemodel.FileTreeModel.NAME_COLUMN)
             
 
     # def updateSummaryTab(self):
@@ -358,7 +363,7 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
     #     dlg.exec_()
 
     def saveFileTree(self):
-        if self.search_results is None:
+        if self.result_holder is None:
             QMessageBox.warning(
                 self, "No results loaded", "There are no results loaded. Please run the check first."
             )
@@ -374,7 +379,7 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
             mrt_settings.saveProjectSetting('file_check_tree', os.path.split(filepath)[0])
             include_files = not self.fileTreeFoldersOnlyCheckbox.isChecked()
             try:
-                self.search_results.saveFileTree(filepath, include_files=include_files)
+                self.result_holder.saveFileTree(filepath, include_files=include_files)
             except OSError as err:
                 QMessageBox.warning(
                     self, "File tree save failed", err.args[0] 
@@ -382,7 +387,7 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
                 return
 
     def exportResults(self):
-        if self.search_results is None:
+        if self.result_holder is None:
             QMessageBox.warning(
                 self, "No results loaded", "There are no results loaded. Please run the check first."
             )
@@ -397,7 +402,7 @@ class FileCheckDialog(DialogBase, filecheck_ui.Ui_CheckFilesDialog):
         if filepath:
             mrt_settings.saveProjectSetting('file_check_results', os.path.split(filepath)[0])
             try:
-                self.search_results.exportResults(filepath)
+                self.result_holder.exportResults(filepath)
             except OSError as err:
                 QMessageBox.warning(
                     self, "Results export failed", err.args[0] 
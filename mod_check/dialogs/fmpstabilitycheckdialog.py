@@ -1,5 +1,4 @@
 
-import numpy as np
 import os
 import csv
 from PyQt5.QtCore import *
@@ -34,6 +33,7 @@ class FmpStabilityCheckDialog(DialogBase, fmpstability_ui.Ui_FmpStabilityCheckDi
         self.dat_path = ""
         self.results_path = ""
         self.results = None
+        self.batch_results = []
         self.timestep_press_active = False
         self.graph_view = graphs.FmpStabilityGraphicsView()
         self.graph_toolbar = NavigationToolbar(self.graph_view.canvas, self)
@@ -47,13 +47,21 @@ class FmpStabilityCheckDialog(DialogBase, fmpstability_ui.Ui_FmpStabilityCheckDi
         self.validationSeriesCbox.currentTextChanged.connect(lambda s: self.validationSeriesChanged(s))
         
         self.fileSelectionTabWidget.setCurrentIndex(0) # Make sure we're on the usable tab
-        self.fileSelectionTabWidget.removeTab(1)
+        self.fileSelectionTabWidget.removeTab(
+            self.fileSelectionTabWidget.indexOf(self.existingResultsTab)
+        )
         # Not currently used
         # self.existingResultsDatFileWidget.fileChanged.connect(lambda i: self.fileChanged(i, 'dat_file'))
         # self.loadExistingResultsBtn.clicked.connect(self.loadExistingResults)
         # self.flowResultsFileWidget.fileChanged.connect(lambda i: self.fileChanged(i, 'flow_results'))
         # self.stageResultsFileWidget.fileChanged.connect(lambda i: self.fileChanged(i, 'stage_results'))
 
+        self.batchFolderWidget.setStorageMode(QgsFileWidget.GetDirectory)
+        self.batchFolderWidget.fileChanged.connect(lambda i: self.fileChanged(i, 'batch_folder'))
+        self.screenResultsBtn.clicked.connect(self.screenResults)
+        self.exportBatchSummaryBtn.clicked.connect(self.exportBatchSummary)
+        self.batchSummaryTable.cellDoubleClicked.connect(lambda row, col: self.showScreenedRun(row))
+
         self.allSeriesList.currentRowChanged.connect(lambda i: self.updateGraph(i, 'all'))
         self.failedSeriesList.currentRowChanged.connect(lambda i: self.updateGraph(i, 'fail'))
         self.timestepSlider.valueChanged.connect(self.updateTimestepSlider)
@@ -84,6 +92,9 @@ class FmpStabilityCheckDialog(DialogBase, fmpstability_ui.Ui_FmpStabilityCheckDi
         self.stageResultsFileWidget.setFilePath(mrt_settings.loadProjectSetting(
             'stage_results', './temp')
         )
+        self.batchFolderWidget.setFilePath(mrt_settings.loadProjectSetting(
+            'batch_folder', './temp')
+        )
 
     def timestepButtonClicked(self, x, value):
         if value == 'inc':
@@ -125,6 +136,8 @@ class FmpStabilityCheckDialog(DialogBase, fmpstability_ui.Ui_FmpStabilityCheckDi
         self.statusLabel.setText('Loading results...')
         QApplication.processEvents()
         path_with_ext = results_path + '.zzn'
+        # The graph cache holds views of the old results, which would keep them in memory
+        self.graph_view.decimator.cache.clear()
         self.results = fmps_check.convertResults(path_with_ext)
         
         if dat_path and os.path.exists(dat_path):
@@ -137,10 +150,10 @@ class FmpStabilityCheckDialog(DialogBase, fmpstability_ui.Ui_FmpStabilityCheckDi
                 self.results._dat = None
                 QMessageBox.warning(self, "File Load Error", "Failed to load .dat file - series results can still be viewed")
 
-        series_check_type = self.validationSeriesCbox.currentText()
-        self.statusLabel.setText(f'Running stability check for {series_check_type}...')
+        series_check_type, method = self.validationSeries()
+        self.statusLabel.setText(f'Running {method} stability check for {series_check_type}...')
         QApplication.processEvents()
-        status = self.checkStability(series_check_type)
+        status = self.checkStability(series_check_type, method)
 
         self.setupNodeLists(self.results.failed_nodes)
         self.updateGraph(0, 'all')
@@ -153,10 +166,10 @@ class FmpStabilityCheckDialog(DialogBase, fmpstability_ui.Ui_FmpStabilityCheckDi
         if not self.results:
             return
         
-        series_check_type = self.validationSeriesCbox.currentText()
-        self.statusLabel.setText(f'Running stability check for {series_check_type}...')
+        series_check_type, method = self.validationSeries()
+        self.statusLabel.setText(f'Running {method} stability check for {series_check_type}...')
         QApplication.processEvents()
-        status = self.checkStability(series_check_type)
+        status = self.checkStability(series_check_type, method)
 
         self.setupNodeLists(self.results.failed_nodes)
         self.updateGraph(0, 'all')
@@ -204,13 +217,129 @@ class FmpStabilityCheckDialog(DialogBase, fmpstability_ui.Ui_FmpStabilityCheckDi
 #         self.updateGraph(0, 'all')
 #         self.statusLabel.setText('Results load complete')
 
+    def screenResults(self):
+        """Run the stability check on every set of FMP results under the batch_folder.
+
+        Uses the series type and method selected in validationSeriesCbox. The
+        runs are checked in a process pool (see fmpstabilitycheck.screenRuns)
+        and shown in the batch summary table, ranked by the number of nodes
+        that failed.
+        """
+        batch_folder = mrt_settings.loadProjectSetting('batch_folder', None)
+        if not batch_folder or not os.path.isdir(batch_folder):
+            QMessageBox.warning(
+                self, "Results folder not found",
+                "Please set the folder containing the FMP results first."
+            )
+            return
+
+        self.batch_results = []
+        self.batchSummaryTable.setRowCount(0)
+        self.statusLabel.setText('Searching for FMP results under: {0}'.format(batch_folder))
+        QApplication.processEvents()
+        zzn_files = fmps_check.findZznFiles(batch_folder)
+        if not zzn_files:
+            self.statusLabel.setText('')
+            QMessageBox.warning(
+                self, "FMP results not found",
+                "No FMP .zzn files (with a matching .zzl) were found within subfolders."
+            )
+            return
+
+        def updateProgress(done):
+            self.batchProgressBar.setValue(done)
+            self.statusLabel.setText('Checked {0} of {1} runs'.format(done, len(zzn_files)))
+            QApplication.processEvents()
+
+        series_check_type, method = self.validationSeries()
+        self.statusLabel.setText(f'Running {method} stability check for {series_check_type} on {len(zzn_files)} runs...')
+        self.batchProgressBar.setMaximum(len(zzn_files))
+        self.batchProgressBar.setValue(0)
+        QApplication.processEvents()
+        self.batch_results, errors = fmps_check.screenRuns(
+            zzn_files, series_check_type, method, progress_callback=updateProgress
+        )
+        self.batchProgressBar.setValue(0)
+        self.updateBatchSummaryTable()
+        self.statusLabel.setText('Checked {0} runs, {1} with failed nodes'.format(
+            len(self.batch_results), len([r for r in self.batch_results if r['failed_nodes']])
+        ))
+        if errors:
+            dlg = graphs.LocalHelpDialog(title='FMP results load errors')
+            txt = ['Some FMP results could not be checked:\n']
+            txt += ['{0}\n    {1}'.format(e['path'], e['error'].strip()) for e in errors]
+            dlg.showText('\n'.join(txt), wrap_text=False)
+            dlg.exec_()
+
+    def updateBatchSummaryTable(self):
+        """Update the batch summary table with the ranked runs."""
+        def numberItem(value, decimals):
+            item = QTableWidgetItem()
+            if value is None:
+                return item
+            # Set the number rather than the text so the columns sort properly
+            item.setData(Qt.DisplayRole, round(value, decimals) if decimals else value)
+            return item
+
+        self.batchSummaryTable.setSortingEnabled(False)
+        self.batchSummaryTable.setRowCount(len(self.batch_results))
+        for row, r in enumerate(self.batch_results):
+            worst_nodes = ', '.join(
+                f[0] for f in r['failed_nodes'][:fmps_check.SCREENING_WORST_NODES]
+            )
+            self.batchSummaryTable.setItem(row, 0, QTableWidgetItem(r['name']))
+            self.batchSummaryTable.setItem(row, 1, numberItem(len(r['failed_nodes']), 0))
+            self.batchSummaryTable.setItem(row, 2, numberItem(r['nodes'], 0))
+            self.batchSummaryTable.setItem(row, 3, numberItem(r['fail_count'], 0))
+            self.batchSummaryTable.setItem(row, 4, numberItem(r['first_fail'], 3))
+            self.batchSummaryTable.setItem(row, 5, numberItem(r['last_fail'], 3))
+            self.batchSummaryTable.setItem(row, 6, QTableWidgetItem(worst_nodes))
+            self.batchSummaryTable.setItem(row, 7, QTableWidgetItem(r['path']))
+        self.batchSummaryTable.setSortingEnabled(True)
+
+    def exportBatchSummary(self):
+        """Write the batch screening results to csv (see fmpstabilitycheck.exportScreeningSummary)."""
+        if not self.batch_results:
+            QMessageBox.warning(
+                self, "No results to export", "Please screen a folder of FMP results first."
+            )
+            return
+        csv_file = mrt_settings.loadProjectSetting(
+            'batch_summary_file', mrt_settings.loadProjectSetting('batch_folder', './temp')
+        )
+        if os.path.isdir(csv_file):
+            csv_file = os.path.join(csv_file, 'fmp_stability_summary.csv')
+        filepath = QFileDialog(self).getSaveFileName(
+            self, 'Export Results', csv_file, "CSV File (*.csv)"
+        )[0]
+        if filepath:
+            mrt_settings.saveProjectSetting('batch_summary_file', filepath)
+            try:
+                fmps_check.exportScreeningSummary(self.batch_results, filepath)
+            except OSError as err:
+                QMessageBox.warning(
+                    self, "Results export failed", str(err)
+                )
+
+    def showScreenedRun(self, row):
+        """Load the run in a row of the batch summary table in the Dat and Results tab."""
+        col_count = self.batchSummaryTable.columnCount()
+        full_path = self.batchSummaryTable.item(row, col_count-1).text()
+        self.fileSelectionTabWidget.setCurrentWidget(self.datAndResultsTab)
+        QApplication.processEvents()
+        self.datResultsFileWidget.blockSignals(True)
+        self.datResultsFileWidget.setFilePath(full_path)
+        self.datResultsFileWidget.blockSignals(False)
+        self.fileChanged(full_path, 'results_file')
+        self.loadDatResults()
+
     def setupNodeLists(self, failed_nodes):
         self.allSeriesList.clear()
         self.failedSeriesList.clear()
         self.allSeriesList.addItems(self.results.nodes)
         for f in failed_nodes:
             self.failedSeriesList.addItem(f[0])
-        self.timestepSlider.setMaximum(len(self.results.times))
+        self.timestepSlider.setMaximum(len(self.results.times) - 1)
 
     def updateTimestepSlider(self, val):
         if self.timestep_press_active:
@@ -225,155 +354,80 @@ class FmpStabilityCheckDialog(DialogBase, fmpstability_ui.Ui_FmpStabilityCheckDi
             self.allSeriesList.setCurrentRow(node_index)
             self.allSeriesList.blockSignals(False)
 
-        series_check_type = self.validationSeriesCbox.currentText()
+        series_check_type, _ = self.validationSeries()
         node_name = self.results.nodes[node_index]
         node_type = self.results.unit_type(node_name)
         self.nodeNameLabel.setText(node_name)
         self.nodeTypeLabel.setText(node_type)
 
+        # The series are views of the results arrays, so the graph cache
+        # recognises them when only the timestep has changed
         timestep_idx = self.timestepSlider.value()
         timestep = self.results.times[timestep_idx]
-        time_stage = self.results.stage.at[timestep, node_name]
+        time_stage = self.results.stage[timestep_idx, node_index]
         self.timestepValueLabel.setText(str("{:.3f}".format(timestep)))
         self.graph_view.drawPlot(
-            self.results.times, [self.results.stage[node_name], self.results.flows[node_name]], 
-            self.results.derivs[node_index], timestep, series_type=series_check_type, 
+            self.results.times, 
+            [self.results.series('Stage', node_index), self.results.series('Flow', node_index)], 
+            self.results.derivs.node(node_index), timestep, series_type=series_check_type, 
             node_name=node_name,
         )
         self.updateGeomGraph(node_name, time_stage)
 
     def updateGeomGraph(self, node_name, time_stage):
-        geom = None
-        if self.results.dat is not None:
-            geom = fmps_check.loadGeometry(node_name, self.results.dat)
-
+        # Built once when the dat is loaded, see sectiongeometry
+        geom = self.results.geometry.get(node_name)
         if geom is None:
             self.geom_graph_view.clearPlot()
         else:
             self.geom_graph_view.drawPlot(geom, node_name, time_stage)
 
-    def checkStability(self, series_type):
+    def validationSeries(self):
+        """Get the series type and check method selected in validationSeriesCbox.
+
+        Return:
+            tuple(str, str) - 'Flow' or 'Stage' and the fmpstabilitycheck
+                DERIVATIVE_METHOD or SPECTRAL_METHOD.
+        """
+        text = self.validationSeriesCbox.currentText()
+        series_type = 'Flow' if text.startswith('Flow') else 'Stage'
+        if 'Spectral' in text:
+            return series_type, fmps_check.SPECTRAL_METHOD
+        return series_type, fmps_check.DERIVATIVE_METHOD
+
+    def checkStability(self, series_type, method=fmps_check.DERIVATIVE_METHOD):
         """Stability analysis of time series.
 
-        Analyse the flow time series to check whether there appear to be any
-        unstable sections in the simulation results. This works quite well for
-        identifying sections of a series with serious instability. If the
-        tolerances are lowered to identify less significant stability isssues, it
-        tends to cause a lot of false positives. I think this is just an issue
-        with the nature of the series data, but there is probably a better way.
-
-        This is a multi-step process:
-            1. Smooth the time series a bit. The results usually have a lot of 
-               small variations - increasing/decreasing over individual timesteps -
-               that shouldn't be considered an instability. The series is smoothed
-               by averaging the values over the "time_window" of 0.5 hours.
-            2. Take the first and second order derivatives of the smoothed time
-               series with respect to time and loop through them to find the max, 
-               min and absolute values over a window of 1 hour.
-            3. Check whether the dy2/d2x > dy/dx * 1.5 for each value with a
-               tolerance of -1 < dy2 > 1 to avoid some of the remaining signal noise.
-
-        Note: Highly un-optimised at the moment. 
-            Should check to see if there's some way to avoid having to do so much 
-            looping to get a reasonable result. This is caused by needing to 
-            smooth the time series first.
-            Still think that an FFT would be better here?
+        Runs fmpstabilitycheck.checkStability (or checkSpectralStability) on
+        the flow or stage results of every node and stores the derivatives and
+        failed nodes in the results.
+
+        Args:
+            series_type(str): 'Flow' or 'Stage'.
+            method=DERIVATIVE_METHOD(str): fmpstabilitycheck DERIVATIVE_METHOD
+                or SPECTRAL_METHOD.
         """
-        
         self.loadResultsProgressBar.setMaximum(len(self.results.nodes))
         self.loadResultsProgressBar.setValue(0)
-        # progress_inc = len(self.nodes) / 100
-        TOL = 1.5
-        SMOOTH_TIME_WINDOW = 0.5
+        # One row per node for the check
         if series_type == 'Flow':
-            DY2_MIN_TOL = 1 
+            data = self.results.flows.T
+        else:
+            data = self.results.stage.T
+
+        if method == fmps_check.SPECTRAL_METHOD:
+            check = fmps_check.checkSpectralStability
         else:
-            DY2_MIN_TOL = 0.2
-
-        DX = self.results.save_interval
-        node_fail = []
-        fail = False
-        derivs = []
-        failed_nodes = []
-        for i, node in enumerate(self.results.nodes):
-            if i % 5 == 0:
-                self.loadResultsProgressBar.setValue(i)
-
-            window_length = -1
-            found_timewindow = False
-            found_hourlength = False
-            for j, t in enumerate(self.results.times):
-                if found_timewindow and found_hourlength:
-                    break
-
-                if not found_timewindow and t - self.results.times[0] >= SMOOTH_TIME_WINDOW:
-                    window_length = j
-                    found_timewindow = True
-                if t - self.results.times[0] >= 1:
-                    hour_length = j
-                    found_hourlength = True
-
-            new_series = []
-            count = 0
-            if series_type == 'Flow':
-                series = self.results.flows[node].to_numpy()
-            else:
-                series = self.results.stage[node].to_numpy()
-
-            for j, s in enumerate(series):                    
-                if j > window_length:
-                    mysum = sum(series[j-window_length:j])
-                    mylen = len(series[j-window_length:j])
-                else:
-                    mysum = sum(series[j-count:j])
-                    mylen = len(series[j-count:j])
-
-                if j == 0:
-                    new_series.append(
-                        s
-                    )
-                else:
-                    new_series.append(
-                        mysum / mylen
-                    )
-                count += 1
-            dy = np.diff(new_series, n=1) / DX
-            dy2 = np.diff(new_series, n=2) / DX
-
-            status = 'Passed'
-
-#             if max(dy2) > 5 and min(dy2) < 5:
-#                 status = 'Failed'
-            fail_times = []
-            newhour_length = hour_length #int(hour_length / 2)
-
-            # Loop the 2nd derivative series and scan the window
-            # for variations in 1st/2nd derivative change in relation
-            # to the tolerances defined above
-            for j, val in enumerate(dy2):
-                if j > hour_length:
-
-                    maxdy2 = max(dy2[j-newhour_length:j])
-                    mindy2 = min(dy2[j-newhour_length:j])
-                    maxdy = max(dy[j-newhour_length:j])
-                    mindy = min(dy[j-newhour_length:j])
-
-                    abs_dy2 = abs(maxdy2 - mindy2)
-                    abs_dy = abs(maxdy - mindy)
-                    abscheck = abs_dy2 > (abs_dy * TOL)
-
-                    if (maxdy2 > DY2_MIN_TOL or mindy2 < (DY2_MIN_TOL * -1)) and abscheck:
-                        status = 'Failed'
-                        fail_times.append(round(self.results.times[j], 3))
-
-            if status == 'Failed':
-                failed_nodes.append([node, i])
-            derivs.append({
-                'dy2': dy2, 'f': new_series, 'dy': dy, 'status': status, 'fail_times': fail_times, 
-            })
-
-        self.results.failed_nodes = failed_nodes
+            check = fmps_check.checkStability
+        # Let go of the cached views of the old derivatives (see loadDatResults)
+        self.graph_view.decimator.cache.clear()
+        derivs = fmps_check.StabilityDerivatives(len(self.results.times), len(self.results.nodes))
+        check(
+            data, self.results.times, self.results.save_interval, series_type,
+            progress_callback=self.loadResultsProgressBar.setValue, derivs_out=derivs
+        )
+        self.results.failed_nodes = [[self.results.nodes[i], int(i)] for i in derivs.failedNodes()]
         self.results.derivs = derivs
         self.loadResultsProgressBar.setValue(0)
-        return node_fail
+        return []
 
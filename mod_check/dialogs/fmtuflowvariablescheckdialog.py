@@ -16,6 +16,7 @@ from ..forms import ui_runvariables_check_dialog as fmptuflowvariablescheck_ui
 from ..tools import help, globaltools
 from ..tools import runvariablescheck as runvariables_check
 from ..tools import settings as mrt_settings
+from ..tools import resultsindex, resultswatcher
 from PyQt5.pyrcc_main import showHelp
 
 # DATA_DIR = './data'
@@ -63,6 +64,7 @@ class FmpTuflowVariablesCheckDialog(DialogBase, fmptuflowvariablescheck_ui.Ui_Fm
         self.fmpMultipleSummaryTable.customContextMenuRequested.connect(self._multipleIefTableContext)
         self.tuflowMultipleSummaryTable.setContextMenuPolicy(Qt.CustomContextMenu)
         self.tuflowMultipleSummaryTable.customContextMenuRequested.connect(self._multipleTsfTableContext)
+        resultswatcher.startWatching()
 
     def fileChanged(self, path, caller):
         mrt_settings.saveProjectSetting(caller, path)
@@ -172,12 +174,7 @@ class FmpTuflowVariablesCheckDialog(DialogBase, fmptuflowvariablescheck_ui.Ui_Fm
         failed_load = []
         has_error = False
         try:
-            ief_files = []
-            for root, dirs, files in os.walk(path):
-                for file in files:
-                    fext = os.path.splitext(file)
-                    if len(fext) > 1 and fext[1] == '.ief':
-                        ief_files.append(os.path.join(root, file))
+            ief_files = resultsindex.findArtefacts(path, ['ief'])
 
             check = runvariables_check.IefVariablesCheck(self.project, 'fakepath')
             outputs = []
@@ -2,6 +2,7 @@
 # import numpy as np
 import os
 import csv
+import time
 # import json
 # from pathlib import Path
 from PyQt5.QtCore import *
@@ -17,6 +18,8 @@ from .dialogbase import DialogBase
 from ..forms import ui_tuflowstability_check_dialog as tuflowstability_ui
 from ..tools import help, globaltools
 from ..tools import tuflowstabilitycheck as tmb_check
+from ..tools import tailfollow
+from ..tools import resultswatcher
 from ..tools import settings as mrt_settings
 
 from ..mywidgets import graphdialogs as graphs
@@ -42,10 +45,16 @@ class TuflowStabilityCheckDialog(DialogBase, tuflowstability_ui.Ui_TuflowStabili
         self.summary_graph_toolbar = NavigationToolbar(self.summary_graphics_view.canvas, self)
         
         self.hpc_file_results = None
+        self.hpc_summary_results = []
         self.current_hpc_filetype = ''
         self.hpc_individual_graphics_view = graphs.HpcCheckIndividualGraphicsView()
         self.hpc_individual_graph_toolbar = NavigationToolbar(self.hpc_individual_graphics_view.canvas, self)
 
+        # Follows files that are still being written by a running simulation
+        self.run_monitor = tailfollow.RunMonitor(self)
+        self.run_monitor.updated.connect(self.followedFilesUpdated)
+        resultswatcher.startWatching()
+
         mb_folder = mrt_settings.loadProjectSetting(
             'mb_folder', self.project.readPath('./temp')
         )
@@ -78,10 +87,13 @@ class TuflowStabilityCheckDialog(DialogBase, tuflowstability_ui.Ui_TuflowStabili
         self.volumeErrorsRadioBtn.clicked.connect(self.updateIndividualGraph)
         self.mbShowDvolCheckbox.stateChanged.connect(self.graphMultipleResults)
         self.mbSummarySelectAllCheckbox.stateChanged.connect(self.summarySelectAll)
+        self.mbSummaryFollowCheckbox.stateChanged.connect(lambda i: self.followSummaryFiles())
+        self.mbFollowCheckbox.stateChanged.connect(lambda i: self.followMbFile())
         
         self.hpcFileWidget.setFilePath(hpc_file)
         self.hpcFileWidget.fileChanged.connect(lambda i: self.fileChanged(i, 'hpc_file'))
         self.hpcReloadButton.clicked.connect(self.loadHpcFile)
+        self.hpcFollowCheckbox.stateChanged.connect(lambda i: self.followHpcFile())
         self.hpcUpdateGraphBtn.clicked.connect(self.updateHpcGraph)
         self.hpcDtStarRadioBtn.clicked.connect(self.updateHpcGraph)
         self.hpcDtRadioBtn.clicked.connect(self.updateHpcGraph)
@@ -90,6 +102,14 @@ class TuflowStabilityCheckDialog(DialogBase, tuflowstability_ui.Ui_TuflowStabili
         self.hpcNdRadioBtn.clicked.connect(self.updateHpcGraph)
         self.hpcEffRadioBtn.clicked.connect(self.updateHpcGraph)
 
+        self.hpcFolderWidget.setStorageMode(QgsFileWidget.GetDirectory)
+        self.hpcFolderWidget.setFilePath(hpc_folder)
+        self.hpcFolderWidget.fileChanged.connect(lambda i: self.fileChanged(i, 'hpc_folder'))
+        self.hpcReloadSummaryBtn.clicked.connect(self.findHpcFiles)
+        self.hpcSummaryTable.customContextMenuRequested.connect(self._showIndividualHpcPlot)
+        self.hpcSummaryTable.cellDoubleClicked.connect(lambda row, col: self.showHpcRun(row))
+        self.hpcSummaryTable.setColumnWidth(0, 150)
+
         self.mbSummaryTable.setContextMenuPolicy(Qt.CustomContextMenu)
         self.mbSummaryTable.customContextMenuRequested.connect(self._showIndividualMbPlot)
         self.mbSummaryTable.setColumnWidth(0, 30)
@@ -112,6 +132,8 @@ class TuflowStabilityCheckDialog(DialogBase, tuflowstability_ui.Ui_TuflowStabili
             self.loadMbFile()
         elif caller == 'hpc_file':
             self.loadHpcFile()
+        elif caller == 'hpc_folder':
+            self.findHpcFiles()
 
     @pyqtSlot(str)
     def _updateStatus(self, status):
@@ -165,6 +187,7 @@ class TuflowStabilityCheckDialog(DialogBase, tuflowstability_ui.Ui_TuflowStabili
             'mb_folder', self.project.readPath('./temp')
         )
         self.summary_results = []
+        self.run_monitor.unfollowAll(lambda key: isinstance(key, tuple) and key[0] == 'summary')
         self.mbSummaryTable.setRowCount(0)
         mb_check = tmb_check.TuflowStabilityCheck()
         mb_check.status_signal.connect(self._updateStatus)
@@ -186,6 +209,8 @@ class TuflowStabilityCheckDialog(DialogBase, tuflowstability_ui.Ui_TuflowStabili
             self.updateSummaryTable()
             self.mbSummaryTable.blockSignals(False)
             self.graphMultipleResults()
+            if self.mbSummaryFollowCheckbox.isChecked():
+                self.followSummaryFiles()
             if failed_load['error'] or failed_load['empty']:
                 dlg = graphs.LocalHelpDialog(title='MB file load errors')
                 txt = ['Some MB files failed to load or contained no data:\n']
@@ -292,6 +317,9 @@ class TuflowStabilityCheckDialog(DialogBase, tuflowstability_ui.Ui_TuflowStabili
         )
 
         headers, self.current_mb_filetype, self.current_mb_filename = tmb_check.getMbHeaders(mb_path)
+        if self.mbFollowCheckbox.isChecked():
+            self.followMbFile()
+            return
         mb_check = tmb_check.TuflowStabilityCheck()
         self._updateStatus('Loading file: {0}'.format(mb_path))
         try:
@@ -336,6 +364,9 @@ class TuflowStabilityCheckDialog(DialogBase, tuflowstability_ui.Ui_TuflowStabili
 
         self.current_hpc_filename = os.path.split(hpc_path)[1]
         self.hpc_check = tmb_check.TuflowHpcCheck()
+        if self.hpcFollowCheckbox.isChecked():
+            self.followHpcFile()
+            return
         self._updateStatus('Loading file: {0}'.format(hpc_path))
         # try:
         self.hpc_check.loadHpcFile(hpc_path)
@@ -372,4 +403,194 @@ class TuflowStabilityCheckDialog(DialogBase, tuflowstability_ui.Ui_TuflowStabili
         if series_meta:
             self.hpc_individual_graphics_view.drawPlot(
                 series_meta, self.hpc_check.series_data, self.current_hpc_filename
-            )
\ No newline at end of file
+            )
+
+    def findHpcFiles(self):
+        """Locate and summarise all of the hpc.dt.csv files under the hpc_folder.
+
+        The runs are shown in the HPC summary table ranked by the time they
+        spent with a timestep below the dt threshold, so runs where the
+        timestep collapsed are at the top.
+        """
+        hpc_path = mrt_settings.loadProjectSetting(
+            'hpc_folder', self.project.readPath('./temp')
+        )
+        self.hpc_summary_results = []
+        self.hpcSummaryTable.setRowCount(0)
+        hpc_check = tmb_check.TuflowHpcCheck()
+        hpc_check.status_signal.connect(self._updateStatus)
+        try:
+            self._updateStatus('Searching for HPC files under: {0}'.format(hpc_path))
+            hpc_files = hpc_check.findHpcFiles(hpc_path)
+            self.hpc_summary_results, failed_load = hpc_check.loadMultipleFiles(
+                hpc_files, self.hpcDtThresholdSpinbox.value()
+            )
+        except:
+            QMessageBox.warning(
+                self, "HPC files load error", 
+                "Failed to load HPC dt files"
+            )
+            return
+        if not self.hpc_summary_results:
+            QMessageBox.warning(
+                self, "HPC files not found", 
+                "No TUFLOW hpc.dt.csv files containing data were found within subfolders."
+            )
+            return
+        self.updateHpcSummaryTable()
+        if failed_load['error'] or failed_load['empty']:
+            dlg = graphs.LocalHelpDialog(title='HPC file load errors')
+            txt = ['Some HPC files failed to load or contained no data:\n']
+            txt += ['\n\nFailed to load:\n'] + failed_load['error']
+            txt += ['\n\nNo data:\n'] + failed_load['empty']
+            dlg.showText('\n'.join(txt), wrap_text=False)
+            dlg.exec_()
+
+    def updateHpcSummaryTable(self):
+        """Update the HPC summary table with the ranked runs."""
+        def numberItem(value, decimals):
+            item = QTableWidgetItem()
+            # Set the number rather than the text so the columns sort properly
+            item.setData(Qt.DisplayRole, round(value, decimals) if decimals else value)
+            return item
+
+        self.hpcSummaryTable.setSortingEnabled(False)
+        self.hpcSummaryTable.setRowCount(len(self.hpc_summary_results))
+        for row, r in enumerate(self.hpc_summary_results):
+            self.hpcSummaryTable.setItem(row, 0, QTableWidgetItem(r['name']))
+            self.hpcSummaryTable.setItem(row, 1, numberItem(r['min_dt'], 4))
+            self.hpcSummaryTable.setItem(row, 2, numberItem(r['time_below_dt'], 4))
+            self.hpcSummaryTable.setItem(row, 3, numberItem(r['nu_exceeded'], 0))
+            self.hpcSummaryTable.setItem(row, 4, numberItem(r['nc_exceeded'], 0))
+            self.hpcSummaryTable.setItem(row, 5, numberItem(r['nd_exceeded'], 0))
+            self.hpcSummaryTable.setItem(row, 6, numberItem(r['eff_p5'], 1))
+            self.hpcSummaryTable.setItem(row, 7, numberItem(r['eff_p50'], 1))
+            self.hpcSummaryTable.setItem(row, 8, numberItem(r['end_time'], 2))
+            self.hpcSummaryTable.setItem(row, 9, QTableWidgetItem(r['path']))
+        self.hpcSummaryTable.setSortingEnabled(True)
+
+    def _showIndividualHpcPlot(self, pos):
+        """Handle HPC summary table context menu."""
+        index = self.hpcSummaryTable.itemAt(pos)
+        if index is None: return
+        menu = QMenu()
+        show_graph_action = menu.addAction("Show detailed graph")
+        action = menu.exec_(self.hpcSummaryTable.viewport().mapToGlobal(pos))
+        if action == show_graph_action:
+            self.showHpcRun(self.hpcSummaryTable.currentRow())
+
+    def showHpcRun(self, row):
+        """Load the run in a row of the HPC summary table in the HPC tab."""
+        col_count = self.hpcSummaryTable.columnCount()
+        full_path = self.hpcSummaryTable.item(row, col_count-1).text()
+        self.mainTabWidget.setCurrentWidget(self.hpcTab)
+        QApplication.processEvents()
+        mrt_settings.saveProjectSetting('hpc_file', full_path)
+        self.hpcFileWidget.blockSignals(True)
+        self.hpcFileWidget.setFilePath(full_path)
+        self.hpcFileWidget.blockSignals(False)
+        self.loadHpcFile()
+
+    def followSummaryFiles(self):
+        """Start or stop following the summary runs that are still being written.
+
+        Only runs with an MB file modified in the last ACTIVE_RUN_SECONDS are
+        followed, finished runs won't change.
+        """
+        self.run_monitor.unfollowAll(lambda key: isinstance(key, tuple) and key[0] == 'summary')
+        if not self.mbSummaryFollowCheckbox.isChecked():
+            return
+        now = time.time()
+        active = 0
+        for i, r in enumerate(self.summary_results):
+            try:
+                if now - os.path.getmtime(r['path']) > tailfollow.ACTIVE_RUN_SECONDS: continue
+            except OSError:
+                continue
+            reader = tailfollow.MbTailReader(r['path'], ['Cum ME (%)', 'dVol'])
+            try:
+                reader.poll()
+            except (OSError, ValueError):
+                continue
+            self.run_monitor.follow(('summary', i), reader)
+            self.updateSummaryRun(i, reader)
+            active += 1
+        self.graphMultipleResults()
+        self._updateStatus('Following {0} active runs'.format(active))
+
+    def updateSummaryRun(self, row, reader):
+        """Update a summary run from its followed MB file."""
+        series = reader.series()
+        if series is None: return
+        r = self.summary_results[row]
+        r['data'] = series
+        r['max_mb'], r['fail'] = tmb_check.mbStatus(series['Cum ME (%)'])
+        self.mbSummaryTable.blockSignals(True)
+        self.mbSummaryTable.item(row, 2).setText(str(r['max_mb']))
+        self.mbSummaryTable.item(row, 3).setText(str(r['fail']))
+        self.mbSummaryTable.blockSignals(False)
+
+    def followMbFile(self):
+        """Start or stop following the individual MB file."""
+        self.run_monitor.unfollow('mb_file')
+        if not self.mbFollowCheckbox.isChecked():
+            return
+        mb_path = mrt_settings.loadProjectSetting(
+            'mb_file', self.project.readPath('./temp')
+        )
+        headers, self.current_mb_filetype, self.current_mb_filename = tmb_check.getMbHeaders(mb_path)
+        reader = tailfollow.MbTailReader(mb_path, headers)
+        try:
+            reader.poll()
+        except (OSError, ValueError) as err:
+            QMessageBox.warning(self, "MB file load error", str(err))
+            return
+        self.run_monitor.follow('mb_file', reader)
+        self.file_results = reader.series()
+        if self.file_results is not None:
+            self.updateIndividualGraph()
+        self._updateStatus('Following file: {0}'.format(mb_path))
+
+    def followHpcFile(self):
+        """Start or stop following the HPC dt file."""
+        self.run_monitor.unfollow('hpc_file')
+        if not self.hpcFollowCheckbox.isChecked():
+            return
+        hpc_path = mrt_settings.loadProjectSetting(
+            'hpc_file', self.project.readPath('./temp')
+        )
+        self.current_hpc_filename = os.path.split(hpc_path)[1]
+        self.hpc_check = tmb_check.TuflowHpcCheck()
+        reader = tailfollow.HpcTailReader(hpc_path)
+        try:
+            reader.poll()
+        except (OSError, ValueError) as err:
+            QMessageBox.warning(self, "HPC file load error", str(err))
+            return
+        self.run_monitor.follow('hpc_file', reader)
+        if len(reader.data) > 0:
+            self.hpc_check.series_data = reader.data
+            self.updateHpcGraph()
+        self._updateStatus('Following file: {0}'.format(hpc_path))
+
+    def followedFilesUpdated(self, keys):
+        """Update the tables and graphs for followed files with new rows.
+
+        Called by the RunMonitor, which limits how often this happens.
+        """
+        summary_changed = False
+        for key in keys:
+            reader = self.run_monitor.readers.get(key)
+            if reader is None: continue
+            if key == 'mb_file':
+                self.file_results = reader.series()
+                if self.file_results is not None:
+                    self.updateIndividualGraph()
+            elif key == 'hpc_file':
+                self.hpc_check.series_data = reader.data
+                self.updateHpcGraph()
+            elif isinstance(key, tuple) and key[0] == 'summary' and key[1] < len(self.summary_results):
+                self.updateSummaryRun(key[1], reader)
+                summary_changed = True
+        if summary_changed:
+            self.graphMultipleResults()
@@ -33,6 +33,17 @@ class Ui_CheckFilesDialog(object):
         self.reloadBtn.setAutoDefault(False)
         self.reloadBtn.setObjectName("reloadBtn")
         self.horizontalLayout.addWidget(self.reloadBtn)
+        self.fullRescanCheckbox = QtWidgets.QCheckBox(self.modelFolderGroupbox)
+        self.fullRescanCheckbox.setObjectName("fullRescanCheckbox")
+        self.horizontalLayout.addWidget(self.fullRescanCheckbox)
+        self.findDuplicatesCheckbox = QtWidgets.QCheckBox(self.modelFolderGroupbox)
+        self.findDuplicatesCheckbox.setChecked(True)
+        self.findDuplicatesCheckbox.setObjectName("findDuplicatesCheckbox")
+        self.horizontalLayout.addWidget(self.findDuplicatesCheckbox)
+        self.openLastAuditBtn = QtWidgets.QPushButton(self.modelFolderGroupbox)
+        self.openLastAuditBtn.setAutoDefault(False)
+        self.openLastAuditBtn.setObjectName("openLastAuditBtn")
+        self.horizontalLayout.addWidget(self.openLastAuditBtn)
         spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout.addItem(spacerItem)
         self.verticalLayout.addLayout(self.horizontalLayout)
@@ -116,7 +127,6 @@ class Ui_CheckFilesDialog(object):
         self.verticalLayout_2.addWidget(self.fmpTable)
         self.resultsTabWidget.addTab(self.fmpTab, "")
         self.fileTreeTab = QtWidgets.QWidget()
-        self.fileTreeTab.setEnabled(False)
         self.fileTreeTab.setObjectName("fileTreeTab")
         self.verticalLayout_14 = QtWidgets.QVBoxLayout(self.fileTreeTab)
         self.verticalLayout_14.setObjectName("verticalLayout_14")
@@ -148,37 +158,15 @@ class Ui_CheckFilesDialog(object):
         self.saveFileTreeBtn.setObjectName("saveFileTreeBtn")
         self.horizontalLayout_4.addWidget(self.saveFileTreeBtn)
         self.verticalLayout_14.addLayout(self.horizontalLayout_4)
-        self.splitter = QtWidgets.QSplitter(self.fileTreeTab)
-        self.splitter.setOrientation(QtCore.Qt.Horizontal)
-        self.splitter.setHandleWidth(5)
-        self.splitter.setObjectName("splitter")
-        self.fileTreeTextEdit = QtWidgets.QTextEdit(self.splitter)
-        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
-        sizePolicy.setHorizontalStretch(1)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.fileTreeTextEdit.sizePolicy().hasHeightForWidth())
-        self.fileTreeTextEdit.setSizePolicy(sizePolicy)
+        self.fileTreeView = QtWidgets.QTreeView(self.fileTreeTab)
         font = QtGui.QFont()
         font.setFamily("Courier")
-        self.fileTreeTextEdit.setFont(font)
-        self.fileTreeTextEdit.setStyleSheet("    QTextEdit { selection-background-color: yellow }\n"
-"    QTextEdit { selection-color: black }")
-        self.fileTreeTextEdit.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
-        self.fileTreeTextEdit.setLineWrapMode(QtWidgets.QTextEdit.NoWrap)
-        self.fileTreeTextEdit.setObjectName("fileTreeTextEdit")
-        self.fileTreePathTextEdit = QtWidgets.QTextEdit(self.splitter)
-        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.fileTreePathTextEdit.sizePolicy().hasHeightForWidth())
-        self.fileTreePathTextEdit.setSizePolicy(sizePolicy)
-        font = QtGui.QFont()
-        font.setFamily("Courier")
-        self.fileTreePathTextEdit.setFont(font)
-        self.fileTreePathTextEdit.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
-        self.fileTreePathTextEdit.setLineWrapMode(QtWidgets.QTextEdit.NoWrap)
-        self.fileTreePathTextEdit.setObjectName("fileTreePathTextEdit")
-        self.verticalLayout_14.addWidget(self.splitter)
+        self.fileTreeView.setFont(font)
+        self.fileTreeView.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
+        self.fileTreeView.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.fileTreeView.setUniformRowHeights(True)
+        self.fileTreeView.setObjectName("fileTreeView")
+        self.verticalLayout_14.addWidget(self.fileTreeView)
         self.verticalLayout_14.setStretch(1, 1)
         self.resultsTabWidget.addTab(self.fileTreeTab, "")
         self.verticalLayout_5.addWidget(self.resultsTabWidget)
@@ -209,14 +197,17 @@ class Ui_CheckFilesDialog(object):
         self.resultsTabWidget.setCurrentIndex(0)
         self.buttonBox.rejected.connect(CheckFilesDialog.reject) # type: ignore
         QtCore.QMetaObject.connectSlotsByName(CheckFilesDialog)
-        CheckFilesDialog.setTabOrder(self.reloadBtn, self.resultsTabWidget)
+        CheckFilesDialog.setTabOrder(self.reloadBtn, self.fullRescanCheckbox)
+        CheckFilesDialog.setTabOrder(self.fullRescanCheckbox, self.findDuplicatesCheckbox)
+        CheckFilesDialog.setTabOrder(self.findDuplicatesCheckbox, self.openLastAuditBtn)
+        CheckFilesDialog.setTabOrder(self.openLastAuditBtn, self.resultsTabWidget)
         CheckFilesDialog.setTabOrder(self.resultsTabWidget, self.fileTreeFoldersOnlyCheckbox)
         CheckFilesDialog.setTabOrder(self.fileTreeFoldersOnlyCheckbox, self.searchFileTreeTextbox)
         CheckFilesDialog.setTabOrder(self.searchFileTreeTextbox, self.fileTreeSearchBtn)
         CheckFilesDialog.setTabOrder(self.fileTreeSearchBtn, self.fileTreeSearchFromTopBtn)
         CheckFilesDialog.setTabOrder(self.fileTreeSearchFromTopBtn, self.saveFileTreeBtn)
-        CheckFilesDialog.setTabOrder(self.saveFileTreeBtn, self.fileTreeTextEdit)
-        CheckFilesDialog.setTabOrder(self.fileTreeTextEdit, self.exportResultsBtn)
+        CheckFilesDialog.setTabOrder(self.saveFileTreeBtn, self.fileTreeView)
+        CheckFilesDialog.setTabOrder(self.fileTreeView, self.exportResultsBtn)
 
     def retranslateUi(self, CheckFilesDialog):
         _translate = QtCore.QCoreApplication.translate
@@ -224,6 +215,12 @@ class Ui_CheckFilesDialog(object):
         self.modelFolderGroupbox.setTitle(_translate("CheckFilesDialog", "Model location"))
         self.label.setText(_translate("CheckFilesDialog", "Model root folder"))
         self.reloadBtn.setText(_translate("CheckFilesDialog", "Reload"))
+        self.fullRescanCheckbox.setToolTip(_translate("CheckFilesDialog", "Read every folder again instead of reusing unchanged folders from the last audit"))
+        self.fullRescanCheckbox.setText(_translate("CheckFilesDialog", "Full rescan"))
+        self.findDuplicatesCheckbox.setToolTip(_translate("CheckFilesDialog", "Search for files with the same contents as another file under the model root"))
+        self.findDuplicatesCheckbox.setText(_translate("CheckFilesDialog", "Find duplicates"))
+        self.openLastAuditBtn.setToolTip(_translate("CheckFilesDialog", "Show the results of the last audit of the model root without scanning the folders again"))
+        self.openLastAuditBtn.setText(_translate("CheckFilesDialog", "Open Last Audit"))
         self.outputsGroupbox.setTitle(_translate("CheckFilesDialog", "Outputs"))
         self.summaryTable.setSortingEnabled(True)
         item = self.summaryTable.horizontalHeaderItem(0)
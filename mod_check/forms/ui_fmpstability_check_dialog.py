@@ -73,6 +73,53 @@ class Ui_FmpStabilityCheckDialog(object):
         self.loadExistingResultsBtn.setObjectName("loadExistingResultsBtn")
         self.gridLayout_2.addWidget(self.loadExistingResultsBtn, 2, 2, 1, 1)
         self.fileSelectionTabWidget.addTab(self.existingResultsTab, "")
+        self.batchScreeningTab = QtWidgets.QWidget()
+        self.batchScreeningTab.setObjectName("batchScreeningTab")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.batchScreeningTab)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.horizontalLayout_4 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_4.setObjectName("horizontalLayout_4")
+        self.label_4 = QtWidgets.QLabel(self.batchScreeningTab)
+        self.label_4.setObjectName("label_4")
+        self.horizontalLayout_4.addWidget(self.label_4)
+        self.batchFolderWidget = QgsFileWidget(self.batchScreeningTab)
+        self.batchFolderWidget.setObjectName("batchFolderWidget")
+        self.horizontalLayout_4.addWidget(self.batchFolderWidget)
+        self.screenResultsBtn = QtWidgets.QPushButton(self.batchScreeningTab)
+        self.screenResultsBtn.setObjectName("screenResultsBtn")
+        self.horizontalLayout_4.addWidget(self.screenResultsBtn)
+        self.exportBatchSummaryBtn = QtWidgets.QPushButton(self.batchScreeningTab)
+        self.exportBatchSummaryBtn.setObjectName("exportBatchSummaryBtn")
+        self.horizontalLayout_4.addWidget(self.exportBatchSummaryBtn)
+        self.verticalLayout_4.addLayout(self.horizontalLayout_4)
+        self.batchProgressBar = QtWidgets.QProgressBar(self.batchScreeningTab)
+        self.batchProgressBar.setProperty("value", 0)
+        self.batchProgressBar.setObjectName("batchProgressBar")
+        self.verticalLayout_4.addWidget(self.batchProgressBar)
+        self.batchSummaryTable = QtWidgets.QTableWidget(self.batchScreeningTab)
+        self.batchSummaryTable.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.batchSummaryTable.setObjectName("batchSummaryTable")
+        self.batchSummaryTable.setColumnCount(8)
+        self.batchSummaryTable.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.batchSummaryTable.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.batchSummaryTable.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.batchSummaryTable.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.batchSummaryTable.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.batchSummaryTable.setHorizontalHeaderItem(4, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.batchSummaryTable.setHorizontalHeaderItem(5, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.batchSummaryTable.setHorizontalHeaderItem(6, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.batchSummaryTable.setHorizontalHeaderItem(7, item)
+        self.batchSummaryTable.horizontalHeader().setStretchLastSection(True)
+        self.verticalLayout_4.addWidget(self.batchSummaryTable)
+        self.fileSelectionTabWidget.addTab(self.batchScreeningTab, "")
         self.verticalLayout.addWidget(self.fileSelectionTabWidget)
         self.horizontalLayout = QtWidgets.QHBoxLayout()
         self.horizontalLayout.setObjectName("horizontalLayout")
@@ -83,6 +130,8 @@ class Ui_FmpStabilityCheckDialog(object):
         self.validationSeriesCbox.setObjectName("validationSeriesCbox")
         self.validationSeriesCbox.addItem("")
         self.validationSeriesCbox.addItem("")
+        self.validationSeriesCbox.addItem("")
+        self.validationSeriesCbox.addItem("")
         self.horizontalLayout.addWidget(self.validationSeriesCbox)
         spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout.addItem(spacerItem)
@@ -198,9 +247,33 @@ class Ui_FmpStabilityCheckDialog(object):
         self.label_7.setText(_translate("FmpStabilityCheckDialog", "FMP .dat file (optional)"))
         self.loadExistingResultsBtn.setText(_translate("FmpStabilityCheckDialog", "Load Results"))
         self.fileSelectionTabWidget.setTabText(self.fileSelectionTabWidget.indexOf(self.existingResultsTab), _translate("FmpStabilityCheckDialog", "Existing Results"))
+        self.label_4.setText(_translate("FmpStabilityCheckDialog", "FMP results folder"))
+        self.screenResultsBtn.setToolTip(_translate("FmpStabilityCheckDialog", "Run the selected validation series check on every .zzn file in the folder"))
+        self.screenResultsBtn.setText(_translate("FmpStabilityCheckDialog", "Screen Results"))
+        self.exportBatchSummaryBtn.setText(_translate("FmpStabilityCheckDialog", "Export CSV"))
+        self.batchSummaryTable.setSortingEnabled(True)
+        item = self.batchSummaryTable.horizontalHeaderItem(0)
+        item.setText(_translate("FmpStabilityCheckDialog", "Run Name"))
+        item = self.batchSummaryTable.horizontalHeaderItem(1)
+        item.setText(_translate("FmpStabilityCheckDialog", "Failed Nodes"))
+        item = self.batchSummaryTable.horizontalHeaderItem(2)
+        item.setText(_translate("FmpStabilityCheckDialog", "Total Nodes"))
+        item = self.batchSummaryTable.horizontalHeaderItem(3)
+        item.setText(_translate("FmpStabilityCheckDialog", "Failing Windows"))
+        item = self.batchSummaryTable.horizontalHeaderItem(4)
+        item.setText(_translate("FmpStabilityCheckDialog", "First Fail (h)"))
+        item = self.batchSummaryTable.horizontalHeaderItem(5)
+        item.setText(_translate("FmpStabilityCheckDialog", "Last Fail (h)"))
+        item = self.batchSummaryTable.horizontalHeaderItem(6)
+        item.setText(_translate("FmpStabilityCheckDialog", "Worst Nodes"))
+        item = self.batchSummaryTable.horizontalHeaderItem(7)
+        item.setText(_translate("FmpStabilityCheckDialog", "Full Path"))
+        self.fileSelectionTabWidget.setTabText(self.fileSelectionTabWidget.indexOf(self.batchScreeningTab), _translate("FmpStabilityCheckDialog", "Batch Screening"))
         self.label.setText(_translate("FmpStabilityCheckDialog", "Validation series"))
         self.validationSeriesCbox.setItemText(0, _translate("FmpStabilityCheckDialog", "Stage"))
         self.validationSeriesCbox.setItemText(1, _translate("FmpStabilityCheckDialog", "Flow"))
+        self.validationSeriesCbox.setItemText(2, _translate("FmpStabilityCheckDialog", "Stage (Spectral)"))
+        self.validationSeriesCbox.setItemText(3, _translate("FmpStabilityCheckDialog", "Flow (Spectral)"))
         self.label_10.setText(_translate("FmpStabilityCheckDialog", "Timestep"))
         self.timestepDecButton.setText(_translate("FmpStabilityCheckDialog", "<"))
         self.timestepIncButton.setText(_translate("FmpStabilityCheckDialog", ">"))
@@ -77,6 +77,9 @@ class Ui_TuflowStabilityCheckDialog(object):
         self.mbSummaryResetGraphBtn = QtWidgets.QPushButton(self.layoutWidget)
         self.mbSummaryResetGraphBtn.setObjectName("mbSummaryResetGraphBtn")
         self.horizontalLayout_7.addWidget(self.mbSummaryResetGraphBtn)
+        self.mbSummaryFollowCheckbox = QtWidgets.QCheckBox(self.layoutWidget)
+        self.mbSummaryFollowCheckbox.setObjectName("mbSummaryFollowCheckbox")
+        self.horizontalLayout_7.addWidget(self.mbSummaryFollowCheckbox)
         spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout_7.addItem(spacerItem1)
         self.verticalLayout_2.addLayout(self.horizontalLayout_7)
@@ -125,6 +128,9 @@ class Ui_TuflowStabilityCheckDialog(object):
         self.mbReloadIndividualBtn = QtWidgets.QPushButton(self.individualTab)
         self.mbReloadIndividualBtn.setObjectName("mbReloadIndividualBtn")
         self.horizontalLayout_6.addWidget(self.mbReloadIndividualBtn)
+        self.mbFollowCheckbox = QtWidgets.QCheckBox(self.individualTab)
+        self.mbFollowCheckbox.setObjectName("mbFollowCheckbox")
+        self.horizontalLayout_6.addWidget(self.mbFollowCheckbox)
         spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout_6.addItem(spacerItem2)
         self.verticalLayout_5.addLayout(self.horizontalLayout_6)
@@ -187,6 +193,9 @@ class Ui_TuflowStabilityCheckDialog(object):
         self.hpcReloadButton = QtWidgets.QPushButton(self.hpcTab)
         self.hpcReloadButton.setObjectName("hpcReloadButton")
         self.horizontalLayout_16.addWidget(self.hpcReloadButton)
+        self.hpcFollowCheckbox = QtWidgets.QCheckBox(self.hpcTab)
+        self.hpcFollowCheckbox.setObjectName("hpcFollowCheckbox")
+        self.horizontalLayout_16.addWidget(self.hpcFollowCheckbox)
         spacerItem4 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout_16.addItem(spacerItem4)
         self.verticalLayout_16.addLayout(self.horizontalLayout_16)
@@ -236,6 +245,67 @@ class Ui_TuflowStabilityCheckDialog(object):
         self.horizontalLayout_14.setStretch(1, 8)
         self.verticalLayout_16.addLayout(self.horizontalLayout_14)
         self.mainTabWidget.addTab(self.hpcTab, "")
+        self.hpcSummaryTab = QtWidgets.QWidget()
+        self.hpcSummaryTab.setObjectName("hpcSummaryTab")
+        self.verticalLayout_17 = QtWidgets.QVBoxLayout(self.hpcSummaryTab)
+        self.verticalLayout_17.setObjectName("verticalLayout_17")
+        self.horizontalLayout_17 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_17.setObjectName("horizontalLayout_17")
+        self.label_6 = QtWidgets.QLabel(self.hpcSummaryTab)
+        self.label_6.setObjectName("label_6")
+        self.horizontalLayout_17.addWidget(self.label_6)
+        self.hpcFolderWidget = QgsFileWidget(self.hpcSummaryTab)
+        self.hpcFolderWidget.setObjectName("hpcFolderWidget")
+        self.horizontalLayout_17.addWidget(self.hpcFolderWidget)
+        self.verticalLayout_17.addLayout(self.horizontalLayout_17)
+        self.horizontalLayout_18 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_18.setObjectName("horizontalLayout_18")
+        self.hpcReloadSummaryBtn = QtWidgets.QPushButton(self.hpcSummaryTab)
+        self.hpcReloadSummaryBtn.setObjectName("hpcReloadSummaryBtn")
+        self.horizontalLayout_18.addWidget(self.hpcReloadSummaryBtn)
+        self.label_7 = QtWidgets.QLabel(self.hpcSummaryTab)
+        self.label_7.setObjectName("label_7")
+        self.horizontalLayout_18.addWidget(self.label_7)
+        self.hpcDtThresholdSpinbox = QtWidgets.QDoubleSpinBox(self.hpcSummaryTab)
+        self.hpcDtThresholdSpinbox.setDecimals(4)
+        self.hpcDtThresholdSpinbox.setMinimum(0.0001)
+        self.hpcDtThresholdSpinbox.setMaximum(1000.0)
+        self.hpcDtThresholdSpinbox.setSingleStep(0.01)
+        self.hpcDtThresholdSpinbox.setProperty("value", 0.1)
+        self.hpcDtThresholdSpinbox.setObjectName("hpcDtThresholdSpinbox")
+        self.horizontalLayout_18.addWidget(self.hpcDtThresholdSpinbox)
+        spacerItem6 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_18.addItem(spacerItem6)
+        self.verticalLayout_17.addLayout(self.horizontalLayout_18)
+        self.hpcSummaryTable = QtWidgets.QTableWidget(self.hpcSummaryTab)
+        self.hpcSummaryTable.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.hpcSummaryTable.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.hpcSummaryTable.setObjectName("hpcSummaryTable")
+        self.hpcSummaryTable.setColumnCount(10)
+        self.hpcSummaryTable.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.hpcSummaryTable.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.hpcSummaryTable.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.hpcSummaryTable.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.hpcSummaryTable.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.hpcSummaryTable.setHorizontalHeaderItem(4, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.hpcSummaryTable.setHorizontalHeaderItem(5, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.hpcSummaryTable.setHorizontalHeaderItem(6, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.hpcSummaryTable.setHorizontalHeaderItem(7, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.hpcSummaryTable.setHorizontalHeaderItem(8, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.hpcSummaryTable.setHorizontalHeaderItem(9, item)
+        self.hpcSummaryTable.horizontalHeader().setStretchLastSection(True)
+        self.verticalLayout_17.addWidget(self.hpcSummaryTable)
+        self.mainTabWidget.addTab(self.hpcSummaryTab, "")
         self.verticalLayout_4.addWidget(self.mainTabWidget)
         self.horizontalLayout_5 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_5.setObjectName("horizontalLayout_5")
@@ -271,6 +341,8 @@ class Ui_TuflowStabilityCheckDialog(object):
         self.mbShowDvolCheckbox.setText(_translate("TuflowStabilityCheckDialog", "Show dVol"))
         self.mbSummarySelectAllCheckbox.setText(_translate("TuflowStabilityCheckDialog", "Toggle Select All"))
         self.mbSummaryResetGraphBtn.setText(_translate("TuflowStabilityCheckDialog", "Reset Graph"))
+        self.mbSummaryFollowCheckbox.setToolTip(_translate("TuflowStabilityCheckDialog", "Poll the runs that are still being written and update the table and graph as they progress"))
+        self.mbSummaryFollowCheckbox.setText(_translate("TuflowStabilityCheckDialog", "Follow active runs"))
         item = self.mbSummaryTable.horizontalHeaderItem(0)
         item.setText(_translate("TuflowStabilityCheckDialog", "Graph"))
         item = self.mbSummaryTable.horizontalHeaderItem(1)
@@ -285,6 +357,8 @@ class Ui_TuflowStabilityCheckDialog(object):
         self.label_2.setText(_translate("TuflowStabilityCheckDialog", "TUFLOW MB file"))
         self.mbFileWidget.setFilter(_translate("TuflowStabilityCheckDialog", "*.csv"))
         self.mbReloadIndividualBtn.setText(_translate("TuflowStabilityCheckDialog", "Reload"))
+        self.mbFollowCheckbox.setToolTip(_translate("TuflowStabilityCheckDialog", "Poll the file and update the graph as the run progresses"))
+        self.mbFollowCheckbox.setText(_translate("TuflowStabilityCheckDialog", "Follow live"))
         self.mbAndDvolRadioBtn.setText(_translate("TuflowStabilityCheckDialog", "MB and dVol"))
         self.volumesRadioBtn.setText(_translate("TuflowStabilityCheckDialog", "Volumes"))
         self.massErrorsRadioBtn.setText(_translate("TuflowStabilityCheckDialog", "Mass Errors"))
@@ -296,6 +370,8 @@ class Ui_TuflowStabilityCheckDialog(object):
         self.label_5.setText(_translate("TuflowStabilityCheckDialog", "TUFLOW dt.csv file"))
         self.hpcFileWidget.setFilter(_translate("TuflowStabilityCheckDialog", "*dt.csv"))
         self.hpcReloadButton.setText(_translate("TuflowStabilityCheckDialog", "Reload"))
+        self.hpcFollowCheckbox.setToolTip(_translate("TuflowStabilityCheckDialog", "Poll the file and update the graph as the run progresses"))
+        self.hpcFollowCheckbox.setText(_translate("TuflowStabilityCheckDialog", "Follow live"))
         self.hpcDtStarRadioBtn.setText(_translate("TuflowStabilityCheckDialog", "HPC dtStar"))
         self.hpcDtRadioBtn.setText(_translate("TuflowStabilityCheckDialog", "HPC dt"))
         self.hpcNcRadioBtn.setText(_translate("TuflowStabilityCheckDialog", "HPC Nc"))
@@ -305,4 +381,30 @@ class Ui_TuflowStabilityCheckDialog(object):
         self.individualSeriesTabWidget_3.setTabText(self.individualSeriesTabWidget_3.indexOf(self.presetSeriesTab_4), _translate("TuflowStabilityCheckDialog", "Presets"))
         self.hpcUpdateGraphBtn.setText(_translate("TuflowStabilityCheckDialog", "Reset Graph"))
         self.mainTabWidget.setTabText(self.mainTabWidget.indexOf(self.hpcTab), _translate("TuflowStabilityCheckDialog", "HPC"))
+        self.label_6.setText(_translate("TuflowStabilityCheckDialog", "TUFLOW results folder"))
+        self.hpcReloadSummaryBtn.setText(_translate("TuflowStabilityCheckDialog", "Reload"))
+        self.label_7.setText(_translate("TuflowStabilityCheckDialog", "dt threshold (s)"))
+        self.hpcDtThresholdSpinbox.setToolTip(_translate("TuflowStabilityCheckDialog", "Time spent with a timestep below this is reported for each run"))
+        self.hpcSummaryTable.setSortingEnabled(True)
+        item = self.hpcSummaryTable.horizontalHeaderItem(0)
+        item.setText(_translate("TuflowStabilityCheckDialog", "Run Name"))
+        item = self.hpcSummaryTable.horizontalHeaderItem(1)
+        item.setText(_translate("TuflowStabilityCheckDialog", "Min dt (s)"))
+        item = self.hpcSummaryTable.horizontalHeaderItem(2)
+        item.setText(_translate("TuflowStabilityCheckDialog", "Time Below dt (h)"))
+        item = self.hpcSummaryTable.horizontalHeaderItem(3)
+        item.setText(_translate("TuflowStabilityCheckDialog", "Nu Exceeded"))
+        item = self.hpcSummaryTable.horizontalHeaderItem(4)
+        item.setText(_translate("TuflowStabilityCheckDialog", "Nc Exceeded"))
+        item = self.hpcSummaryTable.horizontalHeaderItem(5)
+        item.setText(_translate("TuflowStabilityCheckDialog", "Nd Exceeded"))
+        item = self.hpcSummaryTable.horizontalHeaderItem(6)
+        item.setText(_translate("TuflowStabilityCheckDialog", "Efficiency 5th %ile"))
+        item = self.hpcSummaryTable.horizontalHeaderItem(7)
+        item.setText(_translate("TuflowStabilityCheckDialog", "Efficiency Median"))
+        item = self.hpcSummaryTable.horizontalHeaderItem(8)
+        item.setText(_translate("TuflowStabilityCheckDialog", "End Time (h)"))
+        item = self.hpcSummaryTable.horizontalHeaderItem(9)
+        item.setText(_translate("TuflowStabilityCheckDialog", "Full Path"))
+        self.mainTabWidget.setTabText(self.mainTabWidget.indexOf(self.hpcSummaryTab), _translate("TuflowStabilityCheckDialog", "HPC Summary"))
 from qgsfilewidget import QgsFileWidget
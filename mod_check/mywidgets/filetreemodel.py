@@ -0,0 +1,106 @@
+'''
+@summary: Qt item model for showing the model file audit file tree.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+from bisect import bisect_left
+
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+
+class FileTreeModel(QAbstractItemModel):
+    """Read only item model over a filetree.FileTree.
+
+    Nothing is copied out of the FileTree. The view only asks for the rows
+    that are visible, and the name and full path for each one are looked up
+    from the tree arrays when they're drawn, so the cost of showing the tree
+    doesn't depend on how many files are in it.
+
+    The FileTree node number is used as the QModelIndex internal id.
+    """
+
+    NAME_COLUMN = 0
+    PATH_COLUMN = 1
+    HEADERS = ['Name', 'Full Path']
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.file_tree = None
+        self.include_files = True
+
+    def setFileTree(self, file_tree, include_files=True):
+        """Show a different tree, or change whether files are shown.
+
+        Args:
+            file_tree(filetree.FileTree): the tree to show (or None to clear).
+            include_files=True(bool): if False only the folders are shown.
+        """
+        self.beginResetModel()
+        self.file_tree = file_tree
+        self.include_files = include_files
+        self.endResetModel()
+
+    def nodeFromIndex(self, index):
+        if not index.isValid():
+            return self.file_tree.ROOT
+        return index.internalId()
+
+    def indexFromNode(self, node, column=NAME_COLUMN):
+        """Get the model index for a FileTree node.
+
+        Args:
+            node(int): the FileTree node.
+            column=NAME_COLUMN(int): the column for the index.
+
+        Return:
+            QModelIndex - the index (invalid for the root or a hidden file).
+        """
+        if self.file_tree is None or node == self.file_tree.ROOT:
+            return QModelIndex()
+        siblings = self.file_tree.childNodes(self.file_tree.parents[node], self.include_files)
+        # Child nodes are always in ascending order
+        row = bisect_left(siblings, node)
+        if row >= len(siblings) or siblings[row] != node:
+            return QModelIndex()
+        return self.createIndex(row, column, node)
+
+    def index(self, row, column, parent=QModelIndex()):
+        if self.file_tree is None or not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        children = self.file_tree.childNodes(self.nodeFromIndex(parent), self.include_files)
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index):
+        if self.file_tree is None or not index.isValid():
+            return QModelIndex()
+        return self.indexFromNode(self.file_tree.parents[index.internalId()])
+
+    def rowCount(self, parent=QModelIndex()):
+        if self.file_tree is None or parent.column() > 0:
+            return 0
+        return len(self.file_tree.childNodes(self.nodeFromIndex(parent), self.include_files))
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if self.file_tree is None or not index.isValid():
+            return None
+        if role == Qt.DisplayRole or role == Qt.ToolTipRole:
+            node = index.internalId()
+            if index.column() == self.PATH_COLUMN or role == Qt.ToolTipRole:
+                return self.file_tree.fullPath(node)
+            if self.file_tree.isFolder(node):
+                return self.file_tree.names[node] + '/'
+            return self.file_tree.names[node]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
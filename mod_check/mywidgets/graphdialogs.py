@@ -24,6 +24,7 @@ import numpy as np
 
 from ..forms import ui_graph_dialog as graph_ui
 from ..forms import ui_text_dialog as text_ui
+from ..tools.decimation import LineDecimator
 
 
 class LocalHelpDialog(QDialog, text_ui.Ui_TextDialog):
@@ -92,6 +93,7 @@ class MbCheckMultipleGraphicsView(QGraphicsView):
         self.axes2 = None
         self.fig.tight_layout()
         self.canvas = FigureCanvas(self.fig)
+        self.decimator = LineDecimator()
         proxy_widget = scene.addWidget(self.canvas)
         
     def resetPlot(self):
@@ -100,6 +102,7 @@ class MbCheckMultipleGraphicsView(QGraphicsView):
             self.axes2 = None
         self.axes.clear()
         self.fig.clear()
+        self.decimator.reset()
         self.axes = self.fig.gca()
         
     def drawPlot(self, results, show_dvol):
@@ -110,7 +113,7 @@ class MbCheckMultipleGraphicsView(QGraphicsView):
         max_time = -1
         count = -1
         for i, r in enumerate(results):
-            temp = max(r['data']['Time (h)'])
+            temp = np.max(r['data']['Time (h)'])
             if temp > max_time:
                 max_time = temp
                 count = i
@@ -122,10 +125,9 @@ class MbCheckMultipleGraphicsView(QGraphicsView):
             self.axes2 = self.axes.twinx()
         
         # Plot recommended cme boundary lines
-        cme_min = [1 for i in x]
-        cme_max = [-1 for i in x]
-        mb_max_plot = self.axes.plot(x, cme_min, "-g", alpha=0.5, label="CME max recommended", dashes=[6,2])
-        mb_min_plot = self.axes.plot(x, cme_max, "-g", alpha=0.5, label="CME min recommended", dashes=[6,2])
+        x_range = [x[0], x[-1]]
+        mb_max_plot = self.axes.plot(x_range, [1, 1], "-g", alpha=0.5, label="CME max recommended", dashes=[6,2])
+        mb_min_plot = self.axes.plot(x_range, [-1, -1], "-g", alpha=0.5, label="CME min recommended", dashes=[6,2])
 
         hl_index = -1
         for i, r in enumerate(results):
@@ -137,10 +139,10 @@ class MbCheckMultipleGraphicsView(QGraphicsView):
 
                 x = r['data']['Time (h)']
                 cme = r['data']['Cum ME (%)']
-                mb_plot = self.axes.plot(x, cme, '-m', alpha=0.4, label="CME")
+                mb_plot = self.decimator.plot(self.axes, x, cme, '-m', alpha=0.4, label="CME")
                 if show_dvol:
                     dvol = r['data']['dVol']
-                    dvol_plot = self.axes2.plot(x, dvol, '-c', alpha=0.4, label="dVol")
+                    dvol_plot = self.decimator.plot(self.axes2, x, dvol, '-c', alpha=0.4, label="dVol")
                     self.axes2.set_ylabel('dVol', color='c')
         
         # Draw the series to highlight last so it shows up on top
@@ -148,10 +150,10 @@ class MbCheckMultipleGraphicsView(QGraphicsView):
             self.axes.set_title("Selected: {0}".format(results[hl_index]['name']))
             x = results[hl_index]['data']['Time (h)']
             cme = results[hl_index]['data']['Cum ME (%)']
-            mb_plot = self.axes.plot(x, cme, '-r', alpha=1, label="CME")
+            mb_plot = self.decimator.plot(self.axes, x, cme, '-r', alpha=1, label="CME")
             if show_dvol:
                 dvol = results[hl_index]['data']['dVol']
-                dvol_plot = self.axes2.plot(x, dvol, '-b', alpha=1, label="dVol")
+                dvol_plot = self.decimator.plot(self.axes2, x, dvol, '-b', alpha=1, label="dVol")
                 self.axes2.set_ylabel('dVol')
 
         # Add a legend describing the cme max tolerance boundary lines
@@ -178,6 +180,7 @@ class MbCheckIndividualGraphicsView(QGraphicsView):
         self.axes2 = self.axes.twinx()
         self.fig.tight_layout()
         self.canvas = FigureCanvas(self.fig)
+        self.decimator = LineDecimator()
         proxy_widget = scene.addWidget(self.canvas)
         
     def drawPlot(self, graph_series, results, title):
@@ -188,6 +191,7 @@ class MbCheckIndividualGraphicsView(QGraphicsView):
         self.axes2.clear()
         self.axes.clear()
         self.fig.clear()
+        self.decimator.reset()
         self.axes = self.fig.gca()
         self.axes2 = self.axes.twinx()
     
@@ -197,7 +201,7 @@ class MbCheckIndividualGraphicsView(QGraphicsView):
 
         for gs in graph_series[0]:
             s = results[gs]
-            left_plot = self.axes.plot(x, s, plot_colors[color_count], label=gs)
+            left_plot = self.decimator.plot(self.axes, x, s, plot_colors[color_count], label=gs)
             pl = [p for p in left_plot]
             plot_lines += pl
             labels += ['(L) ' + l.get_label() for l in pl]
@@ -208,7 +212,7 @@ class MbCheckIndividualGraphicsView(QGraphicsView):
         if graph_series[1]:
             for gs in graph_series[1]:
                 s = results[gs]
-                right_plot = self.axes2.plot(x, s, plot_colors[color_count], label=gs)
+                right_plot = self.decimator.plot(self.axes2, x, s, plot_colors[color_count], label=gs)
                 pl = [p for p in right_plot]
                 plot_lines += pl
                 labels += ['(R) ' + l.get_label() for l in pl]
@@ -235,6 +239,7 @@ class HpcCheckIndividualGraphicsView(QGraphicsView):
         self.axes = self.fig.gca()
         self.fig.tight_layout()
         self.canvas = FigureCanvas(self.fig)
+        self.decimator = LineDecimator()
         proxy_widget = scene.addWidget(self.canvas)
         
     def drawPlot(self, series_meta, results, title):
@@ -244,6 +249,7 @@ class HpcCheckIndividualGraphicsView(QGraphicsView):
         plot_lines = []
         self.axes.clear()
         self.fig.clear()
+        self.decimator.reset()
         self.axes = self.fig.gca()
         
         x = results[:,1]
@@ -253,18 +259,18 @@ class HpcCheckIndividualGraphicsView(QGraphicsView):
         gtype = series_meta[1]
         if gtype in ['Nc', 'Nu', 'Nd']:
             if gtype == 'Nc' or gtype == 'Nu':
-                tol_max = [1.0 for i in x]
+                tol_max = [1.0, 1.0]
             else:
-                tol_max = [0.3 for i in x]
+                tol_max = [0.3, 0.3]
 
-            max_plot = self.axes.plot(x, tol_max, "-g", alpha=0.5, label="Max recommended", dashes=[6,2])
+            max_plot = self.axes.plot([x[0], x[-1]], tol_max, "-g", alpha=0.5, label="Max recommended", dashes=[6,2])
             pl = [p for p in max_plot]
             plot_lines += pl
             labels += [l.get_label() for l in pl]
     
 
         s = results[:,series_meta[0]]
-        left_plot = self.axes.plot(x, s, plot_colors[color_count], label=gtype)
+        left_plot = self.decimator.plot(self.axes, x, s, plot_colors[color_count], label=gtype)
         self.axes.set_ylabel(gtype)
         pl = [p for p in left_plot]
         plot_lines += pl
@@ -280,7 +286,7 @@ class HpcCheckIndividualGraphicsView(QGraphicsView):
         
 
 class FmpStabilityGeometryGraphicsView(QGraphicsView):
-    """GraphicsView to display the flow/stage for the Fmp stability check.
+    """GraphicsView to display the section geometry for the Fmp stability check.
     """
     
     def __init__(self):
@@ -301,21 +307,38 @@ class FmpStabilityGeometryGraphicsView(QGraphicsView):
         if redraw:
             self.canvas.draw()
         
-    def drawPlot(self, geom_data, node_name, stage):
+    def drawPlot(self, geom, node_name, stage):
+        """Draw a section and the water at a stage.
+
+        Args:
+            geom(SectionGeometry): the section (see tools.sectiongeometry).
+            node_name(str): name of the section.
+            stage(float): the water level.
+        """
         self.clearPlot(redraw=False)
         self.axes = self.fig.gca()
     
-        x = geom_data[0]
-        y = geom_data[1]
-        s = [stage for i in x]
+        x = geom.x
+        y = geom.y
+        s = np.full(len(x), stage)
+        props = geom.properties(stage)
 
         self.axes.set_xlabel('Chainage (m)')
         self.axes.set_ylabel('Elevation (mAOD)')
         self.axes.set_title(node_name)
 
-        bed_plot = self.axes.plot(x, geom_data[1], '-k')
+        bed_plot = self.axes.plot(x, y, '-k')
         stage_plot = self.axes.plot(x, s, '-b')
         self.axes.fill_between(x, y, s, where=y<=stage, interpolate=True, alpha=0.5, color='b')
+        # Highlight the wetted perimeter
+        wet_plot = self.axes.plot(x, np.where(y <= stage, y, np.nan), '-b', linewidth=2.5)
+        self.axes.text(
+            0.02, 0.98, 
+            'Stage: {:.3f} mAOD\nFlow area: {:.2f} m2\nWetted perimeter: {:.2f} m\nTop width: {:.2f} m'.format(
+                stage, props['area'], props['perimeter'], props['width']
+            ),
+            transform=self.axes.transAxes, verticalalignment='top', fontsize='small',
+        )
 
         self.fig.tight_layout()
         self.canvas.draw()
@@ -334,6 +357,7 @@ class FmpStabilityGraphicsView(QGraphicsView):
         self.axes2 = self.axes.twinx()
         self.fig.tight_layout()
         self.canvas = FigureCanvas(self.fig)
+        self.decimator = LineDecimator()
         proxy_widget = scene.addWidget(self.canvas)
         
     def drawPlot(self, time_data, results, derivs, timestep, series_type, 
@@ -343,10 +367,13 @@ class FmpStabilityGraphicsView(QGraphicsView):
         self.axes2.clear()
         self.axes.clear()
         self.fig.clear()
+        self.decimator.reset()
         self.axes = self.fig.gca()
         self.axes2 = self.axes.twinx()
     
-        x = time_data
+        # Keep the same float arrays between redraws (e.g. moving the timestep slider)
+        x = self.decimator.cache.array(time_data)
+        stage_or_flow = self.decimator.cache.array(results[0])
         self.axes.set_xlabel('Time (h)')
         fail_times = ''
         if derivs['status'] == 'Failed':
@@ -357,22 +384,22 @@ class FmpStabilityGraphicsView(QGraphicsView):
         self.axes2.set_ylabel('Flow (m3/s)')
         
         if series_type == 'Stage':
-            s1_plot = self.axes.plot(x, results[0], '-b')
-            s2_plot = self.axes2.plot(x, derivs['f'], '-r')
+            s1_plot = self.decimator.plot(self.axes, x, stage_or_flow, '-b')
+            s2_plot = self.decimator.plot(self.axes2, x, derivs['f'], '-r')
         else:
-            s1_plot = self.axes2.plot(x, derivs['f'], '-r')
-            s2_plot = self.axes.plot(x, results[0], '-b')
+            s1_plot = self.decimator.plot(self.axes2, x, derivs['f'], '-r')
+            s2_plot = self.decimator.plot(self.axes, x, stage_or_flow, '-b')
         
         time_x = [timestep, timestep]
-        time_y = [min(results[0]), max(results[0])]
+        time_y = [np.nanmin(stage_or_flow), np.nanmax(stage_or_flow)]
         time_plot = self.axes.plot(time_x, time_y, '-k', alpha=0.5, dashes=[6,2])
 
         # User doesn't need derivative graphs, just for debugging
         if show_derivs:
             x2 = x[:-1]
-            right_plot = self.axes2.plot(x2, derivs['dy'], '-g', alpha=0.5)
+            right_plot = self.decimator.plot(self.axes2, x2, derivs['dy'], '-g', alpha=0.5)
             x3 = x2[:-1]
-            right_plot2 = self.axes2.plot(x3, derivs['dy2'], '-k', alpha=0.5)
+            right_plot2 = self.decimator.plot(self.axes2, x3, derivs['dy2'], '-k', alpha=0.5)
 
         self.fig.tight_layout()
         self.canvas.draw()
@@ -0,0 +1,91 @@
+# coding=utf-8
+"""Duplicate file search tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'info@ermeviewenvironmental.co.uk'
+__date__ = '2026-10-17'
+__copyright__ = 'Copyright 2026, Duncan Runnacles'
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# floodmodeller_api is imported from the dependencies folder (see menu.py)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'dependencies'))
+from mod_check.tools import duplicates as dup
+from mod_check.tools.modelaudit import SomeFile
+
+FILE_SIZE = 200 * 1024
+
+
+class DuplicatesTest(unittest.TestCase):
+    """Test the duplicate search with sizes and hashes from an earlier audit."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.folder = tempfile.mkdtemp()
+        contents = os.urandom(FILE_SIZE)
+        self.paths = [os.path.join(self.folder, name) for name in ['a.csv', 'b.csv']]
+        for path in self.paths:
+            with open(path, 'wb') as outfile:
+                outfile.write(contents)
+
+    def tearDown(self):
+        """Runs after each test."""
+        shutil.rmtree(self.folder)
+
+    def scannedFiles(self):
+        """The files with the size and modified time a folder scan would find."""
+        files = []
+        for path in self.paths:
+            stat = os.stat(path)
+            files.append(SomeFile(path, stat.st_size, stat.st_mtime))
+        return files
+
+    def editInPlace(self, data):
+        """Overwrite the middle of a.csv, making sure its modified time changes."""
+        mtime = os.stat(self.paths[0]).st_mtime
+        with open(self.paths[0], 'r+b') as outfile:
+            outfile.seek(FILE_SIZE // 2)
+            outfile.write(data)
+        os.utime(self.paths[0], (mtime + 10, mtime + 10))
+
+    def test_finds_duplicates(self):
+        """Test identical files are found, and their hashes stored."""
+        hash_cache = {}
+        groups = dup.findDuplicates(self.scannedFiles(), hash_cache=hash_cache)
+        self.assertEqual([[f.name for f in g] for g in groups], [['a.csv', 'b.csv']])
+        self.assertEqual(len(hash_cache), 4)
+
+    def test_edited_in_place(self):
+        """Test a file edited after the folder scan isn't reported from the stored hashes."""
+        hash_cache = {}
+        files = self.scannedFiles()
+        dup.findDuplicates(files, hash_cache=hash_cache)
+
+        # Same size, so only the modified time shows the change
+        stale_files = self.scannedFiles()
+        self.editInPlace(b'edited')
+        self.assertEqual(dup.findDuplicates(stale_files, hash_cache=hash_cache), [])
+
+    def test_size_changed_in_place(self):
+        """Test a file that has grown since the folder scan isn't reported."""
+        hash_cache = {}
+        stale_files = self.scannedFiles()
+        dup.findDuplicates(stale_files, hash_cache=hash_cache)
+        with open(self.paths[0], 'ab') as outfile:
+            outfile.write(b'more')
+        self.assertEqual(dup.findDuplicates(stale_files, hash_cache=hash_cache), [])
+        self.assertEqual(stale_files[0].size, FILE_SIZE + 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
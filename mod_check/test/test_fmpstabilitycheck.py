@@ -0,0 +1,123 @@
+# coding=utf-8
+"""FMP stability check tests.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'info@ermeviewenvironmental.co.uk'
+__date__ = '2026-10-17'
+__copyright__ = 'Copyright 2026, Duncan Runnacles'
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# floodmodeller_api is imported from the dependencies folder (see menu.py)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'dependencies'))
+from mod_check.tools import fmpstabilitycheck as fmps_check
+from mod_check.benchmarks.bench_fmpstability import legacyCheckStability, syntheticFlows
+
+SAVE_INTERVAL = 1 / 60.0
+
+
+def naiveMovingAverage(data, window):
+    smoothed = np.empty_like(data, dtype=np.float64)
+    for i, row in enumerate(data):
+        smoothed[i, 0] = row[0]
+        for j in range(1, len(row)):
+            start = 0 if window < 1 else max(j - window, 0)
+            smoothed[i, j] = np.mean(row[start:j])
+    return smoothed
+
+
+def naiveSliding(data, window, func):
+    count = max(data.shape[1] - window + 1, 0)
+    result = np.empty((data.shape[0], count))
+    for i, row in enumerate(data):
+        for k in range(count):
+            result[i, k] = func(row[k:k + window])
+    return result
+
+
+class FmpStabilityCheckTest(unittest.TestCase):
+    """Test the FMP stability check against the original per node loops."""
+
+    def assertMatchesLegacy(self, data, times, series_type):
+        derivs, failed = fmps_check.checkStability(data, times, SAVE_INTERVAL, series_type)
+        legacy_derivs, legacy_failed = legacyCheckStability(data, times, SAVE_INTERVAL, series_type)
+        self.assertEqual(failed, legacy_failed)
+        for node, legacy in zip(derivs, legacy_derivs):
+            self.assertEqual(node['status'], legacy['status'])
+            self.assertEqual(node['fail_times'], legacy['fail_times'])
+            np.testing.assert_allclose(node['f'], legacy['f'], rtol=1e-9, atol=1e-9)
+            np.testing.assert_allclose(node['dy'], legacy['dy'], rtol=1e-7, atol=1e-7)
+            np.testing.assert_allclose(node['dy2'], legacy['dy2'], rtol=1e-7, atol=1e-7)
+        return failed
+
+    def test_flow_matches_legacy(self):
+        """Test the flow check gives the same results as the original loops."""
+        times, flows, _ = syntheticFlows(20, 300, SAVE_INTERVAL, seed=3)
+        failed = self.assertMatchesLegacy(flows, times, 'Flow')
+        self.assertTrue(0 < len(failed) < 20)
+
+    def test_stage_matches_legacy(self):
+        """Test the stage check gives the same results as the original loops."""
+        times, flows, _ = syntheticFlows(20, 300, SAVE_INTERVAL, seed=2)
+        stage = 30 + flows / 10
+        failed = self.assertMatchesLegacy(stage, times, 'Stage')
+        self.assertTrue(0 < len(failed) < 20)
+
+    def test_shorter_than_smooth_window(self):
+        """Test a run shorter than SMOOTH_TIME_WINDOW averages all previous values."""
+        steps = int(fmps_check.SMOOTH_TIME_WINDOW / SAVE_INTERVAL) - 5
+        times, flows, _ = syntheticFlows(20, steps, SAVE_INTERVAL)
+        self.assertEqual(fmps_check.stabilityWindows(times), (-1, steps))
+        derivs, failed = fmps_check.checkStability(flows, times, SAVE_INTERVAL, 'Flow')
+        self.assertEqual(failed, [])
+        smoothed = naiveMovingAverage(flows, -1)
+        for i, node in enumerate(derivs):
+            self.assertEqual(node['status'], 'Passed')
+            self.assertEqual(node['fail_times'], [])
+            np.testing.assert_allclose(node['f'], smoothed[i])
+            self.assertEqual(len(node['dy']), steps - 1)
+            self.assertEqual(len(node['dy2']), steps - 2)
+
+    def test_shorter_than_check_window(self):
+        """Test a run shorter than CHECK_TIME_WINDOW isn't checked, however unstable."""
+        steps = int(fmps_check.CHECK_TIME_WINDOW / SAVE_INTERVAL) - 5
+        times = (np.arange(steps) * SAVE_INTERVAL).tolist()
+        flows = np.tile(np.where(np.arange(steps) % 2, 100.0, -100.0), (20, 1))
+        derivs, failed = fmps_check.checkStability(flows, times, SAVE_INTERVAL, 'Flow')
+        self.assertEqual(failed, [])
+        self.assertTrue(all(node['status'] == 'Passed' for node in derivs))
+        self.assertTrue(all(len(node['dy2']) == steps - 2 for node in derivs))
+
+    def test_moving_average(self):
+        """Test movingAverage against a loop over every value."""
+        data = np.random.default_rng(1).normal(100, 10, size=(5, 40))
+        for window in [-1, 0, 1, 3, 7, 40, 60]:
+            np.testing.assert_allclose(
+                fmps_check.movingAverage(data, window), naiveMovingAverage(data, window),
+                rtol=1e-12
+            )
+
+    def test_sliding_max_min(self):
+        """Test slidingMax and slidingMin against a loop over every window."""
+        data = np.random.default_rng(1).normal(0, 10, size=(5, 40))
+        for window in [1, 2, 3, 7, 13, 40, 41]:
+            np.testing.assert_array_equal(
+                fmps_check.slidingMax(data, window), naiveSliding(data, window, np.max)
+            )
+            np.testing.assert_array_equal(
+                fmps_check.slidingMin(data, window), naiveSliding(data, window, np.min)
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
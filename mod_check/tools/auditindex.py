@@ -0,0 +1,173 @@
+'''
+@summary: Persistent index of model folder contents for the model file audit.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import json
+import hashlib
+import sqlite3
+
+from . import globaltools as gt
+from . import fileclassifier as fcl
+from .modelscanner import ScannedFile, ScannedFolder
+
+
+# Increment if the stored data or the file classification changes so that
+# old indexes are rebuilt rather than reused
+INDEX_VERSION = 3
+
+
+def defaultIndexPath(model_root):
+    """Get the index file path for a model root in the user cache folder.
+
+    The index is kept in the user cache rather than the model folder so that
+    nothing is written to (often shared) model locations.
+
+    Args:
+        model_root(str): the model root folder being audited.
+
+    Return:
+        str - path to the SQLite index file.
+    """
+    key = os.path.normcase(os.path.abspath(model_root))
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(gt.userCacheDir('audit_index'), digest + '.sqlite')
+
+
+class AuditIndex():
+    """SQLite store of the folder listings from the last audit of a model root.
+
+    Each folder is stored with its modified time, the names of its sub-folders
+    and the name, size, modified time and category of every file in it. When a
+    folder's modified time hasn't changed since the last audit its contents can
+    be taken from here instead of reading the folder again.
+
+    The hashes calculated by the duplicate file search are also stored, with
+    the size and modified time of the file when it was hashed, so that
+    unchanged files don't need to be read again (see duplicates.cachedHash).
+
+    Note:
+        A folder's modified time changes when files are added, removed or renamed
+        but not when an existing file is edited, so the stored size and modified
+        time of individual files may be out of date. Use a full rescan if that
+        matters.
+    """
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.conn = sqlite3.connect(index_path)
+        self._createTables()
+
+    def _createTables(self):
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        with self.conn:
+            if version != INDEX_VERSION:
+                self.conn.execute('DROP TABLE IF EXISTS folders')
+                self.conn.execute('DROP TABLE IF EXISTS files')
+                self.conn.execute('DROP TABLE IF EXISTS hashes')
+                self.conn.execute('PRAGMA user_version = {0}'.format(INDEX_VERSION))
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS folders (path TEXT PRIMARY KEY, mtime REAL, subfolders TEXT)'
+            )
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS files (folder TEXT, name TEXT, size INTEGER, mtime REAL, category TEXT)'
+            )
+            self.conn.execute('CREATE INDEX IF NOT EXISTS files_folder ON files (folder)')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS hashes '
+                '(kind TEXT, path TEXT, size INTEGER, mtime REAL, hash TEXT, PRIMARY KEY (kind, path))'
+            )
+
+    def close(self):
+        self.conn.close()
+
+    def clear(self):
+        """Remove everything from the index."""
+        with self.conn:
+            self.conn.execute('DELETE FROM folders')
+            self.conn.execute('DELETE FROM files')
+            self.conn.execute('DELETE FROM hashes')
+
+    def loadFolders(self):
+        """Load all of the stored folder listings.
+
+        Return:
+            dict - {folder path: ScannedFolder}.
+        """
+        folders = {}
+        for path, mtime, subfolders in self.conn.execute('SELECT path, mtime, subfolders FROM folders'):
+            folders[path] = ScannedFolder(path, mtime, folders=json.loads(subfolders))
+
+        rows = self.conn.execute(
+            'SELECT folder, name, size, mtime, category FROM files ORDER BY folder, name'
+        )
+        for folder, name, size, mtime, category in rows:
+            try:
+                folders[folder].files.append(ScannedFile(name, size, mtime, category))
+            except KeyError:
+                pass
+        return folders
+
+    def updateFolders(self, folders):
+        """Store the results of a scan.
+
+        Only folders that were read from disk (rather than taken from the index)
+        are written. Folders in the index that weren't found by the scan are
+        removed.
+
+        Args:
+            folders(list): ScannedFolder's returned by ModelScanner.scan.
+        """
+        found = set(f.path for f in folders)
+        stored = set(row[0] for row in self.conn.execute('SELECT path FROM folders'))
+        removed = [(path,) for path in stored - found]
+
+        with self.conn:
+            self.conn.executemany('DELETE FROM folders WHERE path = ?', removed)
+            self.conn.executemany('DELETE FROM files WHERE folder = ?', removed)
+            for folder in folders:
+                if folder.cached:
+                    continue
+                self.conn.execute('DELETE FROM files WHERE folder = ?', (folder.path,))
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO folders (path, mtime, subfolders) VALUES (?, ?, ?)',
+                    (folder.path, folder.mtime, json.dumps(folder.folders))
+                )
+                self.conn.executemany(
+                    'INSERT INTO files (folder, name, size, mtime, category) VALUES (?, ?, ?, ?, ?)',
+                    [
+                        (folder.path, f.name, f.size, f.mtime,
+                         f.category if f.category is not None else fcl.classifyFile(f.name)[1])
+                        for f in folder.files
+                    ]
+                )
+
+    def loadHashes(self):
+        """Load the stored duplicate search file hashes.
+
+        Return:
+            dict - {(kind, filepath): (size, mtime, hash)}.
+        """
+        return {
+            (kind, path): (size, mtime, file_hash) for kind, path, size, mtime, file_hash
+            in self.conn.execute('SELECT kind, path, size, mtime, hash FROM hashes')
+        }
+
+    def updateHashes(self, hashes):
+        """Replace the stored duplicate search file hashes.
+
+        Args:
+            hashes(dict): {(kind, filepath): (size, mtime, hash)}.
+        """
+        with self.conn:
+            self.conn.execute('DELETE FROM hashes')
+            self.conn.executemany(
+                'INSERT INTO hashes (kind, path, size, mtime, hash) VALUES (?, ?, ?, ?, ?)',
+                [key + value for key, value in hashes.items()]
+            )
@@ -0,0 +1,285 @@
+'''
+@summary: SQLite store of the results of a model file audit.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+
+from . import globaltools as gt
+from . import fileclassifier as fcl
+from . import filetree as ft
+from .iefcache import IefSummary
+
+
+# Increment if the stored data changes so that old stores are rebuilt
+RESULTS_VERSION = 1
+
+# Categories stored in the files table. 'duplicate' is not a real category,
+# it's looked up from the duplicates table
+FILE_CATEGORIES = [category for category, _ in fcl.CATEGORY_ORDER] + [fcl.OTHER]
+
+
+def defaultResultsPath(model_root):
+    """Get the results store path for a model root in the user cache folder.
+
+    Only the last audit of each model root is kept.
+
+    Args:
+        model_root(str): the audited model root folder.
+
+    Return:
+        str - path to the SQLite results file.
+    """
+    key = os.path.normcase(os.path.abspath(model_root))
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(gt.userCacheDir('audit_results'), digest + '.sqlite')
+
+
+class AuditResultStore():
+    """SQLite store of the categorised files and check results from an audit.
+
+    Every file found in the audit is a row in the files table, with indexes on
+    the category, extension, directory and size. Filtering the files for
+    display or export is an indexed query rather than a loop over all of the
+    SomeFile's, and the audit can be loaded again later without scanning
+    the model folders.
+
+    The file tree, loaded IEF summaries and reference check results are stored
+    alongside the files so that everything shown in the audit dialog can be
+    restored.
+    """
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        self.conn = sqlite3.connect(store_path)
+        self._createTables()
+
+    def _createTables(self):
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        with self.conn:
+            if version != RESULTS_VERSION:
+                for table in ['meta', 'files', 'duplicates', 'tree', 'iefs']:
+                    self.conn.execute('DROP TABLE IF EXISTS {0}'.format(table))
+                self.conn.execute('PRAGMA user_version = {0}'.format(RESULTS_VERSION))
+            self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS files (id INTEGER PRIMARY KEY, category TEXT, '
+                'extension TEXT, directory TEXT, name TEXT, size INTEGER, mtime REAL)'
+            )
+            self.conn.execute('CREATE INDEX IF NOT EXISTS files_category ON files (category, extension)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS files_extension ON files (extension)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS files_directory ON files (directory)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS files_size ON files (size)')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS duplicates (group_id INTEGER, file_id INTEGER)'
+            )
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS tree (node INTEGER PRIMARY KEY, parent INTEGER, '
+                'name TEXT, is_folder INTEGER)'
+            )
+            self.conn.execute('CREATE TABLE IF NOT EXISTS iefs (filepath TEXT, summary TEXT)')
+
+    def close(self):
+        self.conn.close()
+
+    def hasResults(self):
+        """Check whether an audit has been saved to the store."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'model_root'").fetchone()
+        return row is not None
+
+    def saveAudit(self, iefs, search_results, result_holder):
+        """Replace the contents of the store with the results of an audit.
+
+        Args:
+            iefs(list): iefcache.IefSummary's from the audit.
+            search_results(dict): categorised SomeFile's from the audit.
+            result_holder(modelaudit.ResultHolder): reference check results.
+        """
+        file_ids = {}
+        rows = []
+        for category in FILE_CATEGORIES:
+            for f in search_results.get(category, []):
+                file_ids[f.filepath] = len(rows) + 1
+                rows.append((len(rows) + 1, category, f.fileExt, f.path, f.name, f.size, f.mtime))
+
+        file_tree = result_holder.file_tree
+        meta = {
+            'model_root': result_holder.model_root,
+            'saved': time.time(),
+            'summary': result_holder.summary,
+            'results': result_holder.results,
+            'seen_parents': result_holder.seen_parents,
+            'failed_parents': result_holder.failed_parents,
+        }
+        with self.conn:
+            for table in ['meta', 'files', 'duplicates', 'tree', 'iefs']:
+                self.conn.execute('DELETE FROM {0}'.format(table))
+            self.conn.executemany(
+                'INSERT INTO files (id, category, extension, directory, name, size, mtime) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', rows
+            )
+            self.conn.executemany(
+                'INSERT INTO duplicates (group_id, file_id) VALUES (?, ?)',
+                [
+                    (group_id, file_ids[f.filepath])
+                    for group_id, group in enumerate(result_holder.duplicates)
+                    for f in group if f.filepath in file_ids
+                ]
+            )
+            if file_tree is not None:
+                self.conn.executemany(
+                    'INSERT INTO tree (node, parent, name, is_folder) VALUES (?, ?, ?, ?)',
+                    zip(range(len(file_tree.names)), file_tree.parents,
+                        file_tree.names, file_tree.is_folder)
+                )
+            self.conn.executemany(
+                'INSERT INTO iefs (filepath, summary) VALUES (?, ?)',
+                [(ief.filepath, json.dumps(ief._asdict())) for ief in iefs]
+            )
+            self.conn.executemany(
+                'INSERT INTO meta (key, value) VALUES (?, ?)',
+                [(key, json.dumps(value)) for key, value in meta.items()]
+            )
+
+    def loadMeta(self):
+        """Get the stored audit details (model_root, saved time, summary, etc).
+
+        Return:
+            dict - the stored values.
+        """
+        return {
+            key: json.loads(value)
+            for key, value in self.conn.execute('SELECT key, value FROM meta')
+        }
+
+    def loadIefs(self):
+        return [
+            IefSummary(**json.loads(summary))
+            for _, summary in self.conn.execute('SELECT filepath, summary FROM iefs ORDER BY rowid')
+        ]
+
+    def loadFileTree(self):
+        """Rebuild the FileTree.
+
+        Nodes were stored in the order they were added, so adding them again
+        in the same order gives the same node numbers.
+
+        Return:
+            filetree.FileTree - the tree, or None if one wasn't stored.
+        """
+        rows = self.conn.execute('SELECT node, parent, name, is_folder FROM tree ORDER BY node')
+        first = rows.fetchone()
+        if first is None:
+            return None
+        file_tree = ft.FileTree(first[2])
+        for _, parent, name, is_folder in rows:
+            if is_folder:
+                file_tree.addFolder(parent, name)
+            else:
+                file_tree.addFile(parent, name)
+        return file_tree
+
+    def _fileQuery(self, categories=None, exclude_categories=None, extensions=None,
+                   directory=None, min_size=None):
+        """Build the WHERE clause and parameters for a files query."""
+        where = []
+        params = []
+        if categories is not None:
+            if fcl.DUPLICATE in categories:
+                categories = [c for c in categories if c != fcl.DUPLICATE]
+                clause = 'id IN (SELECT file_id FROM duplicates)'
+                if categories:
+                    clause = '({0} OR category IN ({1}))'.format(
+                        clause, ','.join('?' * len(categories))
+                    )
+                    params.extend(categories)
+                where.append(clause)
+            else:
+                where.append('category IN ({0})'.format(','.join('?' * len(categories))))
+                params.extend(categories)
+        if exclude_categories:
+            where.append('category NOT IN ({0})'.format(','.join('?' * len(exclude_categories))))
+            params.extend(exclude_categories)
+        if extensions is not None:
+            where.append('extension IN ({0})'.format(','.join('?' * len(extensions))))
+            params.extend(e.lower() for e in extensions)
+        if directory is not None:
+            where.append('directory = ?')
+            params.append(directory)
+        if min_size is not None:
+            where.append('size >= ?')
+            params.append(min_size)
+        return (' WHERE ' + ' AND '.join(where)) if where else '', params
+
+    def files(self, categories=None, exclude_categories=None, extensions=None,
+              directory=None, min_size=None):
+        """Get the files matching the filters.
+
+        Args:
+            categories=None(list): only include these categories. Can include
+                'duplicate' for files with a copy elsewhere.
+            exclude_categories=None(list): leave out these categories.
+            extensions=None(list): only include these file extensions.
+            directory=None(str): only include files in this folder.
+            min_size=None(int): only include files at least this size (bytes).
+
+        Return:
+            list - of (category, extension, directory, name, size, mtime) tuples,
+                ordered by the folder and file name.
+        """
+        where, params = self._fileQuery(
+            categories, exclude_categories, extensions, directory, min_size
+        )
+        return self.conn.execute(
+            'SELECT category, extension, directory, name, size, mtime FROM files' + where +
+            ' ORDER BY directory, name', params
+        ).fetchall()
+
+    def fileNameLookup(self, categories=None, exclude_categories=None):
+        """Get a lookup of file name to path for the files in some categories.
+
+        If more than one file has the same name the last one found is used.
+
+        Return:
+            dict - {lower case file name: file path}.
+        """
+        where, params = self._fileQuery(categories, exclude_categories)
+        rows = self.conn.execute(
+            'SELECT directory, name FROM files' + where + ' ORDER BY id', params
+        )
+        return {name.lower(): os.path.join(directory, name) for directory, name in rows}
+
+    def categoryCounts(self):
+        """Get the number of files in each category.
+
+        Return:
+            dict - {category: number of files}.
+        """
+        counts = {category: 0 for category in FILE_CATEGORIES}
+        counts.update(self.conn.execute('SELECT category, COUNT(*) FROM files GROUP BY category'))
+        counts[fcl.DUPLICATE] = self.conn.execute('SELECT COUNT(*) FROM duplicates').fetchone()[0]
+        return counts
+
+    def duplicateGroups(self):
+        """Get the groups of duplicate files.
+
+        Return:
+            list - of (size, [file paths]) in the order found by the audit.
+        """
+        rows = self.conn.execute(
+            'SELECT d.group_id, f.directory, f.name, f.size FROM duplicates d '
+            'JOIN files f ON f.id = d.file_id ORDER BY d.group_id, d.rowid'
+        )
+        groups = {}
+        for group_id, directory, name, size in rows:
+            groups.setdefault(group_id, (size, []))[1].append(os.path.join(directory, name))
+        return list(groups.values())
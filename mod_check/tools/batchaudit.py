@@ -0,0 +1,295 @@
+'''
+@summary: Run the model file audit on a batch of model roots from the command line.
+
+Runs the same audit as the Check Files dialog (see modelaudit), without QGIS,
+on each model root in a separate process. A JSON and CSV report is written for
+each model root, along with a summary of all of them.
+
+Usage (from the folder containing mod_check):
+    python -m mod_check.tools.batchaudit -o <output folder> <model root> [<model root> ...]
+    python -m mod_check.tools.batchaudit -o <output folder> --roots-file roots.txt
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import sys
+import csv
+import json
+import time
+import hashlib
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Outside of QGIS the vendored libraries aren't on the path (see menu.py)
+DEPENDENCIES_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dependencies')
+if DEPENDENCIES_FOLDER not in sys.path:
+    sys.path.append(DEPENDENCIES_FOLDER)
+
+from . import fileclassifier as fcl
+from .modelaudit import ModelAuditor, loadWorkspaceFiles
+
+
+# Categories written to the reports, in order
+REPORT_CATEGORIES = [
+    category for category, _ in fcl.CATEGORY_ORDER if category != fcl.DUPLICATE
+] + [fcl.OTHER]
+
+FILE_CSV_HEADERS = ['category', 'extension', 'directory', 'name', 'size', 'modified']
+
+SUMMARY_CSV_HEADERS = [
+    'model_root', 'status', 'seconds', 'total_files', 'files_per_second',
+] + REPORT_CATEGORIES + [
+    'missing', 'found', 'found_ief', 'failed_parents', 'duplicate_groups',
+    'duplicate_bytes', 'json_report', 'csv_report', 'error',
+]
+
+
+def reportName(model_root):
+    """Get a unique file name (without extension) for a model root report.
+
+    Different model roots often have the same folder name, so a short hash of
+    the full path is added.
+
+    Args:
+        model_root(str): the model root folder.
+
+    Return:
+        str - the report file name.
+    """
+    full_path = os.path.normcase(os.path.abspath(model_root))
+    name = os.path.basename(full_path.rstrip('\\/')) or 'root'
+    name = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in name)
+    return '{0}_{1}'.format(name, hashlib.md5(full_path.encode('utf-8')).hexdigest()[:8])
+
+
+def fileRecord(f):
+    return {'path': f.filepath, 'extension': f.fileExt, 'size': f.size, 'modified': f.mtime}
+
+
+def writeFileCsv(save_path, search_results):
+    """Write one row for every file found, with its category, to a CSV file."""
+    with open(save_path, 'w', newline='', encoding='utf-8') as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(FILE_CSV_HEADERS)
+        for category in REPORT_CATEGORIES:
+            for f in search_results[category]:
+                writer.writerow([category, f.fileExt, f.path, f.name, f.size, f.mtime])
+
+
+def auditReport(model_root, iefs, search_results, result_holder, workspaces):
+    """Get the audit results as a dict that can be written to JSON.
+
+    Args:
+        model_root(str): the audited model root.
+        iefs(list): iefcache.IefSummary's from the audit.
+        search_results(dict): categorised files from the audit.
+        result_holder(modelaudit.ResultHolder): reference check results.
+        workspaces(dict): {workspace path: [modelaudit.WorkspaceFile]}.
+
+    Return:
+        dict - the report.
+    """
+    return {
+        'model_root': model_root,
+        'counts': {category: len(search_results[category]) for category in REPORT_CATEGORIES},
+        'files': {
+            category: [fileRecord(f) for f in search_results[category]]
+            for category in REPORT_CATEGORIES
+        },
+        'references': {
+            'missing': result_holder.results['missing'],
+            'found': result_holder.results['found'],
+            'found_ief': result_holder.results['found_ief'],
+            'checked': result_holder.seen_parents,
+            'failed': result_holder.failed_parents,
+        },
+        'duplicates': [
+            {'size': group[0].size, 'files': [f.filepath for f in group]}
+            for group in result_holder.duplicates
+        ],
+        'iefs': [ief._asdict() for ief in iefs],
+        'workspaces': {
+            workspace: [
+                {'datasource': w.rawpath, 'path': str(w.path), 'exists': w.exists}
+                for w in datasources
+            ] for workspace, datasources in workspaces.items()
+        },
+    }
+
+
+def auditRoot(model_root, output_folder, full_rescan=False, find_duplicates=True):
+    """Audit a single model root and write the reports.
+
+    Run in a worker process, so any errors are returned in the summary rather
+    than raised to stop the rest of the batch.
+
+    Args:
+        model_root(str): the model root folder to audit.
+        output_folder(str): folder to write the reports to.
+        full_rescan=False(bool): if True ignore the audit index and read every folder.
+        find_duplicates=True(bool): if False skip the duplicate file search.
+
+    Return:
+        dict - summary of the audit, with the SUMMARY_CSV_HEADERS keys.
+    """
+    summary = {key: '' for key in SUMMARY_CSV_HEADERS}
+    summary['model_root'] = model_root
+    start = time.perf_counter()
+    try:
+        if not os.path.isdir(model_root):
+            raise OSError('Model root folder does not exist: {0}'.format(model_root))
+        iefs, search_results, result_holder = ModelAuditor().auditModelFiles(
+            model_root, full_rescan, find_duplicates
+        )
+        workspaces = loadWorkspaceFiles(search_results['workspace'])
+        audit_seconds = time.perf_counter() - start
+
+        name = reportName(model_root)
+        json_path = os.path.join(output_folder, name + '.json')
+        csv_path = os.path.join(output_folder, name + '.csv')
+        report = auditReport(model_root, iefs, search_results, result_holder, workspaces)
+        with open(json_path, 'w', encoding='utf-8') as outfile:
+            json.dump(report, outfile, indent=1)
+        writeFileCsv(csv_path, search_results)
+
+        total_files = sum(report['counts'].values())
+        summary.update(report['counts'])
+        summary.update({
+            'status': 'ok',
+            'seconds': round(audit_seconds, 3),
+            'total_files': total_files,
+            'files_per_second': round(total_files / audit_seconds, 1) if audit_seconds > 0 else '',
+            'missing': len(result_holder.results['missing']),
+            'found': len(result_holder.results['found']),
+            'found_ief': len(result_holder.results['found_ief']),
+            'failed_parents': len(result_holder.failed_parents),
+            'duplicate_groups': len(result_holder.duplicates),
+            'duplicate_bytes': sum(
+                g[0].size * (len(g) - 1) for g in result_holder.duplicates
+            ),
+            'json_report': json_path,
+            'csv_report': csv_path,
+        })
+    except Exception as err:
+        summary['status'] = 'failed'
+        summary['seconds'] = round(time.perf_counter() - start, 3)
+        summary['error'] = '{0}\n{1}'.format(err, traceback.format_exc())
+    return summary
+
+
+def writeSummary(output_folder, summaries, total_seconds):
+    """Write the roll-up of all of the audits to summary.json and summary.csv.
+
+    Return:
+        tuple(str, str) - the JSON and CSV summary paths.
+    """
+    total_files = sum(s['total_files'] or 0 for s in summaries)
+    json_path = os.path.join(output_folder, 'summary.json')
+    csv_path = os.path.join(output_folder, 'summary.csv')
+    with open(json_path, 'w', encoding='utf-8') as outfile:
+        json.dump({
+            'roots': len(summaries),
+            'failed': sum(1 for s in summaries if s['status'] != 'ok'),
+            'total_files': total_files,
+            'seconds': round(total_seconds, 3),
+            'files_per_second': round(total_files / total_seconds, 1) if total_seconds > 0 else 0,
+            'audits': summaries,
+        }, outfile, indent=1)
+    with open(csv_path, 'w', newline='', encoding='utf-8') as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=SUMMARY_CSV_HEADERS)
+        writer.writeheader()
+        for s in summaries:
+            # Only the error message in the CSV, the traceback is in the JSON
+            writer.writerow(dict(s, error=s['error'].split('\n', 1)[0]))
+    return json_path, csv_path
+
+
+def readRootsFile(roots_file):
+    """Read model root folders from a text file, one per line.
+
+    Blank lines and lines starting with '#' are skipped.
+    """
+    with open(roots_file, 'r', encoding='utf-8') as infile:
+        return [
+            line.strip() for line in infile
+            if line.strip() and not line.strip().startswith('#')
+        ]
+
+
+def runBatch(model_roots, output_folder, workers=None, full_rescan=False, find_duplicates=True):
+    """Audit all of the model roots in a process pool.
+
+    Each audit mostly waits on the file system, so the roots are spread over
+    the processes and each one runs its own folder scan thread pool.
+
+    Args:
+        model_roots(list): model root folders to audit.
+        output_folder(str): folder to write the reports to.
+        workers=None(int): number of processes. Defaults to the number of CPUs.
+        full_rescan=False(bool): if True ignore the audit indexes and read every folder.
+        find_duplicates=True(bool): if False skip the duplicate file search.
+
+    Return:
+        list - of audit summary dicts in the same order as model_roots.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    start = time.perf_counter()
+    summaries = [None] * len(model_roots)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(auditRoot, root, output_folder, full_rescan, find_duplicates): i
+            for i, root in enumerate(model_roots)
+        }
+        for count, future in enumerate(as_completed(futures), 1):
+            s = future.result()
+            summaries[futures[future]] = s
+            if s['status'] == 'ok':
+                print('[{0}/{1}] {2}: {3} files in {4:.1f}s ({5} files/s)'.format(
+                    count, len(model_roots), s['model_root'], s['total_files'],
+                    s['seconds'], s['files_per_second']
+                ))
+            else:
+                print('[{0}/{1}] {2}: FAILED - {3}'.format(
+                    count, len(model_roots), s['model_root'], s['error'].split('\n', 1)[0]
+                ))
+
+    total_seconds = time.perf_counter() - start
+    json_path, _ = writeSummary(output_folder, summaries, total_seconds)
+    print('Audited {0} model roots in {1:.1f}s. Summary written to {2}'.format(
+        len(model_roots), total_seconds, json_path
+    ))
+    return summaries
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Audit the files in a batch of model roots without QGIS.'
+    )
+    parser.add_argument('roots', nargs='*', help='model root folders to audit')
+    parser.add_argument('-r', '--roots-file', help='text file listing model root folders, one per line')
+    parser.add_argument('-o', '--output', required=True, help='folder to write the reports to')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='number of processes (default: number of CPUs)')
+    parser.add_argument('--full-rescan', action='store_true', help='ignore the audit indexes and read every folder')
+    parser.add_argument('--no-duplicates', action='store_true', help='skip the search for duplicate files')
+    args = parser.parse_args(args)
+
+    model_roots = list(args.roots)
+    if args.roots_file:
+        model_roots.extend(readRootsFile(args.roots_file))
+    if not model_roots:
+        parser.error('no model roots given')
+
+    summaries = runBatch(
+        model_roots, args.output, args.workers, args.full_rescan, not args.no_duplicates
+    )
+    return 0 if all(s['status'] == 'ok' for s in summaries) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
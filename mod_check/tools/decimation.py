@@ -0,0 +1,259 @@
+'''
+@summary: Reduce long time series to what can be seen on a graph.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Number of buckets used when the width of the graph isn't known
+DEFAULT_BUCKETS = 1000
+
+# Never use fewer buckets than this, so small graphs still look right
+MIN_BUCKETS = 200
+
+# Number of decimated ranges kept for each series (e.g. zoom levels)
+RANGE_CACHE_SIZE = 8
+
+# Number of series kept in a SeriesCache
+SERIES_CACHE_SIZE = 64
+
+
+def minMaxIndices(values, start=0, stop=None, buckets=DEFAULT_BUCKETS):
+    """Get the indices of the min and max values in equal sized buckets of a series.
+
+    values[start:stop] is split into buckets and the positions of the smallest
+    and largest value in each one are kept, along with the first and last
+    points. Plotting only these points draws the same envelope as plotting
+    the full series at a resolution of about one bucket per pixel, so spikes
+    don't disappear like they would if every nth point was taken.
+
+    Args:
+        values(ndarray): 1D float array.
+        start=0(int): first index to include.
+        stop=None(int): index to stop at. Defaults to the end of the series.
+        buckets=DEFAULT_BUCKETS(int): number of buckets (usually the graph
+            width in pixels).
+
+    Return:
+        ndarray - sorted indices into values. If the range has less than four
+            points per bucket every index in the range is returned.
+    """
+    if stop is None:
+        stop = len(values)
+    count = stop - start
+    if count <= buckets * 4:
+        return np.arange(start, stop)
+
+    size = count // buckets
+    end = start + size * buckets
+    blocks = values[start:end].reshape(buckets, size)
+    offsets = start + np.arange(buckets) * size
+    keep = [
+        np.array([start, stop - 1]),
+        offsets + blocks.argmin(axis=1),
+        offsets + blocks.argmax(axis=1),
+    ]
+    if end < stop:
+        remainder = values[end:stop]
+        keep.append(np.array([end + remainder.argmin(), end + remainder.argmax()]))
+    return np.unique(np.concatenate(keep))
+
+
+def sharedMinMaxIndices(series, buckets=DEFAULT_BUCKETS):
+    """Get the min/max indices for a set of series that share the same time axis.
+
+    Args:
+        series(list): 1D arrays, all the same length.
+        buckets=DEFAULT_BUCKETS(int): number of buckets for each series.
+
+    Return:
+        ndarray - sorted indices, the union of the minMaxIndices of each series.
+    """
+    return np.unique(np.concatenate([minMaxIndices(s, buckets=buckets) for s in series]))
+
+
+class DecimatedSeries():
+    """An x, y series that can be decimated to any part of the x range.
+
+    The values are copied once to contiguous float arrays and the last few
+    decimated ranges are kept, so redrawing the same view (or going back to a
+    previous zoom level) doesn't repeat the work.
+
+    x is expected to be increasing (e.g. time). If it isn't, the whole series
+    is always decimated rather than just the visible part.
+    """
+
+    def __init__(self, x, y):
+        self.x = np.ascontiguousarray(x, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.is_sorted = len(self.x) < 2 or bool(np.all(np.diff(self.x) >= 0))
+        self._ranges = OrderedDict()
+
+    def __len__(self):
+        return len(self.x)
+
+    def visibleRange(self, x_min=None, x_max=None):
+        """Get the start and stop index of the points between x_min and x_max.
+
+        One point either side of the range is included so that the line
+        continues to the edge of the graph.
+        """
+        if not self.is_sorted or (x_min is None and x_max is None):
+            return 0, len(self.x)
+        start = 0
+        stop = len(self.x)
+        if x_min is not None:
+            start = max(int(np.searchsorted(self.x, x_min, side='left')) - 1, 0)
+        if x_max is not None:
+            stop = min(int(np.searchsorted(self.x, x_max, side='right')) + 1, len(self.x))
+        return start, max(start, stop)
+
+    def data(self, x_min=None, x_max=None, buckets=DEFAULT_BUCKETS):
+        """Get the decimated points between x_min and x_max.
+
+        Args:
+            x_min=None(float): start of the visible range.
+            x_max=None(float): end of the visible range.
+            buckets=DEFAULT_BUCKETS(int): number of buckets (see minMaxIndices).
+
+        Return:
+            tuple(ndarray, ndarray) - the x and y values to plot.
+        """
+        start, stop = self.visibleRange(x_min, x_max)
+        key = (start, stop, buckets)
+        points = self._ranges.get(key)
+        if points is None:
+            indices = minMaxIndices(self.y, start, stop, buckets)
+            points = (self.x[indices], self.y[indices])
+            self._ranges[key] = points
+            if len(self._ranges) > RANGE_CACHE_SIZE:
+                self._ranges.popitem(last=False)
+        else:
+            self._ranges.move_to_end(key)
+        return points
+
+
+class SeriesCache():
+    """Cache of the float arrays and DecimatedSeries for the series being plotted.
+
+    The graphs are often redrawn with the same data (e.g. moving the timestep
+    slider, or ticking another run in the summary table), so the converted
+    arrays are kept rather than being rebuilt every time.
+
+    numpy arrays (and pandas Series) are matched on the memory they use, so a
+    new view of the same data finds the same entry. Anything else (e.g.
+    lists) is matched on the object itself. A reference to everything in the
+    cache is held, so the memory can't be reused while it's in the cache.
+    """
+
+    def __init__(self, max_size=SERIES_CACHE_SIZE):
+        self.max_size = max_size
+        self._arrays = OrderedDict()
+        self._series = OrderedDict()
+
+    def clear(self):
+        self._arrays.clear()
+        self._series.clear()
+
+    def _key(self, values):
+        if hasattr(values, '__array_interface__') or hasattr(values, 'to_numpy'):
+            array = np.asarray(values)
+            info = array.__array_interface__
+            return ('array', info['data'][0], array.shape, array.strides, array.dtype.str), array
+        return ('object', id(values)), values
+
+    def _get(self, store, key, build):
+        entry = store.get(key)
+        if entry is None:
+            entry = build()
+            store[key] = entry
+            if len(store) > self.max_size:
+                store.popitem(last=False)
+        else:
+            store.move_to_end(key)
+        return entry
+
+    def array(self, values):
+        """Get values as a contiguous float array."""
+        key, source = self._key(values)
+        return self._get(
+            self._arrays, key,
+            lambda: (source, np.ascontiguousarray(source, dtype=np.float64))
+        )[1]
+
+    def series(self, x, y):
+        """Get the DecimatedSeries for x and y values."""
+        x_key, x_source = self._key(x)
+        y_key, y_source = self._key(y)
+        return self._get(
+            self._series, (x_key, y_key),
+            lambda: (x_source, y_source, DecimatedSeries(self.array(x), self.array(y)))
+        )[2]
+
+
+class LineDecimator():
+    """Plot decimated series on matplotlib axes and update them when zoomed.
+
+    Lines are added with plot, which takes the same arguments as Axes.plot.
+    Only the min/max envelope of the visible part of each series is plotted,
+    at about one bucket per pixel of the axes width. When the x limits of the
+    axes change (zoom, pan, or the toolbar home button) the visible part is
+    decimated again so the detail comes back as you zoom in.
+
+    reset must be called when the figure is cleared.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else SeriesCache()
+        self.lines = []
+        self._connected = []
+
+    def reset(self):
+        """Forget the plotted lines (they're removed when the figure is cleared)."""
+        self.lines = []
+        self._connected = []
+
+    def buckets(self, axes):
+        try:
+            width = int(axes.bbox.width)
+        except (AttributeError, ValueError):
+            return DEFAULT_BUCKETS
+        return max(width, MIN_BUCKETS)
+
+    def plot(self, axes, x, y, *args, **kwargs):
+        """Plot a decimated series.
+
+        Args:
+            axes(Axes): the matplotlib axes to plot on.
+            x(array-like): x values, increasing.
+            y(array-like): y values, the same length as x.
+            *args, **kwargs: passed to Axes.plot.
+
+        Return:
+            list - the Line2D's returned by Axes.plot.
+        """
+        series = self.cache.series(x, y)
+        x_data, y_data = series.data(buckets=self.buckets(axes))
+        lines = axes.plot(x_data, y_data, *args, **kwargs)
+        for line in lines:
+            self.lines.append((line, series))
+        if not any(a is axes for a in self._connected):
+            axes.callbacks.connect('xlim_changed', self._xlimChanged)
+            self._connected.append(axes)
+        return lines
+
+    def _xlimChanged(self, axes):
+        x_min, x_max = axes.get_xlim()
+        shared = axes.get_shared_x_axes()
+        buckets = self.buckets(axes)
+        for line, series in self.lines:
+            if line.axes is axes or shared.joined(line.axes, axes):
+                line.set_data(*series.data(x_min, x_max, buckets))
@@ -0,0 +1,215 @@
+'''
+@summary: Find files with identical contents under the model root.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Size of the blocks read from the start and end of files for the first check
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+# Size of the chunks read when hashing whole files
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Maximum number of files read at the same time
+DEFAULT_MAX_WORKERS = 8
+
+
+def hashEnds(filepath, size, block_size=DEFAULT_BLOCK_SIZE):
+    """Hash the first and last blocks of a file.
+
+    Files no bigger than two blocks are read in full, so the hash covers the
+    whole file.
+
+    Args:
+        filepath(str): the file to read.
+        size(int): the file size in bytes.
+        block_size=DEFAULT_BLOCK_SIZE(int): bytes to read from each end.
+
+    Return:
+        str - the hash, or None if the file can't be read.
+    """
+    digest = hashlib.blake2b()
+    try:
+        with open(filepath, 'rb') as infile:
+            if size <= block_size * 2:
+                digest.update(infile.read())
+            else:
+                digest.update(infile.read(block_size))
+                infile.seek(size - block_size)
+                digest.update(infile.read(block_size))
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def hashFile(filepath, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Hash the whole of a file, reading it in chunks.
+
+    Args:
+        filepath(str): the file to read.
+        chunk_size=DEFAULT_CHUNK_SIZE(int): bytes read at a time.
+
+    Return:
+        str - the hash, or None if the file can't be read.
+    """
+    digest = hashlib.blake2b()
+    try:
+        with open(filepath, 'rb') as infile:
+            for chunk in iter(lambda: infile.read(chunk_size), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def cachedHash(hash_cache, kind, f, hash_func):
+    """Get a file hash from hash_cache, or calculate and store it.
+
+    A stored hash is only used if the file size and modified time are the
+    same as when it was calculated. Files with an unknown modified time are
+    always hashed.
+
+    Args:
+        hash_cache(dict): {(kind, filepath): (size, mtime, hash)}, or None.
+        kind(str): the type of hash, so a file can have more than one stored.
+        f(SomeFile): the file, with size and mtime set.
+        hash_func(func): called with the file to calculate the hash.
+
+    Return:
+        str - the hash, or None if the file can't be read.
+    """
+    if hash_cache is None or f.mtime is None:
+        return hash_func(f)
+    key = (kind, f.filepath)
+    stored = hash_cache.get(key)
+    if stored is not None and stored[0] == f.size and stored[1] == f.mtime:
+        return stored[2]
+    file_hash = hash_func(f)
+    if file_hash is not None:
+        hash_cache[key] = (f.size, f.mtime, file_hash)
+    return file_hash
+
+
+def refreshStat(f):
+    """Set the size and modified time of a file from a new os.stat.
+
+    Return:
+        bool - False if the file can't be read.
+    """
+    try:
+        stat = os.stat(f.filepath)
+    except OSError:
+        return False
+    f.size = stat.st_size
+    f.mtime = stat.st_mtime
+    return True
+
+
+def _groupBySize(files):
+    """Group files by size, keeping groups with more than one (non empty) file."""
+    by_size = {}
+    for f in files:
+        if f.size:
+            by_size.setdefault(f.size, []).append(f)
+    return [f for group in by_size.values() if len(group) > 1 for f in group]
+
+
+def _groupByHash(files, hash_func, pool):
+    """Group files by size and hash, keeping groups with more than one file.
+
+    Files that couldn't be read are left out.
+    """
+    groups = {}
+    for f, file_hash in zip(files, pool.map(hash_func, files)):
+        if file_hash is not None:
+            groups.setdefault((f.size, file_hash), []).append(f)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def findDuplicates(files, block_size=DEFAULT_BLOCK_SIZE, chunk_size=DEFAULT_CHUNK_SIZE,
+                   max_workers=DEFAULT_MAX_WORKERS, status_callback=None, hash_cache=None):
+    """Find the files with identical contents.
+
+    Works in three stages so that only files that could be copies are read:
+        1. Files are grouped by the size found in the folder scan. A file
+           with a size that no other file has can't be a copy. The files
+           left are checked with os.stat, because the folder scan may have
+           come from an index and be out of date if a file has been edited
+           in place, and grouped again by their current size.
+        2. Files in the same size group are grouped by a hash of their first
+           and last blocks.
+        3. Files still in a group, that are bigger than the two blocks, are
+           grouped by a hash of the whole file.
+
+    Empty files, and files with an unknown size, are not included. The size
+    and mtime of the files checked in stage 2 are updated to the current
+    values.
+
+    If hash_cache is given, hashes stored in it are used instead of reading
+    files that haven't changed, and new hashes are added to it (see
+    cachedHash).
+
+    Args:
+        files(list): SomeFile's, with size and mtime set.
+        block_size=DEFAULT_BLOCK_SIZE(int): bytes hashed at each end in stage 2.
+        chunk_size=DEFAULT_CHUNK_SIZE(int): read size when hashing whole files.
+        max_workers=DEFAULT_MAX_WORKERS(int): maximum files read at once.
+        status_callback=None(func): called with status update messages.
+        hash_cache=None(dict): {(kind, filepath): (size, mtime, hash)} of
+            hashes from an earlier search.
+
+    Return:
+        list - of lists of SomeFile's with the same contents. Sorted by the
+            space used by the extra copies, largest first.
+    """
+    def updateStatus(status):
+        if status_callback is not None:
+            status_callback(status)
+
+    # The end hash depends on the block size, so it's part of the kind
+    ends_kind = 'ends{0}'.format(block_size)
+    duplicates = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        candidates = _groupBySize(files)
+        candidates = _groupBySize(
+            [f for f, found in zip(candidates, pool.map(refreshStat, candidates)) if found]
+        )
+        updateStatus('Checking {0} files with matching sizes for duplicates ...'.format(
+            len(candidates)
+        ))
+        partial_groups = _groupByHash(
+            candidates,
+            lambda f: cachedHash(
+                hash_cache, ends_kind, f, lambda f: hashEnds(f.filepath, f.size, block_size)
+            ),
+            pool
+        )
+
+        full_check = []
+        for group in partial_groups:
+            # The partial hash already covered the whole file
+            if group[0].size <= block_size * 2:
+                duplicates.append(group)
+            else:
+                full_check.extend(group)
+
+        updateStatus('Checking {0} possible duplicate files ...'.format(len(full_check)))
+        duplicates.extend(_groupByHash(
+            full_check,
+            lambda f: cachedHash(hash_cache, 'full', f, lambda f: hashFile(f.filepath, chunk_size)),
+            pool
+        ))
+
+    for group in duplicates:
+        group.sort(key=lambda f: f.filepath)
+    duplicates.sort(key=lambda g: (-g[0].size * (len(g) - 1), g[0].filepath))
+    return duplicates
@@ -10,497 +10,44 @@
 Credit to Matthew Shallcross who wrote the majority of this functionality.
 '''
 
-import os
-import sys
-import csv
-from pprint import pprint
 from PyQt5 import QtCore
-import re
-from pathlib import Path
-from lxml import etree
-from glob import glob
 
-from . import globaltools as gt
-from floodmodeller_api import IEF
-from tmf.tuflow_model_files import TCF
-from tmf.tuflow_model_files.inp.file import FileInput
-from tmf.tuflow_model_files.inp.gis import GisInput
-from tmf.tuflow_model_files.inp.setting import SettingInput
+# The audit itself doesn't need Qt, so lives in modelaudit. The classes that
+# used to be defined here are imported for existing callers
+from .modelaudit import (
+    WorkspaceFile, Workspace, loadWorkspaceFiles, IefSubfile, IefFile, loadIefFiles,
+    ModelAuditor, ResultHolder, SomeFile
+)
 
+__all__ = [
+    'FileChecker', 'WorkspaceFile', 'Workspace', 'loadWorkspaceFiles', 'IefSubfile', 'IefFile',
+    'loadIefFiles', 'ModelAuditor', 'ResultHolder', 'SomeFile',
+]
 
-class WorkspaceFile():
-    
-    def __init__(self, path):
-        self.rawpath = path
-        self.path = Path(path)
-        self.missing = 'Yes'
-        
-    @property
-    def fullpath(self):
-        return self.path.absolute()
-
-    @property
-    def name(self):
-        return self.path.name
-
-    @property
-    def extension(self):
-        return self.path.suffix
-
-
-class Workspace():
-    
-    def __init__(self, workspace):
-        self.workspace = workspace
-        
-    def readWorkspaceFile(self):
-        wpath = self.workspace.filepath
-        
-        with open(wpath) as infile:
-            xml = infile.read()
-
-        files = [] 
-
-        root = etree.fromstring(xml)
-        for primaries in root.getchildren():
-            if primaries.tag == "projectlayers":
-                for maplayers in primaries.getchildren():
-                    for maptags in maplayers.getchildren():
-                        if maptags.tag == 'datasource':
-                            text = maptags.text
-                            files.append(WorkspaceFile(text))
-                    
-        return files
-        
-
-def loadWorkspaceFiles(workspaces):
-    workspace_files = {}
-    for workspace in workspaces:
-        w = Workspace(workspace)
-        files = w.readWorkspaceFile()
-        workspace_files[workspace.name] = files
-    return workspace_files
-
-
-class IefSubfile():
-    
-    def __init__(self, path):
-        self.rawpath = path
-        self.path = Path(path)
-        self.missing = 'Yes'
-        
-    @property
-    def fullpath(self):
-        return self.path.absolute()
-
-    @property
-    def name(self):
-        return self.path.name
-
-    @property
-    def extension(self):
-        return self.path.suffix
-
-class IefFile():
-    
-    def __init__(self, ief):
-        self.ief = ief
-        self._files = []
-        
-    @property
-    def filepath(self):
-        return self.ief.filepath
-    
-    @property
-    def files(self):
-        if not self._files:
-            self._files = self.findFiles()
-        return self._files
-    
-    def findFiles(self):
-        dat = IefSubfile(self.ief.Datafile)
-        results = IefSubfile(self.ief.Results + '.zzn')
-        ieds = [IefSubfile(i) for i in self.ief.EventData.values()]
-        tcf = getattr(self.ief, '2DFile', None)
-        ics = getattr(self.ief, 'InitialConditions', None)
-
-        all_files = [dat, results]
-        all_files.extend(ieds)
-        if tcf:
-            all_files.append(IefSubfile(tcf))
-        if ics:
-            all_files.append(IefSubfile(ics))
-        
-        return all_files
-    
-    
-
-def loadIefFiles(fm_files):
-    # ief_paths = glob(folder + + '\*.ief', recursive=True)
-    iefs = {}
-    for fm in fm_files:
-        if fm.fileExt == 'ief':
-            ief_path = Path(fm.filepath)
-            ief = IEF(ief_path)
-            ief = IefFile(ief)
-            iefs[str(ief_path.name)] = ief
-    
-    return iefs
-    
 
 class FileChecker(QtCore.QObject):
+    """Run a ModelAuditor, sending its status updates with a Qt signal."""
     status_signal = QtCore.pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
+        self.auditor = ModelAuditor(status_callback=self.status_signal.emit)
         
-    def auditModelFiles(self, model_root):
-        self.status_signal.emit('Auditing model files ...')
-
-        errors = {}
-        error_count = 0
-        search_successes = 0
-        
-        self.status_signal.emit('Searching folders ...')
-        iefs, (
-            tuflow_model_files, fm_model_files, gis_files, log_files, result_files, csv_files, 
-            workspace_files, other_files, ignore_files, file_tree
-        ) = self.categorise(model_root)
-        # audit = AuditFiles(model_root, model_files, other_files, ignore_files)
-        # self.status_signal.emit('Categorising results ...')
-        # result_holder = ResultHolder()
-        # result_holder.ignored_files = ignore_files
-        return iefs, {
-            'tuflow_model': tuflow_model_files, 'fm_model': fm_model_files, 'gis': gis_files, 
-            'log': log_files, 'csv': csv_files, 'result': result_files, 
-            'workspace': workspace_files, 'other': other_files, 'ignore': ignore_files, 
-            'tree': file_tree
-        }
-        
-        
-        self.status_signal.emit('Checking paths ...')
-        
-        
-        # for f in audit.getModelFiles():
-        #     fpath = f.getFilePath()
-        #     self.status_signal.emit('Checking paths for file: {0}'.format(fpath))
-        #     errorlist = []
-        #
-        #     if fpath in result_holder.seen_parents: continue
-        #
-        #     result_holder.parent = fpath
-        #     result_holder.seen_parents.append(fpath)
-        #
-        #     for p, line in f.getPathsToCheck():
-        #         if not p.isReal():
-        #
-        #             path_as_read = p.getPathAsRead()
-        #             result_holder.addMissing(p.pathAsRead, line)
-        #
-        #             error_count += 1
-        #             errorlist.append((p, line))
-        #             search_result = p.find(audit)
-        #             if len(search_result) > 0:
-        #
-        #                 try:
-        #                     result_holder.setFound(p.pathAsRead, search_result)
-        #                 except KeyError:
-        #                     pass
-        #                 search_successes += 1
-        #     errors[f] = errorlist
-            
-
-
-
-
-        # result_holder.model_root = model_root
-        # result_holder.summary = audit.getFileCounts()
-        # result_holder.processResults()
-        # result_holder.file_tree = file_tree
-        # self.status_signal.emit('Check complete')
-        # return result_holder
-
-    def categorise(self, model_root):
-        '''
-            Method for categorising the model passed to the audit tool
-            Return: tuple contain list of ModelFile and list of SomeFile instances
-        '''
-        tuflow_model_files = []
-        fm_model_files = []
-        gis_files = []
-        log_files = []
-        result_files = []
-        workspace_files = []
-        csv_files = []
-        other_files = []
-        ignore_files = []
-        file_tree = []
-        try:
-            # walk the model folder structure categorising ignore, model and other (eg GIS, csv) files
-            root_count = 1
-            for root, dirs, files in os.walk(model_root):
-                self.status_signal.emit('Searching folder {0} ...'.format(root))
-                tree_level = root.replace(model_root, '', 1).count(os.sep)
-                tree_indent = '|    ' * (tree_level - 1) + '+---'
-                if root_count > 1:
-                    file_tree.append({
-                        'indent': tree_indent, 'path': os.path.basename(root), 'is_folder': True, 
-                        'level': tree_level
-                    })
-                tree_subindent = '|    ' * (tree_level) + '-   '
-                
-                for f in files:
-                    file_tree.append({
-                        'indent': tree_subindent, 'path': f, 'is_folder': False, 'level': tree_level,
-                        'fullpath': os.path.join(root, f)
-                    })
-                    filepath = os.path.join(root,f)
-                    filepath = gt.longPathCheck(filepath)
-                    
-                    # IMPORTANT: The order of these checks is important
-                    # Some file types have the same extension and other checks may be required.
-                    # We need the order, in some cases, to make sure they're identified correctly
-                    query = SomeFile(filepath)
-                    if query.isIgnoreFile():
-                        ignore_files.append(query)
-
-                    elif query.isTuflowModelFile():
-                        tuflow_model_files.append(query)
-
-                    elif query.isFmModelFile():
-                        fm_model_files.append(query)
-
-                    elif query.isGisFile():
-                        gis_files.append(query)
-
-                    elif query.isLogFile():
-                        log_files.append(query)
-
-                    elif query.isResultFile():
-                        result_files.append(query)
-
-                    elif query.isWorkspaceFile():
-                        workspace_files.append(query)
+    def auditModelFiles(self, model_root, full_rescan=False, find_duplicates=True):
+        """Audit the files under model_root.
 
-                    elif query.isCsvFile():
-                        csv_files.append(query)
-                    #
-                    # # model files each have there own class describing their expected format
-                    # elif query.isModelFile():
-                    #     model_files.append(model_file_exts[query.getFileExt()](filepath))
-                    #
-                    else:
-                        other_files.append(query)
-                root_count += 1
-
-        except Exception as err:
-            raise
-        
-        # Load IEFs and remove any FM .dat files for the results files (based on being in an IEF)
-        iefs, fm_model_files, result_files = self.findFmFiles(fm_model_files, result_files)
-        
-        return iefs, (
-            tuflow_model_files, fm_model_files, gis_files, log_files, result_files, csv_files, 
-            workspace_files, other_files, ignore_files, file_tree
-        )
-    
-
-    def findFmFiles(self, fm_files, result_files):
-        iefs = []
-        dat_names = []
-        new_result_files = []
-        
-        for f in fm_files:
-            if f.fileExt.lower() == 'ief':
-                ief = IEF(f.filepath)
-                iefs.append(ief)
-                dat_name = Path(ief.datafile).name
-                dat_names.append(dat_name)
-                
-        for r in result_files:
-            if not r.name in dat_names: 
-                new_result_files.append(r)
-            else:
-                fm_files.append(r)
-
-        return iefs, fm_files, new_result_files
-
-        
-
-class ResultHolder():    
-    """
-    """
-    
-    def __init__(self):
-        self.model_root = ''
-        self.parent = ''
-        self.seen_parents = []
-        self.missing = {}
-        self.ignored_files = []
-        self.file_tree = []
-#         self.found = {}
-
-        self._summary = {'model_files': 0, 'other_files': 0, 'ignored_files': 0, 'total_files': 0}
-        self.results = {'missing': [], 'found': [], 'found_ief': []}
-        self.results_meta = {'summary': None, 'ignored': None, 'checked': None}
-
-    @property
-    def summary(self):
-        return self._summary
-
-    @summary.setter
-    def summary(self, summary):
-        self._summary = summary
-        self._summary['total_files'] = self.getFileTotal()
-        
-    def formatFileTree(self, include_files=True, format_as_text=True, include_full_paths=False):
-        output_list = []
-        fullpath_list = []
-        for f in self.file_tree:
-            if not f['is_folder']:
-                if include_files:
-                    output_list.append('{}{}\n'.format(f['indent'], f['path']))
-                    fullpath_list.append(f['fullpath'])
-                else:
-                    fullpath_list.append('')
-            else:
-                if include_files:
-                    output_list.append('{}\n'.format(f['indent'][:-4]))
-                    fullpath_list.append('')
-                output_list.append('{}{}/\n'.format(f['indent'], f['path']))
-                fullpath_list.append('')
-                
-        output = None
-        fullpaths = None
-        if format_as_text:
-            output = ''.join(output_list)
-            fullpaths = '\n'.join(fullpath_list)
-
-        if include_full_paths:
-            return output, fullpaths
-        else:
-            del fullpath_list
-            return output
-
-    def saveFileTree(self, save_path, include_files=True):
-        output = self.formatFileTree(include_files=include_files)
-        with open(save_path, 'w', newline='\n') as outfile:
-            outfile.write(output)
-    
-    def addMissing(self, path, line, found=''):
-        if path in self.missing:
-            if not self.parent in self.missing[path]['parent']:
-                self.missing[path]['parent'].append(self.parent)
-                self.missing[path]['line'].append(line)
-        else:
-            self.missing[path] = {'parent': [self.parent], 'line': [line], 'found': found}
-    
-    def setFound(self, path, found):
-        try:
-            self.missing[path]['found'] = found
-        except KeyError:
-            raise 
-        
-    def summaryText(self):
-        return 'Model Files: {0:<10}\nOther Files: {1:<10}\nIgnored Files: {2:<10}\nTotal Files: {3:<10}'.format(
-            self._summary['model_files'], self._summary['other_files'], 
-            self._summary['ignored_files'], self._summary['total_files']
-        )
-        
-    def getFileTotal(self):
-        return self._summary['model_files'] + self._summary['other_files'] + self._summary['ignored_files']
-
-    def processResults(self):
-        self.results = {'missing': [], 'found': [], 'found_ief': []}
-        self.results_meta['summary'] = self.summary
-        self.results_meta['ignored'] = self.ignored_files
-        self.results_meta['checked'] = self.seen_parents
-
-        for f, details in self.missing.items():
-            info = {'file': [], 'parents': []}
-            psplit = os.path.split(f)
-            filename = psplit[1] if len(psplit) > 1 else f
-            all_ief = True
-            for i, parent in enumerate(details['parent']):
-                if not parent[-3:] == 'ief':
-                    all_ief = False
-                info['parents'].append([parent, details['line'][i]])
-
-            if details['found']:
-                info['file'] = [filename, details['found'], f]
-                if all_ief:
-                    self.results['found_ief'].append(info)
-                else:
-                    self.results['found'].append(info)
-            else:
-                info['file'] = [filename, f]
-                self.results['missing'].append(info)
-                
-    def exportResults(self, save_path):
-        """
+        See modelaudit.ModelAuditor.auditModelFiles.
         """
-        with open(save_path, 'w', newline='\n') as outfile:
-            outfile.write('\n###########################')
-            outfile.write('\n# FILE SEARCH SUMMARY')
-            outfile.write('\n###########################\n\n')
-            outfile.write('Root folder: {0}\n'.format(self.model_root))
-            outfile.write(self.summaryText())
-
-            outfile.write('\n\nFILES THAT WERE IGNORED\n')
-            if self.ignored_files:
-                outfile.write('\n'.join([i.filepath for i in self.ignored_files]))
-            else:
-                outfile.write('\nNo files were ignored')
+        return self.auditor.auditModelFiles(model_root, full_rescan, find_duplicates)
 
-            outfile.write('\n\nMISSING FILES\n')
-            if self.results['missing']:
-                outfile.write('\n'.join(m['file'][0] for m in self.results['missing']))
-            else:
-                outfile.write('\nNo missing files')
+    def saveResults(self, iefs, search_results, result_holder):
+        """See modelaudit.ModelAuditor.saveResults."""
+        return self.auditor.saveResults(iefs, search_results, result_holder)
 
-            outfile.write('\n\nFOUND FILES (Incorrect paths)\n')
-            if self.results['found'] or self.results['found_ief']:
-                outfile.write('\n'.join(f['file'][0] for f in self.results['found']))
-                outfile.write('\n'.join(f['file'][0] for f in self.results['found_ief']))
-            else:
-                outfile.write('\nNo misreferenced files')
-                
-            outfile.write('\n\nMODEL FILES CHECKED\n')
-            outfile.write('\n'.join([p for p in self.seen_parents]))
-            
-            outfile.write('\n\n\n###########################')
-            outfile.write('\n# DETAILED RESULTS')
-            outfile.write('\n###########################\n')
+    def loadResults(self, model_root):
+        """See modelaudit.ModelAuditor.loadResults."""
+        return self.auditor.loadResults(model_root)
 
-            outfile.write('\n\nMISSING FILES\n')
-            if self.results['missing']:
-                for m in self.results['missing']:
-                    outfile.write('\n{0:<20}{1}'.format('File:', m['file'][0]))
-                    outfile.write('\n{0:<20}{1}'.format('Path:', m['file'][1]))
-                    outfile.write('\nReferenced by parent files:\n')
-                    outfile.write('\n'.join(['Line ({0})\t {1}'.format(p[1], p[0]) for p in m['parents']]))
-                    outfile.write('\n')
-            else:
-                outfile.write('\nNo missing files')
-
-            outfile.write('\n\n\nFOUND FILES (Incorrect paths)\n')
-            if self.results['found'] or self.results['found_ief']:
-                for f in self.results['found']:
-                    outfile.write('\n{0:<20}{1}'.format('File:', f['file'][0]))
-                    outfile.write('\n{0:<20}{1}'.format('Original Path:', f['file'][2]))
-                    outfile.write('\n{0:<20}{1}'.format('Found Path:', f['file'][1]))
-                    outfile.write('\nReferenced by parent files:\n')
-                    outfile.write('\n'.join(['Line ({0})\t {1}'.format(p[1], p[0]) for p in f['parents']]))
-                    outfile.write('\n')
-                for f in self.results['found_ief']:
-                    outfile.write('\n{0:<20}{1}'.format('File:', f['file'][0]))
-                    outfile.write('\n{0:<20}{1}'.format('Original Path:', f['file'][2]))
-                    outfile.write('\n{0:<20}{1}'.format('Found Path:', f['file'][1]))
-                    outfile.write('\nReferenced by parent files:\n')
-                    outfile.write('\n'.join(['Line ({0})\t {1}'.format(p[1], p[0]) for p in f['parents']]))
-                    outfile.write('\n')
-            else:
-                outfile.write('\nNo misreferenced files')
 
 # class FileChecker(QtCore.QObject):
 #     status_signal = QtCore.pyqtSignal(str)
@@ -813,92 +360,6 @@ class ResultHolder():
 #
 #
 
-ignore_file_exts = ['log', 'doc', 'xlsx', 'pdf', 'xf4', 'txt', 'dbf', 'shx', 'prj']
-tuflow_model_file_exts = ['tcf', 'tgc', 'tbc', 'tef', 'ecf', 'trd', 'tsoil', 'tmf']
-fm_model_file_exts = ['ief', 'ied', 'iic']
-gis_file_exts = ['shp', 'mif', 'mid', 'asc', 'flt', 'tif', 'tiff', 'xml', 'sqlite']
-log_file_exts = ['tlf', 'tsf']
-result_file_exts = ['xmdf', 'sup', '2dm', 'eof', 'dat', 'zzd', 'zzn', 'zzs']
-workspace_file_exts = ['qgs']#, 'wor']
-class SomeFile(object):
-    '''
-        Class for any file found in the model structure
-    '''
-    def __init__(self, filepath):
-        self.filepath = filepath
-
-        # basepath and file name
-        self.path, self.name = os.path.split(filepath)
-        
-        # File extension (converted to lower case)
-        self.fileExt = self.name.rsplit('.',1)[-1].lower()
-        
-        # Regular expressions
-        self.empty_re = re.compile('._empty_[LPRlpr]\.(shp|mif|mid|sql|sqlite)$')
-        self.messages_re = re.compile('.messages_?[LPRlpr]?\.(shp|mif|mid|sql|sqlite)$')
-        self.check_re = re.compile('.(check|DEM_M|DEM_Z)_?[LPRlpr]?\.(shp|mif|mid|flt|asc|tiff{0,1}|sql|sqlite)$')
-        self.result_re = re.compile('_(ccA|mmH|mmQ|mmV|PLOT_[LPRlpr]|TS|[dhvDHV]_Max|T(Dur|Exc)|ZUK|input_layers).*\.(shp|mif|mid|sql|sqlite|flt|xml)$')
-        
-        # File classification
-        self.ignoreFile = self.fileExt in ignore_file_exts
-        self.tuflow_modelFile = self.fileExt in tuflow_model_file_exts
-        self.fm_modelFile = self.fileExt in fm_model_file_exts
-        self.gisFile = self.fileExt in gis_file_exts
-        self.resultFile = self.fileExt in result_file_exts
-        self.logFile = self.fileExt in log_file_exts
-        self.csvFile = self.fileExt == 'csv'
-        self.workspaceFile = self.fileExt in workspace_file_exts
-        
-    def __str__(self):
-        return f"[{self.fileExt.upper()}] {self.name}"
-
-    def getFilePath(self):
-        return self.filepath
-
-    def getPath(self):
-        return self.path
-
-    def getName(self):
-        return self.name
-
-    def getFileExt(self):
-        return self.fileExt
-
-    def isTuflowModelFile(self):
-        return self.tuflow_modelFile
-
-    def isFmModelFile(self):
-        return self.fm_modelFile
-
-    def isGisFile(self):
-        if self.gisFile:
-            if re.search(self.empty_re, self.name):
-                return False
-            if re.search(self.messages_re, self.name):
-                return False
-            if re.search(self.check_re, self.name):
-                return False
-            if re.search(self.result_re, self.name):
-                return False
-            return True
-        return False
-
-    def isLogFile(self):
-        return self.logFile
-
-    def isResultFile(self):
-        return self.resultFile
-
-    def isCsvFile(self):
-        return self.csvFile
-
-    def isWorkspaceFile(self):
-        return self.workspaceFile
-
-    def isIgnoreFile(self):
-        return self.ignoreFile
-
-
 # class ModelFile(SomeFile):
 #     '''
 #         Class for model files found in the model structure
@@ -0,0 +1,80 @@
+'''
+@summary: Classify model files by name for the model file audit.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import re
+
+
+# File categories. These match the keys used for the audit results
+IGNORE = 'ignore'
+TUFLOW_MODEL = 'tuflow_model'
+FM_MODEL = 'fm_model'
+GIS = 'gis'
+LOG = 'log'
+RESULT = 'result'
+WORKSPACE = 'workspace'
+CSV = 'csv'
+OTHER = 'other'
+# Not assigned by classifyFile. Files that are copies of other files
+DUPLICATE = 'duplicate'
+
+ignore_file_exts = ['log', 'doc', 'xlsx', 'pdf', 'xf4', 'txt', 'dbf', 'shx', 'prj']
+tuflow_model_file_exts = ['tcf', 'tgc', 'tbc', 'tef', 'ecf', 'trd', 'tsoil', 'tmf']
+fm_model_file_exts = ['ief', 'ied', 'iic']
+gis_file_exts = ['shp', 'mif', 'mid', 'asc', 'flt', 'tif', 'tiff', 'xml', 'sqlite']
+log_file_exts = ['tlf', 'tsf']
+result_file_exts = ['xmdf', 'sup', '2dm', 'eof', 'dat', 'zzd', 'zzn', 'zzs']
+workspace_file_exts = ['qgs', 'qgz']#, 'wor']
+csv_file_exts = ['csv']
+
+# IMPORTANT: The order of these is important.
+# If an extension appears in more than one list the first category wins
+CATEGORY_ORDER = [
+    (IGNORE, ignore_file_exts),
+    (TUFLOW_MODEL, tuflow_model_file_exts),
+    (FM_MODEL, fm_model_file_exts),
+    (GIS, gis_file_exts),
+    (LOG, log_file_exts),
+    (RESULT, result_file_exts),
+    (WORKSPACE, workspace_file_exts),
+    (CSV, csv_file_exts),
+]
+
+# Lower case file extension -> category lookup
+EXTENSION_CATEGORIES = {}
+for category, exts in CATEGORY_ORDER:
+    for ext in exts:
+        EXTENSION_CATEGORIES.setdefault(ext, category)
+
+# TUFLOW check files, messages layers, empty templates and GIS results all
+# share extensions with the model GIS files. Any GIS file matching one of
+# these is treated as an 'other' file instead
+GIS_EXCLUDE_PATTERNS = [
+    r'._empty_[LPRlpr]\.(shp|mif|mid|sql|sqlite)$',
+    r'.messages_?[LPRlpr]?\.(shp|mif|mid|sql|sqlite)$',
+    r'.(check|DEM_M|DEM_Z)_?[LPRlpr]?\.(shp|mif|mid|flt|asc|tiff{0,1}|sql|sqlite)$',
+    r'_(ccA|mmH|mmQ|mmV|PLOT_[LPRlpr]|TS|[dhvDHV]_Max|T(Dur|Exc)|ZUK|input_layers).*\.(shp|mif|mid|sql|sqlite|flt|xml)$',
+]
+GIS_EXCLUDE_RE = re.compile('|'.join('(?:{0})'.format(p) for p in GIS_EXCLUDE_PATTERNS))
+
+
+def classifyFile(name):
+    """Work out the audit category of a file from its name.
+
+    Args:
+        name(str): the file name (not the full path).
+
+    Return:
+        tuple(str, str) - (lower case file extension, category).
+    """
+    ext = name.rsplit('.', 1)[-1].lower()
+    category = EXTENSION_CATEGORIES.get(ext, OTHER)
+    if category == GIS and GIS_EXCLUDE_RE.search(name):
+        category = OTHER
+    return ext, category
@@ -0,0 +1,194 @@
+'''
+@summary: Compact storage of the model file tree for the model file audit.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+from array import array
+from bisect import bisect_right
+
+
+# Text tree formatting
+TREE_INDENT = '|    '
+FOLDER_MARKER = '+---'
+FILE_MARKER = '-   '
+
+
+class FileTree():
+    """Folder and file names under the model root, stored as flat arrays.
+
+    Every folder and file is a node, identified by its position in the arrays.
+    Node 0 is the model root. For each node only the name, the parent node and
+    whether it's a folder are stored, so a tree with millions of files costs
+    little more than the names themselves. Full paths, depths and the text
+    formatting are worked out from the parents when they're needed.
+
+    Nodes must be added in walk order (a folder followed by its files, then its
+    sub-folders), which is the order that ModelScanner.scan returns them in.
+    """
+
+    ROOT = 0
+
+    def __init__(self, model_root):
+        self.names = [model_root]
+        self.parents = array('i', [-1])
+        self.is_folder = bytearray([1])
+        self.levels = array('H', [0])
+        # Child nodes of each folder and the sub-folders only
+        self.children = {self.ROOT: array('i')}
+        self.child_folders = {self.ROOT: array('i')}
+        self._search_names = None
+
+    def __len__(self):
+        """Number of folders and files, not including the root."""
+        return len(self.names) - 1
+
+    @property
+    def model_root(self):
+        return self.names[self.ROOT]
+
+    def _addNode(self, parent, name, is_folder):
+        node = len(self.names)
+        self.names.append(name)
+        self.parents.append(parent)
+        self.is_folder.append(1 if is_folder else 0)
+        self.levels.append(self.levels[parent] + 1)
+        self.children[parent].append(node)
+        self._search_names = None
+        return node
+
+    def addFolder(self, parent, name):
+        """Add a folder.
+
+        Args:
+            parent(int): the parent folder node.
+            name(str): the folder name.
+
+        Return:
+            int - the new folder node.
+        """
+        node = self._addNode(parent, name, True)
+        self.children[node] = array('i')
+        self.child_folders[node] = array('i')
+        self.child_folders[parent].append(node)
+        return node
+
+    def addFile(self, parent, name):
+        """Add a file.
+
+        Args:
+            parent(int): the folder node containing the file.
+            name(str): the file name.
+
+        Return:
+            int - the new file node.
+        """
+        return self._addNode(parent, name, False)
+
+    def isFolder(self, node):
+        return self.is_folder[node] == 1
+
+    def childNodes(self, node, include_files=True):
+        """Get the nodes directly below a folder.
+
+        Args:
+            node(int): the folder node.
+            include_files=True(bool): if False only the sub-folders are returned.
+
+        Return:
+            array - child node indexes (empty for files).
+        """
+        lookup = self.children if include_files else self.child_folders
+        return lookup.get(node, ())
+
+    def fullPath(self, node):
+        """Get the full path of a node from its parents.
+
+        Args:
+            node(int): the folder or file node.
+
+        Return:
+            str - the full path.
+        """
+        parts = []
+        while node > self.ROOT:
+            parts.append(self.names[node])
+            node = self.parents[node]
+        parts.append(self.names[self.ROOT])
+        return os.path.join(*reversed(parts))
+
+    def iterLines(self, include_files=True):
+        """Generate the text version of the tree, one line at a time.
+
+        The folder (tree level) of each node is stored, so the text can be
+        produced without building the whole thing in memory.
+
+        Args:
+            include_files=True(bool): if False only the folders are included.
+
+        Return:
+            generator - of str lines, including the line ending.
+        """
+        for node in range(1, len(self.names)):
+            level = self.levels[node] - 1
+            if self.is_folder[node]:
+                indent = TREE_INDENT * level + FOLDER_MARKER
+                if include_files:
+                    yield '{}\n'.format(indent[:-len(FOLDER_MARKER)])
+                yield '{}{}/\n'.format(indent, self.names[node])
+            elif include_files:
+                yield '{}{}{}\n'.format(TREE_INDENT * level, FILE_MARKER, self.names[node])
+
+    def search(self, text, start=ROOT, include_files=True):
+        """Find the next node with a name containing text (case insensitive).
+
+        Searches forward from the node after start, wrapping back to the top
+        if nothing is found.
+
+        Args:
+            text(str): the text to find in the folder or file name.
+            start=ROOT(int): the node to search on from.
+            include_files=True(bool): if False files are skipped.
+
+        Return:
+            int - the matching node, or -1 if nothing matches.
+        """
+        if not text or '\n' in text or len(self.names) < 2:
+            return -1
+        if self._search_names is None:
+            self._buildSearchIndex()
+        search_names, offsets = self._search_names
+        text = text.lower()
+
+        # Search from the start of the node after start to the end, then from
+        # the top. The second pass can stop where the first one began
+        first_start = offsets[start + 1] if start + 1 < len(offsets) else len(search_names)
+        for pos, end in ((first_start, len(search_names)), (offsets[1], first_start)):
+            while True:
+                pos = search_names.find(text, pos, end)
+                if pos < 0:
+                    break
+                node = bisect_right(offsets, pos) - 1
+                if include_files or self.is_folder[node]:
+                    return node
+                pos = offsets[node + 1] if node + 1 < len(offsets) else end
+        return -1
+
+    def _buildSearchIndex(self):
+        """Join the lower case names into one string for searching.
+
+        The offsets give the position of each node's name in the string so a
+        match can be turned back into a node with a binary search.
+        """
+        names = [n.lower() for n in self.names]
+        offsets = array('q')
+        pos = 0
+        for name in names:
+            offsets.append(pos)
+            pos += len(name) + 1
+        self._search_names = ('\n'.join(names), offsets)
@@ -20,7 +20,47 @@ import numpy as np
 # from ship.fmp.datunits import ROW_DATA_TYPES as rdt
 from floodmodeller_api import DAT, ZZN
 from floodmodeller_api.to_from_json import to_json, from_json
-from ..tools import settings as mrt_settings
+from . import globaltools as gt
+from . import resultsindex as ri
+from . import sectiongeometry as sg
+
+
+# Stability check settings (see checkStability)
+# dy2 range must be more than this times the dy range over the check window
+STABILITY_TOL = 1.5
+# Hours that the series are smoothed over
+SMOOTH_TIME_WINDOW = 0.5
+# Hours that the derivatives are compared over
+CHECK_TIME_WINDOW = 1.0
+# dy2 must go outside of +/- this value (by series type) to fail, to avoid signal noise
+DY2_MIN_TOL = {'Flow': 1, 'Stage': 0.2}
+
+# Number of nodes checked at once, to limit the memory used on big models
+STABILITY_CHUNK_SIZE = 256
+
+# Stability check methods
+DERIVATIVE_METHOD = 'derivative'
+SPECTRAL_METHOD = 'spectral'
+
+# Spectral check settings (see checkSpectralStability)
+# Frequencies at or above this (cycles per output interval) count as high
+# frequency, i.e. oscillations with a period of 4 output intervals or less
+SPECTRAL_HIGH_FREQUENCY = 0.25
+# Fraction of the energy in a window that must be high frequency to fail
+SPECTRAL_RATIO_TOL = 0.5
+# RMS amplitude (by series type) of the high frequency part of a window must
+# be more than this to fail, so that low level noise doesn't fail
+SPECTRAL_MIN_AMPLITUDE = {'Flow': 0.1, 'Stage': 0.02}
+# Minimum number of values in a window
+SPECTRAL_MIN_WINDOW = 16
+# Windows overlap, with a new one starting every window length / this
+SPECTRAL_WINDOW_OVERLAP = 2
+# Number of nodes checked at once. Lower than for the derivative check
+# because every node has a spectrum for each window
+SPECTRAL_CHUNK_SIZE = 64
+
+# Number of failed nodes shown for each run in the batch screening summary
+SCREENING_WORST_NODES = 5
 
 
 def loadDatFile(dat_path):
@@ -46,18 +86,47 @@ def loadDatFile(dat_path):
 
     
 class StabilityResults():
+    """FMP flow and stage results for the stability check.
+
+    flows and stage are contiguous float32 arrays with a row for each output
+    time and a column for each node. node_index maps the node names to their
+    column and times holds the output time of each row, so the values at a
+    timestep or for a node are found by indexing rather than label lookups,
+    and the series for a node is a view of the column rather than a copy.
+
+    derivs is set to a StabilityDerivatives when the stability check is run
+    and geometry to a sectiongeometry.SectionGeometryCache when the dat is set.
+    """
     
     def __init__(self, flows, stage, nodes, times, save_interval, timestep):
-        self.flows = flows
-        self.stage = stage
-        self.times = times
+        self.flows = np.ascontiguousarray(flows, dtype=np.float32)
+        self.stage = np.ascontiguousarray(stage, dtype=np.float32)
+        self.times = np.asarray(times, dtype=np.float64)
         self.timestep = timestep
         self.save_interval = save_interval
-        self.nodes = nodes
+        self.nodes = list(nodes)
+        self.node_index = {name: i for i, name in enumerate(self.nodes)}
         self.derivs = None
         self.failed_nodes = None
         self._dat = None
         self.section_lookup = {}
+        self.geometry = sg.SectionGeometryCache()
+
+    def nodeIndex(self, node_name):
+        """Get the column of a node in the results arrays."""
+        return self.node_index[node_name]
+
+    def timeIndex(self, time):
+        """Get the row of the results arrays nearest to a time (hours)."""
+        index = int(np.searchsorted(self.times, time))
+        if index > 0 and (index == len(self.times) or time - self.times[index - 1] < self.times[index] - time):
+            index -= 1
+        return index
+
+    def series(self, series_type, node_index):
+        """Get the 'Flow' or 'Stage' series for a node (a view of the results)."""
+        data = self.flows if series_type == 'Flow' else self.stage
+        return data[:, node_index]
         
     def unit_type(self, node_name):
         utype = 'Unknown'
@@ -80,6 +149,7 @@ class StabilityResults():
         if not isinstance(d, DAT):
             return
         self._dat = d
+        self.geometry = sg.SectionGeometryCache(d)
 
         ignored_types = ['COMMENT', 'JUNCTION', 'GENERAL']
         for idx, unit in enumerate(self._dat._all_units):
@@ -101,6 +171,92 @@ class StabilityResults():
             self.section_lookup[unit_name] = unit_type
             
         
+class StabilityDerivatives():
+    """The smoothed series, derivatives and check results for every node.
+
+    The series are float32 arrays with a row for each time and a column for
+    each node, in the same layout as the StabilityResults flows and stage,
+    so plotting a node only takes a view of a column. The fail times of all
+    of the nodes are held in one array, with the times for node i in
+    fail_times[fail_offsets[i]:fail_offsets[i + 1]].
+    """
+
+    def __init__(self, time_count, node_count):
+        self.f = np.zeros((time_count, node_count), dtype=np.float32)
+        self.dy = np.zeros((max(time_count - 1, 0), node_count), dtype=np.float32)
+        self.dy2 = np.zeros((max(time_count - 2, 0), node_count), dtype=np.float32)
+        self.failed = np.zeros(node_count, dtype=bool)
+        self.fail_times = np.empty(0, dtype=np.float64)
+        self.fail_offsets = np.zeros(node_count + 1, dtype=np.int64)
+        # Only set by the spectral check
+        self.hf_ratio = None
+        self.window_hf_ratio = None
+
+    def __len__(self):
+        return self.f.shape[1]
+
+    def setSeries(self, start, smoothed, dy, dy2, window_hf_ratio=None):
+        """Store the series for a chunk of nodes.
+
+        Args:
+            start(int): index of the first node in the chunk.
+            smoothed, dy, dy2(ndarray): 2D arrays with a row for each node.
+            window_hf_ratio=None(ndarray): nodes x windows high frequency energy
+                ratios from the spectral check.
+        """
+        stop = start + smoothed.shape[0]
+        self.f[:, start:stop] = smoothed.T
+        self.dy[:, start:stop] = dy.T
+        self.dy2[:, start:stop] = dy2.T
+        if window_hf_ratio is not None:
+            if self.window_hf_ratio is None:
+                self.window_hf_ratio = np.zeros((window_hf_ratio.shape[1], len(self)), dtype=np.float32)
+            self.window_hf_ratio[:, start:stop] = window_hf_ratio.T
+
+    def setChecks(self, node_derivs):
+        """Store the status and fail times of every node.
+
+        Args:
+            node_derivs(list): the dicts returned by checkStability or
+                checkSpectralStability, one for each node.
+        """
+        self.failed = np.array([d['status'] == 'Failed' for d in node_derivs], dtype=bool)
+        self.fail_offsets[1:] = np.cumsum([len(d['fail_times']) for d in node_derivs])
+        self.fail_times = np.array(
+            [t for d in node_derivs for t in d['fail_times']], dtype=np.float64
+        )
+        if node_derivs and 'hf_ratio' in node_derivs[0]:
+            self.hf_ratio = np.array([d['hf_ratio'] for d in node_derivs], dtype=np.float32)
+
+    def failedNodes(self):
+        """Get the indices of the nodes that failed."""
+        return np.flatnonzero(self.failed)
+
+    def failTimes(self, node_index):
+        return self.fail_times[self.fail_offsets[node_index]:self.fail_offsets[node_index + 1]]
+
+    def node(self, node_index):
+        """Get the results for a node in the same format as checkStability.
+
+        The series are views of the arrays, so nothing is copied.
+
+        Return:
+            dict - containing 'f', 'dy', 'dy2', 'status' and 'fail_times', and
+                'hf_ratio' and 'window_hf_ratio' for the spectral check.
+        """
+        node = {
+            'f': self.f[:, node_index], 'dy': self.dy[:, node_index],
+            'dy2': self.dy2[:, node_index],
+            'status': 'Failed' if self.failed[node_index] else 'Passed',
+            'fail_times': self.failTimes(node_index),
+        }
+        if self.hf_ratio is not None:
+            node['hf_ratio'] = float(self.hf_ratio[node_index])
+        if self.window_hf_ratio is not None:
+            node['window_hf_ratio'] = self.window_hf_ratio[:, node_index]
+        return node
+
+
 def convertResults(results_path):
     """Call TabularCSV to convert binary results to CSV.
     
@@ -121,28 +277,529 @@ def convertResults(results_path):
     timestep = zzn.meta['dt']
     nodes = zzn.meta['labels']
     
-    flows = zzn.to_dataframe(variable='Flow', include_time=True)
-    levels = zzn.to_dataframe(variable='Stage', include_time=True)
-    times = list(flows.index)
+    # Copy the flow and stage out of the (memory mapped) results, time x node
+    flows = np.array(zzn.get_results('Flow'))
+    levels = np.array(zzn.get_results('Stage'))
+    times = zzn.get_times()
+    zzn.close()
     results = StabilityResults(flows, levels, nodes, times, save_interval, timestep)
     
     return results 
 
 
-def loadGeometry(node_name, dat):
-    data = None
-    try:
-        unit = dat.sections[node_name]
-        if unit.unit == 'RIVER':
-            data = unit.active_data
-    except KeyError:
-        return None
+def stabilityWindows(times):
+    """Get the number of timesteps in the smoothing and derivative check windows.
+
+    Args:
+        times(list): output times (hours).
+
+    Return:
+        tuple(int, int) - the index of the first time at least SMOOTH_TIME_WINDOW
+            after the start (or -1 if there isn't one) and the index of the
+            first time at least CHECK_TIME_WINDOW after the start (or the
+            number of times if there isn't one, so nothing is checked).
+    """
+    elapsed = np.asarray(times, dtype=np.float64)
+    elapsed = elapsed - elapsed[0]
+    smooth = np.flatnonzero(elapsed >= SMOOTH_TIME_WINDOW)
+    check = np.flatnonzero(elapsed >= CHECK_TIME_WINDOW)
+    return (
+        int(smooth[0]) if len(smooth) > 0 else -1,
+        int(check[0]) if len(check) > 0 else len(elapsed),
+    )
+
+
+def movingAverage(data, window):
+    """Smooth each row of a 2D array with a trailing moving average.
+
+    Each value is replaced with the mean of the window values before it (not
+    including itself), or all of the values before it if there are fewer than
+    that. The first value is unchanged.
+
+    Uses the difference of a cumulative sum, so the cost doesn't depend on the
+    window size. The first value of each row is taken off before summing to
+    keep the rounding error down when the values are large (e.g. stage in mAOD).
+
+    Args:
+        data(ndarray): 2D float array, one row per node.
+        window(int): number of values to average. If less than 1 all of the
+            previous values are used.
+
+    Return:
+        ndarray - the smoothed array, the same shape as data.
+    """
+    length = data.shape[1]
+    if window < 1:
+        window = length
+    offset = data[:, :1]
+    sums = np.zeros((data.shape[0], length + 1))
+    np.cumsum(data - offset, axis=1, out=sums[:, 1:])
+    ends = np.arange(1, length)
+    starts = np.maximum(ends - window, 0)
+    smoothed = np.empty_like(data, dtype=np.float64)
+    smoothed[:, 0] = data[:, 0]
+    smoothed[:, 1:] = (sums[:, ends] - sums[:, starts]) / (ends - starts) + offset
+    return smoothed
+
+
+def _slidingExtreme(data, window, ufunc, fill):
+    """Sliding window max or min along the rows of a 2D array (van Herk/Gil-Werman).
+
+    The rows are split into blocks the size of the window. Every window covers
+    the end of one block and the start of the next, so its extreme is the
+    extreme of a running suffix and a running prefix, whatever the window size.
+    """
+    rows, length = data.shape
+    count = length - window + 1
+    if count < 1:
+        return np.empty((rows, 0))
+    blocks = -(-length // window)
+    padded = np.full((rows, blocks * window), fill)
+    padded[:, :length] = data
+    padded = padded.reshape(rows, blocks, window)
+    prefix = ufunc.accumulate(padded, axis=2).reshape(rows, -1)
+    suffix = ufunc.accumulate(padded[:, :, ::-1], axis=2)[:, :, ::-1].reshape(rows, -1)
+    return ufunc(suffix[:, :count], prefix[:, window - 1:window - 1 + count])
+
+
+def slidingMax(data, window):
+    """Get the max of every window of values along the rows of a 2D array.
+
+    Return:
+        ndarray - shape (rows, columns - window + 1), where [:, k] is the
+            max of data[:, k:k + window].
+    """
+    return _slidingExtreme(data, window, np.maximum, -np.inf)
+
+
+def slidingMin(data, window):
+    """Get the min of every window of values along the rows of a 2D array (see slidingMax)."""
+    return _slidingExtreme(data, window, np.minimum, np.inf)
+
+
+def checkStability(data, times, save_interval, series_type, progress_callback=None,
+                   chunk_size=STABILITY_CHUNK_SIZE, keep_series=True, derivs_out=None):
+    """Stability analysis of node time series.
+
+    Analyse the time series to check whether there appear to be any unstable
+    sections in the simulation results. This works quite well for identifying
+    sections of a series with serious instability. If the tolerances are
+    lowered to identify less significant stability issues, it tends to cause
+    a lot of false positives.
+
+    This is a multi-step process:
+        1. Smooth the time series a bit. The results usually have a lot of
+           small variations - increasing/decreasing over individual timesteps -
+           that shouldn't be considered an instability. The series is smoothed
+           by averaging the values over the SMOOTH_TIME_WINDOW (see
+           movingAverage).
+        2. Take the first and second order derivatives of the smoothed time
+           series with respect to time and find the max and min values over
+           the CHECK_TIME_WINDOW before each time.
+        3. Check whether the dy2 range > dy range * STABILITY_TOL, and dy2 goes
+           outside of +/- DY2_MIN_TOL to avoid some of the remaining signal noise.
+
+    All of the nodes (in chunks of chunk_size) are processed together as a 2D
+    array, with the window max/min found by slidingMax/slidingMin.
+
+    Args:
+        data(ndarray): 2D array of the results, one row per node and one column
+            per time.
+        times(list): output times (hours).
+        save_interval(float): time between the outputs.
+        series_type(str): 'Flow' or 'Stage'.
+        progress_callback=None(func): called with the number of nodes checked
+            after each chunk.
+        chunk_size=STABILITY_CHUNK_SIZE(int): number of nodes checked at once.
+        keep_series=True(bool): if False the smoothed series and derivatives
+            aren't kept, so only one chunk of them is in memory at a time.
+        derivs_out=None(StabilityDerivatives): if given, the smoothed series,
+            derivatives and check results are stored in it and the series
+            aren't added to the node dicts.
+
+    Return:
+        tuple(list, list) - for each node a dict containing the smoothed series
+            ('f'), derivatives ('dy', 'dy2'), 'status' ('Passed' or 'Failed')
+            and 'fail_times' (the times, rounded to 3 decimal places, at
+            the end of each failing window). And [node index, ...] for the
+            nodes that failed.
+    """
+    times_array = np.asarray(times, dtype=np.float64)
+    smooth_length, check_length = stabilityWindows(times)
+    dy2_tol = DY2_MIN_TOL['Flow'] if series_type == 'Flow' else DY2_MIN_TOL['Stage']
+
+    derivs = []
+    failed = []
+    node_count = data.shape[0]
+    for start in range(0, node_count, chunk_size):
+        block = np.ascontiguousarray(data[start:start + chunk_size], dtype=np.float64)
+        smoothed = movingAverage(block, smooth_length)
+        dy = np.diff(smoothed, n=1, axis=1) / save_interval
+        dy2 = np.diff(smoothed, n=2, axis=1) / save_interval
+
+        # The window for time j covers [j - check_length, j) and is only
+        # checked for j > check_length. Window k starts at j - check_length
+        checks = dy2.shape[1] - 1 - check_length
+        if checks > 0 and check_length > 0:
+            window = slice(1, checks + 1)
+            max_dy2 = slidingMax(dy2, check_length)[:, window]
+            min_dy2 = slidingMin(dy2, check_length)[:, window]
+            max_dy = slidingMax(dy, check_length)[:, window]
+            min_dy = slidingMin(dy, check_length)[:, window]
+            fail = (
+                ((max_dy2 > dy2_tol) | (min_dy2 < -dy2_tol)) &
+                (np.abs(max_dy2 - min_dy2) > np.abs(max_dy - min_dy) * STABILITY_TOL)
+            )
+        else:
+            fail = np.zeros((block.shape[0], 0), dtype=bool)
+        if derivs_out is not None:
+            derivs_out.setSeries(start, smoothed, dy, dy2)
+
+        for i in range(block.shape[0]):
+            fail_index = np.flatnonzero(fail[i]) + 1 + check_length
+            status = 'Failed' if len(fail_index) > 0 else 'Passed'
+            if status == 'Failed':
+                failed.append(start + i)
+            node_derivs = {
+                'status': status,
+                'fail_times': [round(t, 3) for t in times_array[fail_index].tolist()],
+            }
+            if keep_series and derivs_out is None:
+                node_derivs.update({'dy2': dy2[i], 'f': smoothed[i], 'dy': dy[i]})
+            derivs.append(node_derivs)
+        if progress_callback is not None:
+            progress_callback(min(start + chunk_size, node_count))
+
+    if derivs_out is not None:
+        derivs_out.setChecks(derivs)
+    return derivs, failed
+
+
+def spectralWindows(length, times):
+    """Get the length and start indices of the windows used by the spectral check.
+
+    Windows are CHECK_TIME_WINDOW long (but at least SPECTRAL_MIN_WINDOW values)
+    and overlap, with the last one always finishing at the end of the series.
+
+    Args:
+        length(int): number of values in each series.
+        times(list): output times (hours).
+
+    Return:
+        tuple(int, ndarray) - the window length and start indices. There are no
+            windows if the series are shorter than SPECTRAL_MIN_WINDOW.
+    """
+    if length < SPECTRAL_MIN_WINDOW:
+        return 0, np.empty(0, dtype=int)
+    window = min(max(stabilityWindows(times)[1], SPECTRAL_MIN_WINDOW), length)
+    hop = max(window // SPECTRAL_WINDOW_OVERLAP, 1)
+    starts = np.arange(0, length - window + 1, hop)
+    if starts[-1] != length - window:
+        starts = np.append(starts, length - window)
+    return window, starts
+
+
+def highFrequencyEnergy(segments):
+    """Get the high frequency and total energy of each window of a set of series.
+
+    Each window has its linear trend removed (so the rise and fall of a
+    hydrograph doesn't count) and a Hann taper applied, before a real FFT
+    of all of the windows in one call.
+
+    Args:
+        segments(ndarray): 3D array of nodes x windows x values.
+
+    Return:
+        tuple(ndarray, ndarray) - nodes x windows arrays of the energy at
+            frequencies of at least SPECTRAL_HIGH_FREQUENCY and the energy
+            at all frequencies apart from zero. Scaled so that
+            energy / (window length * sum(taper ** 2)) is the mean square of
+            the values in that part of the spectrum.
+    """
+    window = segments.shape[-1]
+    taper = np.hanning(window)
+    position = np.arange(window) - (window - 1) / 2.0
+    trend = np.stack([np.full(window, 1.0 / window), position / (position @ position)], axis=1)
+    mean_slope = segments @ trend
+
+    # The FFT is linear, so rather than removing the trend from every window
+    # the spectra of the (tapered) mean and slope are taken off afterwards
+    trend_spectra = np.fft.rfft(np.stack([taper, position * taper]), axis=-1)
+    spectrum = np.fft.rfft(segments * taper, axis=-1)
+    spectrum -= mean_slope @ trend_spectra
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    # Every frequency apart from zero (and the Nyquist frequency for an even
+    # window) appears twice in the full spectrum
+    weights = np.full(power.shape[-1], 2.0)
+    weights[0] = 0.0
+    if window % 2 == 0:
+        weights[-1] = 1.0
+    power *= weights
+
+    first_high = np.searchsorted(np.fft.rfftfreq(window), SPECTRAL_HIGH_FREQUENCY)
+    return power[..., first_high:].sum(axis=-1), power.sum(axis=-1)
+
+
+def checkSpectralStability(data, times, save_interval, series_type, progress_callback=None,
+                           chunk_size=SPECTRAL_CHUNK_SIZE, keep_series=True, derivs_out=None):
+    """Spectral stability analysis of node time series.
+
+    Looks for oscillations in the results rather than sudden changes in the
+    derivatives (see checkStability). Each series is split into overlapping
+    windows (see spectralWindows) and the share of the energy in each window
+    at high frequencies is found with an FFT (see highFrequencyEnergy).
+
+    A window fails if more than SPECTRAL_RATIO_TOL of its energy is high
+    frequency and the RMS amplitude of the high frequency part is more than
+    SPECTRAL_MIN_AMPLITUDE. Instabilities in FMP results are usually values
+    flipping up and down between output intervals, which puts nearly all of
+    the energy at the highest frequencies, while a smooth hydrograph has
+    almost none there.
 
+    All of the windows for a chunk of nodes are transformed together.
+
+    Args:
+        data(ndarray): 2D array of the results, one row per node and one column
+            per time.
+        times(list): output times (hours).
+        save_interval(float): time between the outputs.
+        series_type(str): 'Flow' or 'Stage'.
+        progress_callback=None(func): called with the number of nodes checked
+            after each chunk.
+        chunk_size=SPECTRAL_CHUNK_SIZE(int): number of nodes checked at once.
+        keep_series=True(bool): if False the smoothed series, derivatives and
+            window ratios aren't kept (see checkStability).
+        derivs_out=None(StabilityDerivatives): if given, the series, window
+            ratios and check results are stored in it (see checkStability).
+
+    Return:
+        tuple(list, list) - for each node a dict in the same format as
+            checkStability, with the smoothed series and derivatives for
+            plotting, 'fail_times' at the end of each failing window, and the
+            high frequency energy ratio of each window ('window_hf_ratio') and
+            of the whole series ('hf_ratio'). And [node index, ...] for the
+            nodes that failed.
+    """
+    times_array = np.asarray(times, dtype=np.float64)
+    smooth_length = stabilityWindows(times)[0]
+    window, starts = spectralWindows(data.shape[1], times)
+    end_times = np.round(times_array[starts + window - 1], 3) if window > 0 else times_array[:0]
+    min_amplitude = SPECTRAL_MIN_AMPLITUDE['Flow'] if series_type == 'Flow' else SPECTRAL_MIN_AMPLITUDE['Stage']
+    min_energy = min_amplitude ** 2 * window * np.sum(np.hanning(window) ** 2)
+
+    derivs = []
+    failed = []
+    node_count = data.shape[0]
+    for start in range(0, node_count, chunk_size):
+        block = np.ascontiguousarray(data[start:start + chunk_size], dtype=np.float64)
+        if keep_series or derivs_out is not None:
+            smoothed = movingAverage(block, smooth_length)
+            dy = np.diff(smoothed, n=1, axis=1) / save_interval
+            dy2 = np.diff(smoothed, n=2, axis=1) / save_interval
+
+        if window > 0:
+            segments = np.lib.stride_tricks.sliding_window_view(block, window, axis=1)[:, starts]
+            high, total = highFrequencyEnergy(segments)
+        else:
+            high = total = np.zeros((block.shape[0], 0))
+        ratio = np.divide(high, total, out=np.zeros_like(high), where=total > 0)
+        node_high = high.sum(axis=1)
+        node_total = total.sum(axis=1)
+        node_ratio = np.divide(node_high, node_total, out=np.zeros_like(node_high), where=node_total > 0)
+        fail = (ratio > SPECTRAL_RATIO_TOL) & (high > min_energy)
+        if derivs_out is not None:
+            derivs_out.setSeries(start, smoothed, dy, dy2, window_hf_ratio=ratio)
+
+        for i in range(block.shape[0]):
+            fail_index = np.flatnonzero(fail[i])
+            status = 'Failed' if len(fail_index) > 0 else 'Passed'
+            if status == 'Failed':
+                failed.append(start + i)
+            node_derivs = {
+                'status': status, 'fail_times': end_times[fail_index].tolist(),
+                'hf_ratio': float(node_ratio[i]),
+            }
+            if keep_series and derivs_out is None:
+                node_derivs.update({
+                    'dy2': dy2[i], 'f': smoothed[i], 'dy': dy[i], 'window_hf_ratio': ratio[i],
+                })
+            derivs.append(node_derivs)
+        if progress_callback is not None:
+            progress_callback(min(start + chunk_size, node_count))
+
+    if derivs_out is not None:
+        derivs_out.setChecks(derivs)
+    return derivs, failed
+
+
+def zznRunName(zzn_path):
+    return os.path.splitext(os.path.split(zzn_path)[1])[0]
+
+
+def findZznFiles(root_folder, status_callback=None):
+    """Find the FMP unsteady results (.zzn files with a .zzl) under a folder.
+
+    Uses the shared resultsindex, so folders that have already been searched
+    by one of the other tools aren't read again.
+
+    Args:
+        root_folder(str): the folder to search.
+        status_callback=None(func): called with status messages while searching.
+
+    Return:
+        list - .zzn file paths in folder walk order.
+    """
+    paths = ri.findArtefacts(root_folder, ['zzn', 'zzl'], status_callback)
+    zzl_stems = set(
+        os.path.normcase(os.path.splitext(p)[0]) for p in paths if ri.artefactKind(p) == 'zzl'
+    )
+    return [
+        p for p in paths
+        if ri.artefactKind(p) == 'zzn' and os.path.normcase(os.path.splitext(p)[0]) in zzl_stems
+    ]
+
+
+def screeningSummary(zzn_path, error=''):
+    """Get an empty screenRun summary for a run.
+
+    Args:
+        zzn_path(str): path to the .zzn file.
+        error=''(str): the error message if the run couldn't be checked.
+
+    Return:
+        dict - the summary (see screenRun).
+    """
+    return {
+        'path': zzn_path, 'name': zznRunName(zzn_path), 'nodes': 0, 'failed_nodes': [],
+        'fail_count': 0, 'first_fail': None, 'last_fail': None, 'error': error,
+    }
+
+
+def screenRun(zzn_path, series_type, method=DERIVATIVE_METHOD):
+    """Load a set of FMP results and run the stability check on every node.
+
+    Used by screenRuns in worker processes. Only the one series type is read
+    from the results and the smoothed series and derivatives aren't kept, so
+    only the summary of the failed nodes is sent back.
+
+    Args:
+        zzn_path(str): path to the .zzn file (the .zzl must be next to it).
+        series_type(str): 'Flow' or 'Stage'.
+        method=DERIVATIVE_METHOD(str): DERIVATIVE_METHOD or SPECTRAL_METHOD.
+
+    Return:
+        dict - containing:
+            'path', 'name': the file path and run name.
+            'nodes': the number of nodes in the results.
+            'failed_nodes': [node name, number of failing windows, first fail
+                time, last fail time] for each failed node, most failing
+                windows first.
+            'fail_count': the total number of failing windows.
+            'first_fail', 'last_fail': the first and last fail time (h) of
+                any node, or None if none failed.
+            'error': the error message if the results couldn't be checked.
+    """
+    summary = screeningSummary(zzn_path)
+    zzn = None
     try:
-        x = data['X'].to_numpy()
-        y = data['Y'].to_numpy()
-    except TypeError:
-        return None
-    
-    return (x, y)
-    
+        zzn = ZZN(gt.longPathCheck(zzn_path))
+        nodes = zzn.meta['labels']
+        # Read the series in file order, then check it one node per row
+        data = np.array(zzn.get_results(series_type)).T
+        times = zzn.get_times().tolist()
+        if method == SPECTRAL_METHOD:
+            check = checkSpectralStability
+        else:
+            check = checkStability
+        derivs, failed = check(data, times, zzn.meta['save_int'], series_type, keep_series=False)
+    except Exception as err:
+        summary['error'] = str(err)
+        return summary
+    finally:
+        if zzn is not None:
+            zzn.close()
+
+    failed_nodes = []
+    for i in failed:
+        fail_times = derivs[i]['fail_times']
+        failed_nodes.append([nodes[i], len(fail_times), fail_times[0], fail_times[-1]])
+    failed_nodes.sort(key=lambda f: (-f[1], f[2]))
+    summary.update({
+        'nodes': len(nodes),
+        'failed_nodes': failed_nodes,
+        'fail_count': sum(f[1] for f in failed_nodes),
+        'first_fail': min(f[2] for f in failed_nodes) if failed_nodes else None,
+        'last_fail': max(f[3] for f in failed_nodes) if failed_nodes else None,
+    })
+    return summary
+
+
+def screenRuns(zzn_files, series_type, method=DERIVATIVE_METHOD, max_workers=None,
+               progress_callback=None):
+    """Run the stability check on a set of FMP results, ranked by failed nodes.
+
+    Each run is loaded and checked by screenRun in a process pool, so every
+    CPU is used and each worker only has the results of the run it's
+    checking in memory. If the process pool can't be started the runs are
+    checked here instead. If it breaks part way through, usually because a
+    worker ran out of memory, the runs that weren't checked are returned as
+    errors rather than loading them here.
+
+    The runs are ranked with the most failed nodes first, then by the total
+    number of failing windows.
+
+    Args:
+        zzn_files(list): .zzn file paths.
+        series_type(str): 'Flow' or 'Stage'.
+        method=DERIVATIVE_METHOD(str): DERIVATIVE_METHOD or SPECTRAL_METHOD.
+        max_workers=None(int): number of processes. Defaults to the number
+            of CPUs.
+        progress_callback=None(func): called with the number of runs checked
+            after each one.
+
+    Return:
+        tuple(list, list) - the ranked screenRun summaries of the checked runs
+            and the summaries of the runs that couldn't be checked.
+    """
+    results = []
+    errors = []
+    # Runs can be very different sizes, so hand them out one at a time
+    screened = gt.mapInProcesses(
+        screenRun, zzn_files, series_type, method, max_workers=max_workers, chunksize=1,
+        on_broken=lambda zzn: screeningSummary(
+            zzn, 'Not checked, a worker process stopped unexpectedly (it may have run out of memory)'
+        )
+    )
+    for done, summary in enumerate(screened, 1):
+        if summary['error']:
+            errors.append(summary)
+        else:
+            results.append(summary)
+        if progress_callback is not None:
+            progress_callback(done)
+    results.sort(key=lambda r: (-len(r['failed_nodes']), -r['fail_count'], r['name']))
+    return results, errors
+
+
+def exportScreeningSummary(summaries, csv_path):
+    """Write the batch screening results to a csv file.
+
+    There's a row for each failed node of each run, in the ranked order of
+    the runs. Runs where no nodes failed have a single row with no node.
+
+    Args:
+        summaries(list): ranked screenRun summaries (see screenRuns).
+        csv_path(str): the file to write.
+    """
+    with open(gt.longPathCheck(csv_path), 'w', newline='') as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow([
+            'Rank', 'Run Name', 'Failed Nodes', 'Total Nodes', 'Node', 'Failing Windows',
+            'First Fail (h)', 'Last Fail (h)', 'Full Path',
+        ])
+        for rank, r in enumerate(summaries, 1):
+            run = [rank, r['name'], len(r['failed_nodes']), r['nodes']]
+            if not r['failed_nodes']:
+                writer.writerow(run + ['', 0, '', '', r['path']])
+            for node, fail_count, first_fail, last_fail in r['failed_nodes']:
+                writer.writerow(run + [node, fail_count, first_fail, last_fail, r['path']])
@@ -1,5 +1,9 @@
 
 import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 
 def longPathCheck(the_path, update_path_if_long=True, return_islong=False):
@@ -28,4 +32,105 @@ def longPathCheck(the_path, update_path_if_long=True, return_islong=False):
         return new_path, is_over_256
     else:
         return new_path
-        
\ No newline at end of file
+        
+
+def userCacheDir(*subfolders):
+    """Get the ModCheck folder in the user cache directory.
+    
+    Uses LOCALAPPDATA on Windows and XDG_CACHE_HOME (or ~/.cache) elsewhere.
+    The folder is created if it doesn't already exist.
+
+    Args:
+        *subfolders(str): optional sub-folder names to append to the cache folder.
+
+    Return:
+        str - path to the cache folder.
+    """
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+    else:
+        base = os.environ.get(
+            'XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')
+        )
+    cache_dir = os.path.join(base, 'mod_check', *subfolders)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def processPool(max_workers=None):
+    """Get a ProcessPoolExecutor that can be used from inside QGIS.
+
+    Worker processes are always started with 'spawn' so they behave the same
+    on every platform. Inside QGIS sys.executable is the QGIS application
+    rather than Python, so the workers are pointed at the Python executable
+    that QGIS uses instead.
+
+    Args:
+        max_workers=None(int): number of worker processes. Defaults to the
+            number of CPUs.
+
+    Return:
+        ProcessPoolExecutor - the pool (use it in a with statement).
+    """
+    context = multiprocessing.get_context('spawn')
+    if not os.path.basename(sys.executable).lower().startswith('python'):
+        if os.name == 'nt':
+            python_exe = os.path.join(sys.exec_prefix, 'pythonw.exe')
+        else:
+            python_exe = os.path.join(sys.exec_prefix, 'bin', 'python3')
+        if os.path.exists(python_exe):
+            context.set_executable(python_exe)
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+def mapInProcesses(func, items, *args, max_workers=None, chunksize=None, on_broken=None):
+    """Call func on each item in a process pool, generating the results in order.
+
+    Uses processPool. If the pool can't be started the items are done in this
+    process instead. A single item is always done here, as starting the pool
+    would take longer.
+
+    If the pool breaks part way through (e.g. a worker was killed because it
+    ran out of memory) the rest of the items are done in this process, unless
+    on_broken is given. Then on_broken(item) is used as the result of each of
+    them instead, so that whatever broke the pool can't take this process
+    down with it.
+
+    Args:
+        func(func): module level function (so it can be sent to the workers),
+            called as func(item, *args).
+        items(list): the items to call func on.
+        *args: extra arguments for func, the same for every item.
+        max_workers=None(int): number of worker processes. Defaults to the
+            number of CPUs.
+        chunksize=None(int): number of items sent to a worker at a time.
+            Defaults to a quarter of each worker's share, up to 20.
+        on_broken=None(func): called with each item that wasn't done if the
+            pool breaks, to get its result.
+
+    Return:
+        generator - of the func results, in the same order as items.
+    """
+    items = list(items)
+    if len(items) > 1:
+        done = 0
+        try:
+            with processPool(max_workers) as pool:
+                if chunksize is None:
+                    workers = max_workers or os.cpu_count() or 1
+                    chunksize = max(1, min(20, len(items) // (workers * 4)))
+                arg_lists = [[arg] * len(items) for arg in args]
+                for result in pool.map(func, items, *arg_lists, chunksize=chunksize):
+                    done += 1
+                    yield result
+            return
+        except BrokenProcessPool:
+            items = items[done:]
+            if on_broken is not None:
+                for item in items:
+                    yield on_broken(item)
+                return
+        except (OSError, RuntimeError):
+            items = items[done:]
+    for item in items:
+        yield func(item, *args)
@@ -0,0 +1,148 @@
+'''
+@summary: Concurrent loading and caching of the file references in FM IEF files.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from floodmodeller_api import IEF
+from floodmodeller_api.util import FloodModellerAPIError
+
+
+# Maximum number of IEF files read at the same time
+DEFAULT_MAX_WORKERS = 8
+
+
+# The parts of an IEF used by the model file audit. The values are as they
+# are written in the IEF (so usually relative to the IEF folder) or '' / {}
+# if they aren't set. error is set, and everything else is empty, if the IEF
+# could not be read
+IefSummary = namedtuple('IefSummary', [
+    'filepath', 'datafile', 'results', 'event_data', 'two_d_file', 'initial_conditions',
+    'error'
+])
+
+
+def summariseIef(ief_path):
+    """Read an IEF and keep the file references from it.
+
+    Args:
+        ief_path(str): path to the IEF file.
+
+    Return:
+        IefSummary - the IEF file references.
+    """
+    try:
+        ief = IEF(ief_path)
+    except (FloodModellerAPIError, OSError) as err:
+        return IefSummary(str(ief_path), '', '', {}, '', '', str(err))
+
+    return IefSummary(
+        str(ief_path),
+        getattr(ief, 'Datafile', '') or '',
+        getattr(ief, 'Results', '') or '',
+        dict(getattr(ief, 'EventData', {}) or {}),
+        getattr(ief, '2DFile', '') or '',
+        getattr(ief, 'InitialConditions', '') or '',
+        '',
+    )
+
+
+class IefCache():
+    """Thread safe store of IefSummary's, keyed on the IEF path, modified time and size.
+
+    If an IEF is edited its modified time or size changes, so it will be read
+    again rather than using the stored summary.
+    """
+
+    def __init__(self):
+        self._summaries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cacheKey(ief_path):
+        """Get the key for an IEF, or None if it can't be found."""
+        try:
+            stat = os.stat(ief_path)
+        except OSError:
+            return None
+        return (os.path.normcase(os.path.abspath(ief_path)), stat.st_mtime, stat.st_size)
+
+    def get(self, key):
+        with self._lock:
+            return self._summaries.get(key)
+
+    def add(self, key, summary):
+        with self._lock:
+            self._summaries[key] = summary
+
+    def clear(self):
+        with self._lock:
+            self._summaries = {}
+
+
+# Shared by everything in the plugin so that IEFs read by the audit aren't
+# read again when the results are displayed
+ief_cache = IefCache()
+
+
+def loadIefSummaries(ief_paths, max_workers=DEFAULT_MAX_WORKERS, cache=None):
+    """Get the IefSummary for a set of IEF files.
+
+    Summaries are taken from the cache where the IEF hasn't changed. The rest
+    are read in a thread pool, which mostly helps when the IEFs are on a
+    network share, and added to the cache.
+
+    Args:
+        ief_paths(list): paths of the IEF files.
+        max_workers=DEFAULT_MAX_WORKERS(int): maximum number of IEFs read at once.
+        cache=None(IefCache): the cache to use. Defaults to the shared ief_cache.
+
+    Return:
+        list - of IefSummary in the same order as ief_paths.
+    """
+    if cache is None:
+        cache = ief_cache
+
+    summaries = [None] * len(ief_paths)
+    to_load = []
+    for i, ief_path in enumerate(ief_paths):
+        key = cache.cacheKey(ief_path)
+        summary = cache.get(key) if key is not None else None
+        if summary is not None:
+            summaries[i] = summary
+        else:
+            to_load.append((i, ief_path, key))
+
+    if to_load:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            loaded = pool.map(summariseIef, [ief_path for _, ief_path, _ in to_load])
+            for (i, _, key), summary in zip(to_load, loaded):
+                summaries[i] = summary
+                if key is not None and not summary.error:
+                    cache.add(key, summary)
+    return summaries
+
+
+def datafileNames(summaries):
+    """Get the (lower case) names of the .dat files used by a set of IEFs.
+
+    Args:
+        summaries(list): IefSummary's.
+
+    Return:
+        set - lower case .dat file names.
+    """
+    names = set()
+    for summary in summaries:
+        if summary.datafile:
+            names.add(os.path.basename(summary.datafile.replace('\\', '/')).lower())
+    return names
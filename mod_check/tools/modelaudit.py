@@ -0,0 +1,870 @@
+'''
+@summary: Search model files and check all files exist.
+
+Contains everything needed to audit a model without Qt or QGIS. The Qt 
+version used by the dialog is filecheck.FileChecker.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 23rd March 2021
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+
+Credit to Matthew Shallcross who wrote the majority of this functionality.
+'''
+
+import os
+import time
+import sqlite3
+import zipfile
+from pathlib import Path
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
+
+from . import globaltools as gt
+from . import modelscanner as ms
+from . import resultsindex as ri
+from . import fileclassifier as fcl
+from . import auditindex as ai
+from . import auditresults as ar
+from . import referencecheck as rc
+from . import filetree as ft
+from . import iefcache
+from . import duplicates as dup
+
+
+# Maximum number of workspace (QGIS project) files read at the same time
+DEFAULT_WORKSPACE_WORKERS = 8
+
+
+class StatCache():
+    """Shared record of whether paths exist, so each path is only checked once.
+
+    Safe to share between threads. Two threads may occasionally check the same
+    path at once, but both will get the same answer.
+    """
+    
+    def __init__(self):
+        self._exists = {}
+        
+    def exists(self, path):
+        key = os.path.normcase(os.path.normpath(path))
+        try:
+            return self._exists[key]
+        except KeyError:
+            result = os.path.exists(path)
+            self._exists[key] = result
+            return result
+
+
+class WorkspaceFile():
+    
+    def __init__(self, path, workspace_folder='', stat_cache=None):
+        self.rawpath = path
+        self.path = Path(self.datasourcePath(path, workspace_folder))
+        self.missing = 'Yes'
+        self.exists = False
+        if stat_cache is not None:
+            self.exists = stat_cache.exists(str(self.path))
+        
+    @staticmethod
+    def datasourcePath(datasource, workspace_folder):
+        """Get the file path from a QGIS layer datasource.
+
+        Removes any provider options (e.g. 'file.gpkg|layername=name') and 
+        resolves relative paths against the workspace folder.
+        """
+        path = datasource.split('|', 1)[0].strip()
+        if os.sep == '/':
+            path = path.replace('\\', '/')
+        if workspace_folder and path and not os.path.isabs(path):
+            path = os.path.normpath(os.path.join(workspace_folder, path))
+        return path
+
+    @property
+    def fullpath(self):
+        return self.path.absolute()
+
+    @property
+    def name(self):
+        return self.path.name
+
+    @property
+    def extension(self):
+        return self.path.suffix
+
+
+def iterDatasources(infile):
+    """Get the map layer datasources from a QGIS project file.
+
+    Uses lxml.iterparse so only a small part of the project is in memory at 
+    any time. Each element is cleared once it has been read, and removed from
+    its parent, so large projects (lots of layouts, styles, etc) don't build a 
+    full tree.
+
+    Args:
+        infile(file): binary file object containing the .qgs xml.
+
+    Return:
+        generator - of datasource str's from projectlayers/maplayer/datasource.
+    """
+    for _, elem in etree.iterparse(infile, events=('end',), huge_tree=True):
+        if elem.tag == 'datasource' and elem.text:
+            parent = elem.getparent()
+            grandparent = parent.getparent() if parent is not None else None
+            if (parent is not None and parent.tag == 'maplayer' and 
+                    grandparent is not None and grandparent.tag == 'projectlayers'):
+                yield elem.text
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+class Workspace():
+    
+    def __init__(self, workspace, stat_cache=None):
+        self.workspace = workspace
+        self.stat_cache = stat_cache
+        
+    def readWorkspaceFile(self):
+        """Read the layer datasources from a .qgs or .qgz project.
+
+        .qgz files are read straight from the project file in the zip archive,
+        without extracting it.
+
+        Return:
+            list - of WorkspaceFile.
+        """
+        wpath = self.workspace.filepath
+        wfolder = os.path.dirname(wpath)
+        
+        if self.workspace.fileExt == 'qgz':
+            with zipfile.ZipFile(wpath) as archive:
+                qgs_names = [n for n in archive.namelist() if n.lower().endswith('.qgs')]
+                if not qgs_names:
+                    return []
+                with archive.open(qgs_names[0]) as infile:
+                    datasources = list(iterDatasources(infile))
+        else:
+            with open(wpath, 'rb') as infile:
+                datasources = list(iterDatasources(infile))
+
+        return [WorkspaceFile(d, wfolder, self.stat_cache) for d in datasources]
+        
+
+def loadWorkspaceFiles(workspaces, max_workers=DEFAULT_WORKSPACE_WORKERS):
+    """Read the layer datasources from all of the workspaces concurrently.
+
+    Workspaces that can't be read (not found, bad xml or a bad .qgz archive)
+    are returned with no files.
+
+    Args:
+        workspaces(list): SomeFile's for the .qgs/.qgz workspaces.
+        max_workers=DEFAULT_WORKSPACE_WORKERS(int): maximum projects read at once.
+
+    Return:
+        dict - {workspace name: [WorkspaceFile]}, in the same order as workspaces.
+    """
+    stat_cache = StatCache()
+
+    def readWorkspace(workspace):
+        try:
+            return Workspace(workspace, stat_cache).readWorkspaceFile()
+        except (OSError, etree.XMLSyntaxError, zipfile.BadZipFile):
+            return []
+
+    workspace_files = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for workspace, files in zip(workspaces, pool.map(readWorkspace, workspaces)):
+            workspace_files[workspace.name] = files
+    return workspace_files
+
+
+class IefSubfile():
+    
+    def __init__(self, path, key=''):
+        self.rawpath = path
+        self.key = key
+        self.path = Path(path)
+        self.missing = 'Yes'
+        
+    @property
+    def fullpath(self):
+        return self.path.absolute()
+
+    @property
+    def name(self):
+        return self.path.name
+
+    @property
+    def extension(self):
+        return self.path.suffix
+
+class IefFile():
+    
+    def __init__(self, ief):
+        # iefcache.IefSummary for the IEF
+        self.ief = ief
+        self._files = []
+        
+    @property
+    def filepath(self):
+        return self.ief.filepath
+    
+    @property
+    def files(self):
+        if not self._files:
+            self._files = self.findFiles()
+        return self._files
+    
+    def findFiles(self):
+        all_files = []
+        if self.ief.datafile:
+            all_files.append(IefSubfile(self.ief.datafile, 'Datafile'))
+        if self.ief.results:
+            all_files.append(IefSubfile(self.ief.results + '.zzn', 'Results'))
+        all_files.extend([IefSubfile(i, 'EventData') for i in self.ief.event_data.values()])
+        if self.ief.two_d_file:
+            all_files.append(IefSubfile(self.ief.two_d_file, '2DFile'))
+        if self.ief.initial_conditions:
+            all_files.append(IefSubfile(self.ief.initial_conditions, 'InitialConditions'))
+        
+        return all_files
+    
+    
+
+def loadIefFiles(fm_files):
+    """Load the IEF files in fm_files.
+
+    IEFs already read by the audit are taken from the shared iefcache.
+    """
+    ief_paths = [fm.filepath for fm in fm_files if fm.fileExt == 'ief']
+    iefs = {}
+    for summary in iefcache.loadIefSummaries(ief_paths):
+        iefs[Path(summary.filepath).name] = IefFile(summary)
+    
+    return iefs
+    
+
+
+class ModelAuditor():
+    """Search, categorise and check all of the files under a model root.
+
+    Doesn't use Qt, so it can be run outside of QGIS (see batchaudit). Status
+    messages are passed to status_callback, if given.
+    """
+    
+    def __init__(self, status_callback=None):
+        self.status_callback = status_callback
+        self.file_index = None
+
+    def updateStatus(self, status):
+        if self.status_callback is not None:
+            self.status_callback(status)
+        
+    def auditModelFiles(self, model_root, full_rescan=False, find_duplicates=True):
+        """Search and categorise all of the files under model_root.
+
+        Folder listings are saved to an index in the user cache folder. Folders
+        that haven't changed since the last audit are loaded from there rather
+        than being read again, unless full_rescan is True.
+
+        Args:
+            model_root(str): the model root folder to audit.
+            full_rescan=False(bool): if True ignore the index and read every folder.
+            find_duplicates=True(bool): if False skip the duplicate file search,
+                leaving the 'duplicate' category empty.
+
+        Return:
+            tuple(list, dict, ResultHolder) - the loaded IEFs, the categorised
+                files and the results of checking the file references. The 
+                categorised files include a 'duplicate' category containing
+                all files that have a copy somewhere else under model_root.
+        """
+        self.updateStatus('Auditing model files ...')
+
+        self.updateStatus('Searching folders ...')
+        iefs, (
+            tuflow_model_files, fm_model_files, gis_files, log_files, result_files, csv_files, 
+            workspace_files, other_files, ignore_files, file_tree
+        ) = self.categorise(model_root, full_rescan)
+        search_results = {
+            'tuflow_model': tuflow_model_files, 'fm_model': fm_model_files, 'gis': gis_files, 
+            'log': log_files, 'csv': csv_files, 'result': result_files, 
+            'workspace': workspace_files, 'other': other_files, 'ignore': ignore_files, 
+            'tree': file_tree
+        }
+
+        duplicate_groups = []
+        if find_duplicates:
+            self.updateStatus('Searching for duplicate files ...')
+            duplicate_groups = self.findDuplicates(
+                model_root,
+                [f for key, files in search_results.items() if key != 'tree' for f in files]
+            )
+        search_results[fcl.DUPLICATE] = [f for group in duplicate_groups for f in group]
+
+        self.updateStatus('Categorising results ...')
+        result_holder = ResultHolder()
+        result_holder.model_root = model_root
+        result_holder.ignored_files = ignore_files
+        result_holder.file_tree = file_tree
+        result_holder.duplicates = duplicate_groups
+        result_holder.summary = {
+            'model_files': len(tuflow_model_files) + len(fm_model_files),
+            'other_files': (
+                len(gis_files) + len(log_files) + len(result_files) + len(csv_files) + 
+                len(workspace_files) + len(other_files)
+            ),
+            'ignored_files': len(ignore_files),
+        }
+
+        self.updateStatus('Checking paths ...')
+        error_count = self.checkReferences(tuflow_model_files, iefs, result_holder)
+
+        result_holder.processResults()
+        self.updateStatus('Check complete ({0} missing references)'.format(error_count))
+        return iefs, search_results, result_holder
+
+    def saveResults(self, iefs, search_results, result_holder, store_path=None):
+        """Save the audit results to an AuditResultStore.
+
+        The store is set as result_holder.store and used for filtering and
+        exporting the results. If it can't be written to the user cache an
+        in memory store is used, so everything still works but the audit
+        can't be opened again later.
+
+        Args:
+            iefs(list): iefcache.IefSummary's returned by auditModelFiles.
+            search_results(dict): categorised files returned by auditModelFiles.
+            result_holder(ResultHolder): results returned by auditModelFiles.
+            store_path=None(str): the store file. Defaults to the one in the
+                user cache for the model root.
+
+        Return:
+            auditresults.AuditResultStore - the store containing the results.
+        """
+        self.updateStatus('Saving audit results ...')
+        if store_path is None:
+            store_path = ar.defaultResultsPath(result_holder.model_root)
+        store = None
+        try:
+            store = ar.AuditResultStore(store_path)
+            store.saveAudit(iefs, search_results, result_holder)
+        except (OSError, sqlite3.Error):
+            if store is not None:
+                store.close()
+            store = ar.AuditResultStore(':memory:')
+            store.saveAudit(iefs, search_results, result_holder)
+        result_holder.store = store
+        return store
+
+    def loadResults(self, model_root, store_path=None):
+        """Load the results of the last audit of model_root without scanning it.
+
+        Args:
+            model_root(str): the model root folder.
+            store_path=None(str): the store file. Defaults to the one in the
+                user cache for the model root.
+
+        Return:
+            tuple(list, ResultHolder) - the IefSummary's and results saved by
+                saveResults, or None if there are no saved results.
+        """
+        if store_path is None:
+            store_path = ar.defaultResultsPath(model_root)
+        if not os.path.exists(store_path):
+            return None
+
+        store = None
+        try:
+            store = ar.AuditResultStore(store_path)
+            if not store.hasResults():
+                store.close()
+                return None
+            meta = store.loadMeta()
+            result_holder = ResultHolder()
+            result_holder.model_root = meta['model_root']
+            result_holder.summary = meta['summary']
+            result_holder.results = meta['results']
+            result_holder.seen_parents = meta['seen_parents']
+            result_holder.failed_parents = meta['failed_parents']
+            result_holder.file_tree = store.loadFileTree()
+            result_holder.store = store
+            iefs = store.loadIefs()
+        except sqlite3.Error:
+            if store is not None:
+                store.close()
+            return None
+        self.updateStatus('Loaded audit results saved on {0}'.format(
+            time.strftime('%d/%m/%Y %H:%M', time.localtime(meta['saved']))
+        ))
+        return iefs, result_holder
+
+    def checkReferences(self, tuflow_model_files, iefs, result_holder):
+        """Check that the files referenced by the TCF's and IEF's exist.
+
+        References are checked against the files found by categorise (in
+        self.file_index) rather than on disk. Any that are missing are added
+        to the result_holder, along with the location of any files with the
+        same name found elsewhere under the model root.
+
+        Args:
+            tuflow_model_files(list): SomeFile's for the TUFLOW model files.
+            iefs(list): iefcache.IefSummary's for the IEF's.
+            result_holder(ResultHolder): to store the results in.
+
+        Return:
+            int - the number of missing references.
+        """
+        checker = rc.ReferenceChecker(self.file_index, result_holder)
+        error_count = 0
+        for f in tuflow_model_files:
+            if f.fileExt != 'tcf': continue
+            self.updateStatus('Checking paths for file: {0}'.format(f.filepath))
+            try:
+                references = rc.tcfReferences(f.filepath)
+            # tmf can fail in a lot of different ways on a broken model
+            except Exception as err:
+                result_holder.failed_parents.append([f.filepath, str(err)])
+                continue
+            for parent, parent_refs in references.items():
+                error_count += checker.checkReferences(parent, parent_refs)
+
+        for ief in iefs:
+            ief_file = IefFile(ief)
+            self.updateStatus('Checking paths for file: {0}'.format(ief_file.filepath))
+            error_count += checker.checkReferences(
+                str(ief_file.filepath), rc.iefReferences(ief_file)
+            )
+        return error_count
+
+    def scanModelRoot(self, model_root, full_rescan=False):
+        """Scan the model root folders, using the audit index where possible.
+
+        The index is only a speed up, so if it can't be read or written the
+        folders are scanned in full as normal.
+
+        Return:
+            list - of modelscanner.ScannedFolder in walk order.
+        """
+        # Another tool may have already read the same folders
+        if not full_rescan:
+            folders = ri.currentFolders(model_root)
+            if folders is not None:
+                self.updateStatus('Using the folder contents already loaded ...')
+                return folders
+
+        index = None
+        cached_folders = None
+        try:
+            index = ai.AuditIndex(ai.defaultIndexPath(model_root))
+            if full_rescan:
+                index.clear()
+            else:
+                self.updateStatus('Loading audit index ...')
+                cached_folders = index.loadFolders()
+        except (OSError, sqlite3.Error):
+            if index is not None:
+                index.close()
+            index = None
+
+        scanner = ms.ModelScanner(
+            status_callback=self.status_callback, cached_folders=cached_folders
+        )
+        folders = scanner.scan(model_root)
+
+        if index is not None:
+            try:
+                self.updateStatus('Updating audit index ...')
+                index.updateFolders(folders)
+            except sqlite3.Error:
+                pass
+            finally:
+                index.close()
+        ri.updateSharedIndex(model_root, folders)
+        return folders
+
+    def findDuplicates(self, model_root, files):
+        """Find the files with identical contents, reusing hashes from the audit index.
+
+        Files with the same size and modified time as when they were last
+        hashed aren't read again. These are read with os.stat rather than
+        taken from the folder scan, which may be out of date (see
+        auditindex.AuditIndex). A full rescan clears the stored hashes.
+
+        Args:
+            model_root(str): the audited model root.
+            files(list): SomeFile's found under model_root.
+
+        Return:
+            list - of lists of SomeFile's with the same contents (see
+                duplicates.findDuplicates).
+        """
+        index = None
+        hash_cache = {}
+        try:
+            index = ai.AuditIndex(ai.defaultIndexPath(model_root))
+            hash_cache = index.loadHashes()
+        except (OSError, sqlite3.Error):
+            if index is not None:
+                index.close()
+            index = None
+
+        duplicate_groups = dup.findDuplicates(
+            files, status_callback=self.status_callback, hash_cache=hash_cache
+        )
+
+        if index is not None:
+            # Drop the hashes of files that are no longer there
+            found = set(f.filepath for f in files)
+            try:
+                index.updateHashes({
+                    key: value for key, value in hash_cache.items() if key[1] in found
+                })
+            except sqlite3.Error:
+                pass
+            finally:
+                index.close()
+        return duplicate_groups
+
+    def categorise(self, model_root, full_rescan=False):
+        '''
+            Method for categorising the model passed to the audit tool
+            Return: tuple contain list of ModelFile and list of SomeFile instances
+        '''
+        categories = {category: [] for category, _ in fcl.CATEGORY_ORDER}
+        categories[fcl.OTHER] = []
+        file_tree = ft.FileTree(model_root)
+        # Name and path lookups used to check the model file references
+        self.file_index = rc.FileIndex(model_root)
+        # Scan the model folder structure and categorise ignore, model and other (eg GIS, csv) files
+        folders = self.scanModelRoot(model_root, full_rescan)
+        parent_nodes = {}
+        for folder_count, folder in enumerate(folders):
+            root = folder.path
+            if folder_count > 0:
+                tree_node = file_tree.addFolder(parent_nodes.pop(root), os.path.basename(root))
+            else:
+                tree_node = file_tree.ROOT
+            for name in folder.folders:
+                parent_nodes[os.path.join(root, name)] = tree_node
+            
+            for f in folder.files:
+                filepath = os.path.join(root, f.name)
+                file_tree.addFile(tree_node, f.name)
+                self.file_index.add(root, f.name)
+                filepath = gt.longPathCheck(filepath)
+                
+                # File category is looked up from the extension (with some extra
+                # checks for GIS files) in the shared classifier
+                query = SomeFile(filepath, size=f.size, mtime=f.mtime, category=f.category)
+                categories[query.category].append(query)
+        
+        tuflow_model_files = categories[fcl.TUFLOW_MODEL]
+        fm_model_files = categories[fcl.FM_MODEL]
+        gis_files = categories[fcl.GIS]
+        log_files = categories[fcl.LOG]
+        result_files = categories[fcl.RESULT]
+        workspace_files = categories[fcl.WORKSPACE]
+        csv_files = categories[fcl.CSV]
+        other_files = categories[fcl.OTHER]
+        ignore_files = categories[fcl.IGNORE]
+
+        # Load IEFs and remove any FM .dat files for the results files (based on being in an IEF)
+        iefs, fm_model_files, result_files = self.findFmFiles(fm_model_files, result_files)
+        
+        return iefs, (
+            tuflow_model_files, fm_model_files, gis_files, log_files, result_files, csv_files, 
+            workspace_files, other_files, ignore_files, file_tree
+        )
+    
+
+    def findFmFiles(self, fm_files, result_files):
+        """Load the IEFs and move any .dat files they use from results to FM files.
+
+        .dat is used for both FM model files and TUFLOW results, so the .dat 
+        files referenced by an IEF are treated as FM model files.
+
+        Return:
+            tuple(list, list, list) - iefcache.IefSummary's, FM model files, 
+                result files.
+        """
+        new_result_files = []
+        
+        ief_paths = [f.filepath for f in fm_files if f.fileExt == 'ief']
+        self.updateStatus('Loading {0} IEF files ...'.format(len(ief_paths)))
+        iefs = iefcache.loadIefSummaries(ief_paths)
+        dat_names = iefcache.datafileNames(iefs)
+                
+        for r in result_files:
+            if not r.name.lower() in dat_names: 
+                new_result_files.append(r)
+            else:
+                fm_files.append(r)
+
+        return iefs, fm_files, new_result_files
+
+
+class ResultHolder():    
+    """
+    """
+    
+    def __init__(self):
+        self.model_root = ''
+        self.parent = ''
+        self.seen_parents = []
+        self.failed_parents = []
+        self.missing = {}
+        self.ignored_files = []
+        self.file_tree = None
+        self.duplicates = []
+        # auditresults.AuditResultStore, if the results have been saved
+        self.store = None
+#         self.found = {}
+
+        self._summary = {'model_files': 0, 'other_files': 0, 'ignored_files': 0, 'total_files': 0}
+        self.results = {'missing': [], 'found': [], 'found_ief': []}
+        self.results_meta = {'summary': None, 'ignored': None, 'checked': None}
+
+    @property
+    def summary(self):
+        return self._summary
+
+    @summary.setter
+    def summary(self, summary):
+        self._summary = summary
+        self._summary['total_files'] = self.getFileTotal()
+        
+    def saveFileTree(self, save_path, include_files=True):
+        """Write the text version of the file tree.
+
+        Lines are written as they are generated from the FileTree, rather than
+        building the whole text first.
+        """
+        with open(save_path, 'w', newline='\n') as outfile:
+            outfile.writelines(self.file_tree.iterLines(include_files=include_files))
+    
+    def addMissing(self, path, line, found=''):
+        if path in self.missing:
+            if not self.parent in self.missing[path]['parent']:
+                self.missing[path]['parent'].append(self.parent)
+                self.missing[path]['line'].append(line)
+        else:
+            self.missing[path] = {'parent': [self.parent], 'line': [line], 'found': found}
+    
+    def setFound(self, path, found):
+        try:
+            self.missing[path]['found'] = found
+        except KeyError:
+            raise 
+        
+    def summaryText(self):
+        return 'Model Files: {0:<10}\nOther Files: {1:<10}\nIgnored Files: {2:<10}\nTotal Files: {3:<10}'.format(
+            self._summary['model_files'], self._summary['other_files'], 
+            self._summary['ignored_files'], self._summary['total_files']
+        )
+        
+    def getFileTotal(self):
+        return self._summary['model_files'] + self._summary['other_files'] + self._summary['ignored_files']
+
+    def processResults(self):
+        self.results = {'missing': [], 'found': [], 'found_ief': []}
+        self.results_meta['summary'] = self.summary
+        self.results_meta['ignored'] = self.ignored_files
+        self.results_meta['checked'] = self.seen_parents
+
+        for f, details in self.missing.items():
+            info = {'file': [], 'parents': []}
+            psplit = os.path.split(f)
+            filename = psplit[1] if len(psplit) > 1 else f
+            all_ief = True
+            for i, parent in enumerate(details['parent']):
+                if not parent[-3:] == 'ief':
+                    all_ief = False
+                info['parents'].append([parent, details['line'][i]])
+
+            if details['found']:
+                info['file'] = [filename, details['found'], f]
+                if all_ief:
+                    self.results['found_ief'].append(info)
+                else:
+                    self.results['found'].append(info)
+            else:
+                info['file'] = [filename, f]
+                self.results['missing'].append(info)
+                
+    def storedFiles(self, categories):
+        """Get SomeFile's for the files in categories from the store.
+
+        Args:
+            categories(list): the file categories to include.
+
+        Return:
+            list - of SomeFile, ordered by folder and name.
+        """
+        return [
+            SomeFile(os.path.join(directory, name), size, mtime, category)
+            for category, _, directory, name, size, mtime in self.store.files(categories=categories)
+        ]
+
+    def ignoredPaths(self):
+        if self.store is not None:
+            return [
+                os.path.join(f[2], f[3]) for f in self.store.files(categories=[fcl.IGNORE])
+            ]
+        return [i.filepath for i in self.ignored_files]
+
+    def duplicateGroups(self):
+        """Get the duplicate files as a list of (size, [file paths])."""
+        if self.store is not None:
+            return self.store.duplicateGroups()
+        return [(group[0].size, [f.filepath for f in group]) for group in self.duplicates]
+
+    def exportResults(self, save_path):
+        """
+        """
+        ignored_paths = self.ignoredPaths()
+        duplicates = self.duplicateGroups()
+        with open(save_path, 'w', newline='\n') as outfile:
+            outfile.write('\n###########################')
+            outfile.write('\n# FILE SEARCH SUMMARY')
+            outfile.write('\n###########################\n\n')
+            outfile.write('Root folder: {0}\n'.format(self.model_root))
+            outfile.write(self.summaryText())
+
+            outfile.write('\n\nFILES THAT WERE IGNORED\n')
+            if ignored_paths:
+                outfile.write('\n'.join(ignored_paths))
+            else:
+                outfile.write('\nNo files were ignored')
+
+            outfile.write('\n\nMISSING FILES\n')
+            if self.results['missing']:
+                outfile.write('\n'.join(m['file'][0] for m in self.results['missing']))
+            else:
+                outfile.write('\nNo missing files')
+
+            outfile.write('\n\nFOUND FILES (Incorrect paths)\n')
+            if self.results['found'] or self.results['found_ief']:
+                outfile.write('\n'.join(f['file'][0] for f in self.results['found']))
+                outfile.write('\n'.join(f['file'][0] for f in self.results['found_ief']))
+            else:
+                outfile.write('\nNo misreferenced files')
+                
+            outfile.write('\n\nMODEL FILES CHECKED\n')
+            outfile.write('\n'.join([p for p in self.seen_parents]))
+
+            if self.failed_parents:
+                outfile.write('\n\nMODEL FILES THAT COULD NOT BE READ\n')
+                outfile.write('\n'.join(['{0}\t {1}'.format(p[0], p[1]) for p in self.failed_parents]))
+
+            outfile.write('\n\nDUPLICATE FILES\n')
+            if duplicates:
+                for size, paths in duplicates:
+                    outfile.write('\n{0:<20}{1} bytes, {2} copies'.format(
+                        'Size:', size, len(paths)
+                    ))
+                    outfile.write('\n' + '\n'.join(paths))
+                    outfile.write('\n')
+            else:
+                outfile.write('\nNo duplicate files')
+            
+            outfile.write('\n\n\n###########################')
+            outfile.write('\n# DETAILED RESULTS')
+            outfile.write('\n###########################\n')
+
+            outfile.write('\n\nMISSING FILES\n')
+            if self.results['missing']:
+                for m in self.results['missing']:
+                    outfile.write('\n{0:<20}{1}'.format('File:', m['file'][0]))
+                    outfile.write('\n{0:<20}{1}'.format('Path:', m['file'][1]))
+                    outfile.write('\nReferenced by parent files:\n')
+                    outfile.write('\n'.join(['({0})\t {1}'.format(p[1], p[0]) for p in m['parents']]))
+                    outfile.write('\n')
+            else:
+                outfile.write('\nNo missing files')
+
+            outfile.write('\n\n\nFOUND FILES (Incorrect paths)\n')
+            if self.results['found'] or self.results['found_ief']:
+                for f in self.results['found']:
+                    outfile.write('\n{0:<20}{1}'.format('File:', f['file'][0]))
+                    outfile.write('\n{0:<20}{1}'.format('Original Path:', f['file'][2]))
+                    outfile.write('\n{0:<20}{1}'.format('Found Path:', f['file'][1]))
+                    outfile.write('\nReferenced by parent files:\n')
+                    outfile.write('\n'.join(['({0})\t {1}'.format(p[1], p[0]) for p in f['parents']]))
+                    outfile.write('\n')
+                for f in self.results['found_ief']:
+                    outfile.write('\n{0:<20}{1}'.format('File:', f['file'][0]))
+                    outfile.write('\n{0:<20}{1}'.format('Original Path:', f['file'][2]))
+                    outfile.write('\n{0:<20}{1}'.format('Found Path:', f['file'][1]))
+                    outfile.write('\nReferenced by parent files:\n')
+                    outfile.write('\n'.join(['({0})\t {1}'.format(p[1], p[0]) for p in f['parents']]))
+                    outfile.write('\n')
+            else:
+                outfile.write('\nNo misreferenced files')
+
+
+class SomeFile(object):
+    '''
+        Class for any file found in the model structure
+    '''
+    __slots__ = ('filepath', 'path', 'name', 'fileExt', 'category', 'size', 'mtime')
+
+    def __init__(self, filepath, size=None, mtime=None, category=None):
+        self.filepath = filepath
+        
+        # Size and modified time, if already known from the folder scan
+        self.size = size
+        self.mtime = mtime
+
+        # basepath and file name
+        self.path, self.name = os.path.split(filepath)
+        
+        # File extension (converted to lower case) and classification
+        if category is None:
+            self.fileExt, self.category = fcl.classifyFile(self.name)
+        else:
+            self.fileExt = self.name.rsplit('.', 1)[-1].lower()
+            self.category = category
+        
+    def __str__(self):
+        return f"[{self.fileExt.upper()}] {self.name}"
+
+    def getFilePath(self):
+        return self.filepath
+
+    def getPath(self):
+        return self.path
+
+    def getName(self):
+        return self.name
+
+    def getFileExt(self):
+        return self.fileExt
+
+    def isTuflowModelFile(self):
+        return self.category == fcl.TUFLOW_MODEL
+
+    def isFmModelFile(self):
+        return self.category == fcl.FM_MODEL
+
+    def isGisFile(self):
+        return self.category == fcl.GIS
+
+    def isLogFile(self):
+        return self.category == fcl.LOG
+
+    def isResultFile(self):
+        return self.category == fcl.RESULT
+
+    def isCsvFile(self):
+        return self.category == fcl.CSV
+
+    def isWorkspaceFile(self):
+        return self.category == fcl.WORKSPACE
+
+    def isIgnoreFile(self):
+        return self.category == fcl.IGNORE
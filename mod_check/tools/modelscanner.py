@@ -0,0 +1,182 @@
+'''
+@summary: Concurrent scanning of model folder structures.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+# Maximum number of folders being read at the same time. Model folders are
+# often on network shares where most of the time is spent waiting on the
+# server, so this is a lot higher than the number of cores
+DEFAULT_MAX_WORKERS = 16
+
+# Minimum number of seconds between status updates
+DEFAULT_STATUS_INTERVAL = 0.25
+
+
+# category is only set when the file details were loaded from an AuditIndex
+ScannedFile = namedtuple('ScannedFile', ['name', 'size', 'mtime', 'category'], defaults=[None])
+
+
+class ScannedFolder():
+    """Contents of a single folder found while scanning the model root."""
+
+    __slots__ = ('path', 'mtime', 'files', 'folders', 'cached')
+
+    def __init__(self, path, mtime=None, files=None, folders=None):
+        self.path = path
+        self.mtime = mtime
+        self.files = files if files is not None else []
+        self.folders = folders if folders is not None else []
+        # True if the contents were taken from a previous scan
+        self.cached = False
+
+
+def scanFolder(folder_path, cached=None):
+    """Read the contents of a single folder with os.scandir.
+
+    The file size and modified time are taken from the DirEntry stat data
+    rather than calling os.stat on every file again later. On Windows this
+    comes for free with the folder listing.
+
+    Folders that can't be read are returned empty, matching the way that
+    os.walk quietly skips them.
+
+    If the contents from a previous scan are given and the folder modified time
+    hasn't changed they are returned as they are without reading the folder.
+
+    Args:
+        folder_path(str): the folder to read.
+        cached=None(ScannedFolder): contents of the folder from a previous scan.
+
+    Return:
+        ScannedFolder - containing the files and sub-folder names, sorted by name.
+    """
+    folder = ScannedFolder(folder_path)
+    try:
+        folder.mtime = os.stat(folder_path).st_mtime
+        if cached is not None and cached.mtime == folder.mtime:
+            cached.cached = True
+            return cached
+
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    # Same as os.walk: don't follow folder symlinks
+                    if not entry.is_symlink():
+                        folder.folders.append(entry.name)
+                    continue
+
+                try:
+                    stat = entry.stat()
+                    folder.files.append(ScannedFile(entry.name, stat.st_size, stat.st_mtime))
+                except OSError:
+                    folder.files.append(ScannedFile(entry.name, None, None))
+    except OSError:
+        pass
+
+    folder.files.sort(key=lambda f: f.name)
+    folder.folders.sort()
+    return folder
+
+
+class ModelScanner():
+    """Walk a model folder structure, reading sibling folders concurrently.
+
+    Folders are read in a bounded thread pool as they are discovered and then
+    put back into the same top-down order that os.walk would produce, with
+    the files and folders at each level sorted by name so the output is the
+    same every time.
+
+    Status updates are rate limited so that very large folder structures don't
+    swamp the caller (usually a Qt signal) with one message per folder.
+
+    If cached_folders are given (see auditindex.AuditIndex) any folder that has
+    not been modified since is taken from there rather than being read again.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, status_callback=None,
+                 status_interval=DEFAULT_STATUS_INTERVAL, cached_folders=None):
+        self.max_workers = max_workers
+        self.status_callback = status_callback
+        self.status_interval = status_interval
+        self.cached_folders = cached_folders if cached_folders is not None else {}
+        self._last_status = 0
+
+    def _updateStatus(self, status, force=False):
+        if self.status_callback is None:
+            return
+        now = time.monotonic()
+        if force or now - self._last_status >= self.status_interval:
+            self._last_status = now
+            self.status_callback(status)
+
+    def scan(self, model_root):
+        """Scan all folders under model_root.
+
+        Args:
+            model_root(str): the top level folder to scan.
+
+        Return:
+            list - of ScannedFolder in walk order, starting with model_root.
+        """
+        folders = {}
+        file_count = 0
+        cached_count = 0
+        self._last_status = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(scanFolder, model_root, self.cached_folders.get(model_root))}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder = future.result()
+                    folders[folder.path] = folder
+                    file_count += len(folder.files)
+                    if folder.cached:
+                        cached_count += 1
+                    for name in folder.folders:
+                        path = os.path.join(folder.path, name)
+                        pending.add(pool.submit(scanFolder, path, self.cached_folders.get(path)))
+
+                    self._updateStatus('Searching folder {0} ... ({1} folders, {2} files)'.format(
+                        folder.path, len(folders), file_count
+                    ))
+
+        self._updateStatus('Found {0} files in {1} folders ({2} folders unchanged)'.format(
+            file_count, len(folders), cached_count
+        ), force=True)
+        return self.walkOrder(model_root, folders)
+
+    def walkOrder(self, model_root, folders):
+        """Put the scanned folders in top-down walk order.
+
+        Args:
+            model_root(str): the top level folder that was scanned.
+            folders(dict): {folder path: ScannedFolder}.
+
+        Return:
+            list - of ScannedFolder in walk order.
+        """
+        ordered = []
+        stack = [model_root]
+        while stack:
+            folder = folders[stack.pop()]
+            ordered.append(folder)
+            stack.extend(
+                os.path.join(folder.path, name) for name in reversed(folder.folders)
+            )
+        return ordered
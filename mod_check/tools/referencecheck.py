@@ -0,0 +1,293 @@
+'''
+@summary: Check the files referenced by model files against the scanned model tree.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import re
+import fnmatch
+from glob import glob
+from collections import namedtuple
+
+# tmf needs a newer version of Python than the audit, so it may not be
+# available when running outside of QGIS (see batchaudit). The TCF references
+# can't be checked without it, but everything else still works
+try:
+    from tmf.tuflow_model_files import TCF
+    from tmf.tuflow_model_files.inp.file import FileInput
+    from tmf.tuflow_model_files.inp.folder import FolderInput
+    TMF_IMPORT_ERROR = None
+except (ImportError, SyntaxError) as err:
+    TCF = None
+    TMF_IMPORT_ERROR = err
+
+
+# A referenced file can only be used if these files exist alongside it
+REQUIRED_COMPANIONS = {
+    'mif': ['mid'],
+    'mid': ['mif'],
+    'shp': ['dbf', 'shx'],
+}
+
+# TUFLOW variables (e.g. <<~s1~>>) and standard wildcards in a referenced path
+WILDCARD_RE = re.compile(r'<<.*?>>|[*?]')
+
+# GeoPackage references can be in the form 'database.gpkg >> layername'
+GPKG_LAYER_SEPARATOR = ' >> '
+
+
+# path: the referenced path, resolved against the folder of the parent file
+# path_as_read: the path as written in the parent file
+# line: the command (TUFLOW) or key (IEF) that the reference was read from
+ModelReference = namedtuple('ModelReference', ['path', 'path_as_read', 'line'])
+
+
+def normalisePath(path):
+    """Get the key used to compare paths.
+
+    Model files are often written on Windows, so backslashes are treated as
+    folder separators everywhere.
+
+    Args:
+        path(str): the path to normalise.
+
+    Return:
+        str - normalised and case normalised path.
+    """
+    if os.sep == '/':
+        path = path.replace('\\', '/')
+    return os.path.normcase(os.path.normpath(path))
+
+
+def resolvePath(path, parent_folder):
+    """Join a relative referenced path to the folder of the file it's in.
+
+    Args:
+        path(str): the path as read from the parent file.
+        parent_folder(str): folder containing the parent file.
+
+    Return:
+        str - the normalised absolute path.
+    """
+    if os.sep == '/':
+        path = path.replace('\\', '/')
+    if not os.path.isabs(path):
+        path = os.path.join(parent_folder, path)
+    return os.path.normpath(path)
+
+
+class FileIndex():
+    """Hash lookups for all of the files found while scanning the model root.
+
+    Built alongside the categorisation of the scanned files so that checking a
+    reference is a set lookup rather than a call to the file system, and
+    finding a file that has been moved is a dict lookup on the file name rather
+    than a search of every file.
+    """
+
+    def __init__(self, model_root):
+        self.model_root = normalisePath(model_root)
+        # Normalised file path
+        self.paths = set()
+        # Lower case file name -> [file paths]
+        self.names = {}
+        # Normalised folder path -> [file names]
+        self.folders = {}
+        # Results of checking files outside of the model root
+        self._outside_root = {}
+
+    def add(self, folder, name):
+        """Add a file found in the scan.
+
+        Args:
+            folder(str): the folder path the file was found in.
+            name(str): the file name.
+        """
+        filepath = os.path.join(folder, name)
+        self.paths.add(normalisePath(filepath))
+        self.names.setdefault(name.lower(), []).append(filepath)
+        self.folders.setdefault(normalisePath(folder), []).append(name)
+
+    def isInModelRoot(self, path_key):
+        return path_key == self.model_root or path_key.startswith(
+            os.path.join(self.model_root, '')
+        )
+
+    def exists(self, path):
+        """Check whether a file exists.
+
+        Files under the model root are checked against the scanned files.
+        Anything outside of the model root wasn't scanned, so is checked on
+        disk (once per path).
+
+        Args:
+            path(str): absolute path to check.
+
+        Return:
+            bool - True if the file exists.
+        """
+        key = normalisePath(path)
+        if self.isInModelRoot(key):
+            return key in self.paths
+        try:
+            return self._outside_root[key]
+        except KeyError:
+            exists = os.path.exists(path)
+            self._outside_root[key] = exists
+            return exists
+
+    def matches(self, pattern):
+        """Find the files matching a path containing wildcards or TUFLOW variables.
+
+        Variables are treated as '*'. If the folder part of the path doesn't
+        contain any wildcards only the file names in that folder are checked.
+
+        Args:
+            pattern(str): absolute path, possibly containing wildcards.
+
+        Return:
+            list - matching file paths.
+        """
+        pattern = WILDCARD_RE.sub('*', pattern)
+        folder, name = os.path.split(pattern)
+        if WILDCARD_RE.search(folder):
+            return glob(pattern)
+
+        key = normalisePath(folder)
+        if not self.isInModelRoot(key):
+            return glob(pattern)
+        name = name.lower()
+        return [
+            os.path.join(folder, n) for n in self.folders.get(key, [])
+            if fnmatch.fnmatchcase(n.lower(), name)
+        ]
+
+    def find(self, name):
+        """Find all files with the given name anywhere under the model root.
+
+        Args:
+            name(str): the file name (case insensitive).
+
+        Return:
+            list - file paths.
+        """
+        return self.names.get(name.lower(), [])
+
+
+def tcfReferences(tcf_path):
+    """Get all of the file references in a TCF and the control files it reads.
+
+    Output folders are not included.
+
+    Args:
+        tcf_path(str): path to the TCF.
+
+    Return:
+        dict - {parent control file path: [ModelReference]}.
+    """
+    if TCF is None:
+        raise ImportError('Unable to load tmf: {0}'.format(TMF_IMPORT_ERROR))
+    tcf = TCF(tcf_path)
+    references = {}
+    inputs = tcf.find_input(
+        callback=lambda i: isinstance(i, FileInput) and not isinstance(i, FolderInput)
+    )
+    for inp in inputs:
+        parent = str(inp.parent.fpath) if inp.parent is not None else tcf_path
+        parent_folder = os.path.dirname(parent)
+        values = inp.value
+        if not isinstance(values, list):
+            values = [values]
+        for value in values:
+            # Piped GIS inputs can include numbers as well as files
+            if isinstance(value, (int, float)):
+                continue
+            path_as_read = str(value).split(GPKG_LAYER_SEPARATOR, 1)[0].strip()
+            if not path_as_read:
+                continue
+            references.setdefault(parent, []).append(ModelReference(
+                resolvePath(path_as_read, parent_folder), path_as_read, str(inp)
+            ))
+    return references
+
+
+def iefReferences(ief_file):
+    """Get all of the file references in an IEF.
+
+    Args:
+        ief_file(filecheck.IefFile): the loaded IEF.
+
+    Return:
+        list - of ModelReference.
+    """
+    parent_folder = os.path.dirname(str(ief_file.filepath))
+    return [
+        ModelReference(resolvePath(f.rawpath, parent_folder), f.rawpath, f.key)
+        for f in ief_file.files if f.rawpath
+    ]
+
+
+class ReferenceChecker():
+    """Check model file references and record the results in a ResultHolder.
+
+    Each reference is checked against the FileIndex, so the check is a few hash
+    lookups per reference regardless of how many files are in the model.
+    """
+
+    def __init__(self, file_index, result_holder):
+        self.file_index = file_index
+        self.result_holder = result_holder
+        self._seen_parents = set(result_holder.seen_parents)
+
+    def referenceExists(self, path):
+        """Check that a referenced file (and any files it needs) exists.
+
+        Args:
+            path(str): absolute path of the referenced file.
+
+        Return:
+            bool - True if the file exists.
+        """
+        if WILDCARD_RE.search(path):
+            return len(self.file_index.matches(path)) > 0
+
+        if not self.file_index.exists(path):
+            return False
+        base, ext = os.path.splitext(path)
+        for companion in REQUIRED_COMPANIONS.get(ext[1:].lower(), []):
+            if not (self.file_index.exists(base + '.' + companion) or
+                    self.file_index.exists(base + '.' + companion.upper())):
+                return False
+        return True
+
+    def checkReferences(self, parent, references):
+        """Check all of the references made by a single model file.
+
+        Args:
+            parent(str): path of the model file containing the references.
+            references(list): ModelReference's read from the parent file.
+
+        Return:
+            int - the number of missing references.
+        """
+        if parent in self._seen_parents:
+            return 0
+        self._seen_parents.add(parent)
+        self.result_holder.parent = parent
+        self.result_holder.seen_parents.append(parent)
+
+        missing_count = 0
+        for ref in references:
+            if self.referenceExists(ref.path):
+                continue
+            missing_count += 1
+            self.result_holder.addMissing(ref.path_as_read, ref.line)
+            found = self.file_index.find(os.path.basename(ref.path))
+            if found:
+                self.result_holder.setFound(ref.path_as_read, '; '.join(found))
+        return missing_count
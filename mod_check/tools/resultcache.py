@@ -0,0 +1,161 @@
+'''
+@summary: Persistent cache of summaries of TUFLOW result files (MB, HPC, etc).
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import json
+import sqlite3
+
+import numpy as np
+
+from . import globaltools as gt
+
+
+# Increment if the stored summaries change so that old caches are rebuilt
+CACHE_VERSION = 1
+
+# Summary kinds
+MB_SUMMARY = 'mb'
+HPC_SUMMARY = 'hpc'
+
+
+def defaultCachePath():
+    """Get the summary cache file path in the user cache folder."""
+    return os.path.join(gt.userCacheDir('result_summaries'), 'summaries.sqlite')
+
+
+def cacheKey(path):
+    """Get the (normalised path, size, modified time) for a result file.
+
+    Return:
+        tuple - the key, or None if the file can't be found.
+    """
+    try:
+        stat = os.stat(gt.longPathCheck(path))
+    except OSError:
+        return None
+    return (os.path.normcase(os.path.abspath(path)), stat.st_size, stat.st_mtime)
+
+
+def packPreview(preview):
+    """Convert a {header: 1D array} preview to (headers, bytes) for storage."""
+    headers = list(preview.keys())
+    if not headers:
+        return headers, b''
+    return headers, np.vstack([np.asarray(preview[h], dtype=np.float64) for h in headers]).tobytes()
+
+
+def unpackPreview(headers, data):
+    """Convert the stored (headers, bytes) back to a {header: 1D array} preview."""
+    if not headers:
+        return {}
+    values = np.frombuffer(data, dtype=np.float64).reshape(len(headers), -1)
+    return {h: values[i] for i, h in enumerate(headers)}
+
+
+class ResultSummaryCache():
+    """SQLite store of result file summaries, keyed on the path, size and modified time.
+
+    Finished runs never change, so the summary statistics and a small preview
+    of the series for each result file are stored the first time the file is
+    read. After that the summary is taken from here unless the size or
+    modified time of the file has changed (e.g. the run is still going or
+    has been re-run).
+
+    Summaries are stored as JSON, so can only contain simple types. The preview
+    series are stored as float arrays.
+    """
+
+    def __init__(self, cache_path=None):
+        if cache_path is None:
+            cache_path = defaultCachePath()
+        self.cache_path = cache_path
+        self.conn = sqlite3.connect(cache_path)
+        self._createTables()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _createTables(self):
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        with self.conn:
+            if version != CACHE_VERSION:
+                self.conn.execute('DROP TABLE IF EXISTS summaries')
+                self.conn.execute('PRAGMA user_version = {0}'.format(CACHE_VERSION))
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS summaries (kind TEXT, path TEXT, size INTEGER, '
+                'mtime REAL, summary TEXT, preview_headers TEXT, preview BLOB, '
+                'PRIMARY KEY (kind, path))'
+            )
+
+    def close(self):
+        self.conn.close()
+
+    def getMany(self, kind, keys):
+        """Get the stored summaries for a set of files.
+
+        Args:
+            kind(str): the summary kind (e.g. MB_SUMMARY).
+            keys(list): cacheKey's for the files.
+
+        Return:
+            dict - {key: (summary dict, preview dict)} for the files that are
+                stored and haven't changed.
+        """
+        wanted = {k[0]: k for k in keys if k is not None}
+        found = {}
+        paths = list(wanted.keys())
+        # Keep under the SQLite parameter limit
+        for i in range(0, len(paths), 500):
+            batch = paths[i:i + 500]
+            rows = self.conn.execute(
+                'SELECT path, size, mtime, summary, preview_headers, preview FROM summaries '
+                'WHERE kind = ? AND path IN ({0})'.format(','.join('?' * len(batch))),
+                [kind] + batch
+            )
+            for path, size, mtime, summary, preview_headers, preview in rows:
+                key = wanted[path]
+                if key[1] != size or key[2] != mtime:
+                    continue
+                found[key] = (
+                    json.loads(summary), unpackPreview(json.loads(preview_headers), preview)
+                )
+        return found
+
+    def addMany(self, kind, entries):
+        """Store summaries, replacing any stored for the same files.
+
+        Args:
+            kind(str): the summary kind (e.g. MB_SUMMARY).
+            entries(list): of (key, summary dict, preview dict), where key is
+                the cacheKey taken before the file was read.
+        """
+        rows = []
+        for key, summary, preview in entries:
+            headers, data = packPreview(preview or {})
+            rows.append((
+                kind, key[0], key[1], key[2], json.dumps(summary), json.dumps(headers),
+                sqlite3.Binary(data)
+            ))
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO summaries (kind, path, size, mtime, summary, '
+                'preview_headers, preview) VALUES (?, ?, ?, ?, ?, ?, ?)', rows
+            )
+
+    def clear(self, kind=None):
+        """Remove everything (or everything of one kind) from the cache."""
+        with self.conn:
+            if kind is None:
+                self.conn.execute('DELETE FROM summaries')
+            else:
+                self.conn.execute('DELETE FROM summaries WHERE kind = ?', (kind,))
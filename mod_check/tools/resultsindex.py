@@ -0,0 +1,349 @@
+'''
+@summary: Shared index of the result files (MB, HPC, tsf, zzn, ief, etc) under a folder.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import os
+import re
+
+from . import modelscanner as ms
+
+
+# Result file kinds and the file name patterns that identify them.
+# Matching is case insensitive and the first matching pattern is used
+ARTEFACT_PATTERNS = [
+    # TUFLOW 1D section MB files (_1d_MB.csv) are formatted differently
+    ('mb', r'(?<!_1d)_MB\.csv$'),
+    ('mb1d', r'_MB1D\.csv$'),
+    ('mb2d', r'_MB2D\.csv$'),
+    ('hpc', r'hpc\.dt\.csv$'),
+    ('tsf', r'\.tsf$'),
+    ('tlf', r'\.tlf$'),
+    ('ief', r'\.ief$'),
+    ('zzn', r'\.zzn$'),
+    ('zzl', r'\.zzl$'),
+    ('zzd', r'\.zzd$'),
+]
+
+ARTEFACT_KINDS = [kind for kind, _ in ARTEFACT_PATTERNS]
+
+# All of the patterns in one expression, so each file name is only checked once
+ARTEFACT_REGEX = re.compile(
+    '|'.join('(?P<{0}>{1})'.format(kind, pattern) for kind, pattern in ARTEFACT_PATTERNS),
+    re.IGNORECASE
+)
+
+# TUFLOW MB file type (as used by TuflowStabilityCheck.findMbFiles) to kind
+MB_TYPE_KINDS = {'_MB': 'mb', '_MB1D': 'mb1d', '_MB2D': 'mb2d'}
+
+# Maximum number of folder indexes kept in memory
+MAX_SHARED_INDEXES = 8
+
+
+def artefactKind(name):
+    """Get the result file kind for a file name.
+
+    Return:
+        str - one of ARTEFACT_KINDS, or None if it isn't a result file.
+    """
+    match = ARTEFACT_REGEX.search(name)
+    return match.lastgroup if match else None
+
+
+def _indexKey(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+class ResultsIndex():
+    """The folder listings and result files found under a root folder.
+
+    The folders are read once with a ModelScanner and every file name is
+    matched against the ARTEFACT_PATTERNS, so all of the tools that look for
+    result files in the same folder structure can share the same scan.
+
+    When refreshed:
+        - If the index is watched (see resultswatcher) only the folders that
+          have been reported as changed are read again. If none have changed
+          there's no I/O at all.
+        - Otherwise the modified time of each folder is checked and only
+          folders that have changed are read again.
+
+    Callbacks in listeners are called with the index whenever the folders
+    change or the index is closed.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.key = _indexKey(root)
+        self.folders = {}
+        self.scanned = False
+        self.watched = False
+        self.closed = False
+        self.dirty = set()
+        self.listeners = []
+        self._matches = {}
+        self._order = []
+
+    def contains(self, path):
+        """Check whether a path is in (or is) the root folder."""
+        key = _indexKey(path)
+        return key == self.key or key.startswith(self.key.rstrip(os.sep) + os.sep)
+
+    def markDirty(self, folder_path):
+        """Record that the contents of a folder have changed."""
+        self.dirty.add(folder_path)
+
+    def close(self):
+        self.closed = True
+        self._notify()
+        self.listeners = []
+
+    def _notify(self):
+        for listener in list(self.listeners):
+            listener(self)
+
+    def refresh(self, status_callback=None):
+        """Bring the index up to date with the folders on disk.
+
+        Args:
+            status_callback=None(func): called with status messages while scanning.
+        """
+        if not self.scanned:
+            self.update(ms.ModelScanner(status_callback=status_callback).scan(self.root))
+        elif not self.watched:
+            self.update(ms.ModelScanner(
+                status_callback=status_callback, cached_folders=self.folders
+            ).scan(self.root))
+        elif self.dirty:
+            self._refreshDirty(status_callback)
+
+    def update(self, folders):
+        """Replace the contents of the index with the results of a scan.
+
+        Args:
+            folders(list): modelscanner.ScannedFolder's in walk order.
+        """
+        matches = {}
+        for folder in folders:
+            # Folders taken from the previous scan haven't changed
+            if folder.cached and folder.path in self._matches:
+                matches[folder.path] = self._matches[folder.path]
+            else:
+                matches[folder.path] = self._matchFolder(folder)
+        if folders:
+            self.root = folders[0].path
+        self.folders = {folder.path: folder for folder in folders}
+        self._matches = matches
+        self._order = [folder.path for folder in folders]
+        self.scanned = True
+        self.dirty.clear()
+        self._notify()
+
+    def _matchFolder(self, folder):
+        matches = []
+        for f in folder.files:
+            kind = artefactKind(f.name)
+            if kind is not None:
+                matches.append((kind, f.name))
+        return matches
+
+    def _removeFolder(self, folder_path):
+        """Remove a folder and everything below it."""
+        stack = [folder_path]
+        while stack:
+            folder = self.folders.pop(stack.pop(), None)
+            if folder is None: continue
+            self._matches.pop(folder.path, None)
+            stack.extend(os.path.join(folder.path, name) for name in folder.folders)
+
+    def _refreshDirty(self, status_callback=None):
+        """Read the changed folders again, and scan any new sub-folders."""
+        dirty = sorted(self.dirty, key=len)
+        self.dirty.clear()
+        for path in dirty:
+            old = self.folders.get(path)
+            if old is None: continue
+            folder = ms.scanFolder(path)
+            if folder.mtime is None:
+                # Deleted (or can't be read any more)
+                if path == self.root:
+                    self.folders = {}
+                    self._matches = {}
+                    self.scanned = False
+                    break
+                self._removeFolder(path)
+                continue
+            for name in set(old.folders) - set(folder.folders):
+                self._removeFolder(os.path.join(path, name))
+            self.folders[path] = folder
+            self._matches[path] = self._matchFolder(folder)
+            for name in set(folder.folders) - set(old.folders):
+                scanner = ms.ModelScanner(status_callback=status_callback)
+                for new_folder in scanner.scan(os.path.join(path, name)):
+                    self.folders[new_folder.path] = new_folder
+                    self._matches[new_folder.path] = self._matchFolder(new_folder)
+        self._order = self._walkOrder()
+        self._notify()
+
+    def _walkOrder(self):
+        ordered = []
+        stack = [self.root] if self.root in self.folders else []
+        while stack:
+            folder = self.folders[stack.pop()]
+            ordered.append(folder.path)
+            stack.extend(
+                p for p in (os.path.join(folder.path, name) for name in reversed(folder.folders))
+                if p in self.folders
+            )
+        return ordered
+
+    def walkFolders(self, folder_path=None):
+        """Get the indexed folders in walk order.
+
+        Args:
+            folder_path=None(str): only include this folder and the ones below it.
+
+        Return:
+            list - of modelscanner.ScannedFolder.
+        """
+        if folder_path is None:
+            return [self.folders[path] for path in self._order]
+        return [self.folders[path] for path in self._order if self._under(path, folder_path)]
+
+    def _under(self, path, folder_path):
+        key = _indexKey(path)
+        folder_key = _indexKey(folder_path).rstrip(os.sep)
+        return key == folder_key or key.startswith(folder_key + os.sep)
+
+    def files(self, kinds, folder_path=None):
+        """Get the result files of some kinds.
+
+        Args:
+            kinds(list): ARTEFACT_KINDS to include.
+            folder_path=None(str): only include files in this folder or below it.
+
+        Return:
+            list - file paths in walk order.
+        """
+        kinds = set(kinds)
+        paths = []
+        for path in self._order:
+            if folder_path is not None and not self._under(path, folder_path): continue
+            paths.extend(os.path.join(path, name) for kind, name in self._matches[path] if kind in kinds)
+        return paths
+
+
+# Indexes shared between the tools, most recently used last
+_shared_indexes = []
+
+# Called with each index when it's created, so it can be watched
+_index_watchers = []
+
+
+def addIndexWatcher(callback):
+    """Register a function to be called with every new shared index."""
+    if callback not in _index_watchers:
+        _index_watchers.append(callback)
+
+
+def removeIndexWatcher(callback):
+    if callback in _index_watchers:
+        _index_watchers.remove(callback)
+
+
+def sharedIndexes():
+    return list(_shared_indexes)
+
+
+def sharedIndex(root):
+    """Get the shared index for a folder, creating it if needed.
+
+    If the folder is inside another watched index that one is used, so
+    looking at a sub-folder of a folder that has already been indexed
+    doesn't mean reading it again. The index isn't refreshed here.
+
+    Args:
+        root(str): the folder.
+
+    Return:
+        ResultsIndex - the index containing root.
+    """
+    key = _indexKey(root)
+    found = None
+    for index in _shared_indexes:
+        if index.key == key:
+            found = index
+            break
+        if index.watched and index.scanned and index.contains(root):
+            found = index
+    if found is None:
+        return _addIndex(root)
+    _shared_indexes.remove(found)
+    _shared_indexes.append(found)
+    return found
+
+
+def _addIndex(root):
+    index = ResultsIndex(root)
+    _shared_indexes.append(index)
+    for watcher in list(_index_watchers):
+        watcher(index)
+    while len(_shared_indexes) > MAX_SHARED_INDEXES:
+        _shared_indexes.pop(0).close()
+    return index
+
+
+def findArtefacts(root, kinds, status_callback=None):
+    """Find all of the result files of some kinds under a folder.
+
+    Uses (and updates) the shared index of the folder, so the folders are only
+    read again if they have changed since the last time.
+
+    Args:
+        root(str): the folder to search.
+        kinds(list): ARTEFACT_KINDS to find.
+        status_callback=None(func): called with status messages while scanning.
+
+    Return:
+        list - file paths in walk order.
+    """
+    index = sharedIndex(root)
+    index.refresh(status_callback)
+    return index.files(kinds, root)
+
+
+def currentFolders(root):
+    """Get the folders under root from a shared index that's known to be up to date.
+
+    Only watched indexes with no changes since they were last refreshed are
+    used, anything else would have to be checked against the disk anyway.
+
+    Return:
+        list - modelscanner.ScannedFolder's in walk order, or None.
+    """
+    key = _indexKey(root)
+    for index in _shared_indexes:
+        if index.watched and index.scanned and not index.dirty and index.contains(root):
+            if index.key == key:
+                return index.walkFolders()
+            return index.walkFolders(root)
+    return None
+
+
+def updateSharedIndex(root, folders):
+    """Store the results of a scan of root (e.g. by the model audit) in its shared index.
+
+    Args:
+        root(str): the scanned folder.
+        folders(list): modelscanner.ScannedFolder's in walk order.
+    """
+    key = _indexKey(root)
+    index = next((i for i in _shared_indexes if i.key == key), None)
+    if index is None:
+        index = _addIndex(root)
+    index.update(folders)
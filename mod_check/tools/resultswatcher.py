@@ -0,0 +1,105 @@
+'''
+@summary: Watch the folders in the shared results indexes for changes.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+from PyQt5 import QtCore
+
+from . import resultsindex as ri
+
+
+# Maximum number of folders to watch. Each one uses an OS file handle (or
+# inotify watch), so very large folder structures are checked by folder
+# modified time instead
+MAX_WATCHED_FOLDERS = 5000
+
+
+class ResultsIndexWatcher(QtCore.QObject):
+    """Keep the shared results indexes up to date using a QFileSystemWatcher.
+
+    Every folder in each shared index is watched. When a folder changes it's
+    marked as dirty in the index, so that only the changed folders are read
+    the next time the index is used. An index is only flagged as watched if
+    all of its folders could be watched, otherwise it falls back to checking
+    the modified time of every folder.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.directoryChanged)
+        self.indexes = []
+        ri.addIndexWatcher(self.watch)
+        for index in ri.sharedIndexes():
+            self.watch(index)
+
+    def watch(self, index):
+        """Start watching an index. Its folders are watched once it's been scanned."""
+        if index in self.indexes:
+            return
+        self.indexes.append(index)
+        index.listeners.append(self.indexChanged)
+        self.indexChanged(index)
+
+    def indexChanged(self, index):
+        """Update the watched folders when the folders in an index change."""
+        watched = set(self.watcher.directories())
+        if index.closed:
+            self.indexes.remove(index)
+            in_use = set(path for i in self.indexes for path in i.folders)
+            self._removePaths([path for path in index.folders if path in watched and path not in in_use])
+            return
+        if not index.scanned:
+            index.watched = False
+            return
+
+        # Stop watching folders that have been removed from the index
+        in_use = set(path for i in self.indexes for path in i.folders)
+        self._removePaths([path for path in watched if path not in in_use])
+        watched &= in_use
+
+        new_paths = [path for path in index.folders if path not in watched]
+        if len(watched) + len(new_paths) > MAX_WATCHED_FOLDERS:
+            index.watched = False
+            return
+        failed = self.watcher.addPaths(new_paths) if new_paths else []
+        index.watched = not failed
+
+    def _removePaths(self, paths):
+        if paths:
+            self.watcher.removePaths(paths)
+
+    def directoryChanged(self, path):
+        for index in self.indexes:
+            if path in index.folders:
+                index.markDirty(path)
+
+    def stop(self):
+        ri.removeIndexWatcher(self.watch)
+        for index in self.indexes:
+            index.watched = False
+            if self.indexChanged in index.listeners:
+                index.listeners.remove(self.indexChanged)
+        self.indexes = []
+        paths = self.watcher.directories()
+        self._removePaths(paths)
+
+
+# The watcher shared by all of the dialogs
+_watcher = None
+
+
+def startWatching():
+    """Create the shared ResultsIndexWatcher if it doesn't exist yet.
+
+    Must be called from the main (GUI) thread.
+    """
+    global _watcher
+    if _watcher is None:
+        _watcher = ResultsIndexWatcher(QtCore.QCoreApplication.instance())
+    return _watcher
@@ -25,6 +25,7 @@ from floodmodeller_api import IEF
 from floodmodeller_api.ief_flags import flags
 
 from . import toolinterface as ti
+from . import resultsindex as ri
 
 
 def exportTableSummary(save_path, table_headers, table_data):
@@ -384,13 +385,7 @@ class TsfSummaryCheck():
         Exception:
             OSError - if file error is raised while walking directories.
         """
-        tsf_files = []
-        for root, dirs, files in os.walk(model_root):
-            for file in files:
-                fext = os.path.splitext(file)
-                if len(fext) > 1 and fext[1] == '.tsf':
-                    tsf_files.append(os.path.join(root, file))
-        return tsf_files
+        return ri.findArtefacts(model_root, ['tsf'])
     
     def loadTsfData(self, tsf_paths):
         """Load the data required from the given TUFLOW tsf files.
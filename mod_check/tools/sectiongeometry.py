@@ -0,0 +1,161 @@
+'''
+@summary: Cache of FMP river section geometry and hydraulic properties for the result viewers.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import numpy as np
+
+
+def wettedProperties(x, y, levels, include_level=False):
+    """Get the top width and wetted perimeter of a section at a set of water levels.
+
+    Args:
+        x(ndarray): chainage of the section points.
+        y(ndarray): elevation of the section points.
+        levels(ndarray): water levels.
+        include_level=False(bool): if True points at a water level count as
+            wet, giving the values just above the level rather than just below
+            it (they're different if part of the bed is flat at that level).
+
+    Return:
+        tuple(ndarray, ndarray) - the top width and wetted perimeter at each level.
+    """
+    h = levels[:, np.newaxis] - y
+    is_wet = h >= 0 if include_level else h > 0
+    h1 = h[:, :-1]
+    h2 = h[:, 1:]
+    wet1 = is_wet[:, :-1]
+    wet2 = is_wet[:, 1:]
+    dx = np.abs(np.diff(x))
+
+    # Fraction of each segment that is under the water
+    with np.errstate(divide='ignore', invalid='ignore'):
+        wet = np.where(
+            wet1 & wet2, 1.0,
+            np.where(wet1 != wet2, np.maximum(h1, h2) / np.abs(h1 - h2), 0.0)
+        )
+    wet = np.nan_to_num(wet)
+    return (wet * dx).sum(axis=1), (wet * np.hypot(dx, np.diff(y))).sum(axis=1)
+
+
+def sectionTables(x, y):
+    """Get the stage tables for a section.
+
+    Between two bed levels no point of the section goes in or out of the
+    water, so the top width and wetted perimeter change linearly with stage
+    and the area is the integral of the top width. Only the unique bed levels
+    (and the values just above and below each one) are needed for the tables
+    to give the exact values at any stage (see SectionGeometry.properties).
+
+    Args:
+        x(ndarray): chainage of the section points.
+        y(ndarray): elevation of the section points.
+
+    Return:
+        dict - 'levels' (the sorted unique bed levels) and at each level the
+            flow 'area', the 'width' and 'perimeter' just above the level and
+            the 'width_below' and 'perimeter_below' just below it.
+    """
+    levels = np.unique(y)
+    width, perimeter = wettedProperties(x, y, levels, include_level=True)
+    width_below, perimeter_below = wettedProperties(x, y, levels)
+    area = np.zeros(len(levels))
+    area[1:] = np.cumsum(np.diff(levels) * (width[:-1] + width_below[1:]) / 2)
+    return {
+        'levels': levels, 'area': area, 'width': width, 'perimeter': perimeter,
+        'width_below': width_below, 'perimeter_below': perimeter_below,
+    }
+
+
+class SectionGeometry():
+    """The active geometry of a river section and its stage tables.
+
+    x and y are the active part of the section (between any deactivation
+    markers). tables holds the stage tables built by sectionTables.
+    """
+
+    def __init__(self, name, x, y):
+        self.name = name
+        self.x = np.ascontiguousarray(x, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.tables = sectionTables(self.x, self.y)
+
+    def properties(self, stage):
+        """Get the hydraulic properties of the section at a stage.
+
+        Looked up in the stage tables rather than calculated from the
+        geometry. Above the top of the section the sides are treated as
+        vertical, so the top width and wetted perimeter stay the same.
+
+        Args:
+            stage(float): the water level.
+
+        Return:
+            dict - 'area', 'perimeter' and 'width' (0 if the stage is below
+                the bed).
+        """
+        tables = self.tables
+        levels = tables['levels']
+        if stage <= levels[0]:
+            return {'area': 0.0, 'perimeter': 0.0, 'width': 0.0}
+        i = int(np.searchsorted(levels, stage)) - 1
+        if i == len(levels) - 1:
+            width = tables['width'][i]
+            perimeter = tables['perimeter'][i]
+        else:
+            # Linear between the values just above this level and just below the next
+            t = (stage - levels[i]) / (levels[i + 1] - levels[i])
+            width = tables['width'][i] + t * (tables['width_below'][i + 1] - tables['width'][i])
+            perimeter = tables['perimeter'][i] + t * (
+                tables['perimeter_below'][i + 1] - tables['perimeter'][i]
+            )
+        area = tables['area'][i] + (stage - levels[i]) * (tables['width'][i] + width) / 2
+        return {'area': float(area), 'perimeter': float(perimeter), 'width': float(width)}
+
+
+class SectionGeometryCache():
+    """SectionGeometry for every RIVER section in an FMP .dat file.
+
+    Built once when the .dat file is loaded, so viewing a section at another
+    timestep doesn't need any DataFrame work.
+    """
+
+    def __init__(self, dat=None):
+        self.sections = {}
+        if dat is not None:
+            self.build(dat)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __contains__(self, name):
+        return name in self.sections
+
+    def build(self, dat):
+        """Read the active geometry of every RIVER section.
+
+        Args:
+            dat(DAT): the floodmodeller_api DAT.
+        """
+        self.sections = {}
+        for name, unit in dat.sections.items():
+            if unit.unit != 'RIVER':
+                continue
+            try:
+                data = unit.active_data
+                x = data['X'].to_numpy(dtype=np.float64)
+                y = data['Y'].to_numpy(dtype=np.float64)
+            except (TypeError, KeyError, ValueError, AttributeError):
+                continue
+            if len(x) < 2:
+                continue
+            self.sections[name] = SectionGeometry(name, x, y)
+
+    def get(self, name):
+        """Get the SectionGeometry for a section, or None if it isn't a RIVER section."""
+        return self.sections.get(name)
@@ -0,0 +1,302 @@
+'''
+@summary: Follow TUFLOW MB and HPC csv files while a simulation is writing them.
+
+@author: Duncan R.
+@organization: Ermeview Environmental Ltd
+@created 17th October 2026
+@copyright: Ermeview Environmental Ltd
+@license: LGPL v2
+'''
+
+import io
+import os
+import csv
+import time
+import warnings
+
+from PyQt5 import QtCore
+import numpy as np
+
+from . import globaltools as gt
+from . import tuflowstabilitycheck as tmb_check
+
+
+# Milliseconds between checking the followed files for new rows
+POLL_INTERVAL = 2000
+
+# Minimum number of seconds between updates being sent to the graphs
+UPDATE_INTERVAL = 5.0
+
+# Files modified more recently than this (seconds) are treated as active runs
+ACTIVE_RUN_SECONDS = 3600
+
+
+class GrowableArray():
+    """2D float array that rows can be added to without copying every time.
+
+    Space is allocated in blocks that double in size when they're full, so
+    adding rows a few at a time costs about the same overall as loading them
+    all at once.
+    """
+
+    def __init__(self, capacity=1024):
+        self._data = None
+        self._capacity = capacity
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def data(self):
+        """The rows added so far (a view, not a copy)."""
+        if self._data is None:
+            return np.empty((0, 0))
+        return self._data[:self.length]
+
+    def append(self, rows):
+        """Add rows to the end of the array.
+
+        Args:
+            rows(ndarray): 2D array with the same number of columns as any rows
+                already added.
+        """
+        if self._data is None:
+            self._data = np.empty((max(self._capacity, len(rows)), rows.shape[1]))
+        needed = self.length + len(rows)
+        if needed > len(self._data):
+            capacity = len(self._data)
+            while capacity < needed:
+                capacity *= 2
+            grown = np.empty((capacity, self._data.shape[1]))
+            grown[:self.length] = self._data[:self.length]
+            self._data = grown
+        self._data[self.length:needed] = rows
+        self.length = needed
+
+    def clear(self):
+        self._data = None
+        self.length = 0
+
+
+class CsvTailReader():
+    """Read the rows added to a csv file since it was last read.
+
+    The byte offset reached in the file is kept, so each poll only reads and
+    parses the new part of the file. A simulation may be part way through
+    writing a line when the file is read, so anything after the last line
+    ending is held back until the rest of the line has been written.
+
+    The first line is treated as the header. Subclasses can override
+    _parseHeader and _parseRows to choose and convert the columns. Rows that
+    can't be parsed (e.g. a value written as '*****') are skipped and counted
+    in skipped_rows.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = GrowableArray()
+        self.reset()
+
+    def reset(self):
+        """Forget everything read so far, so the file is read from the start."""
+        self.offset = 0
+        self.header = None
+        self.use_cols = None
+        self._partial = b''
+        self.skipped_rows = 0
+        self.rows.clear()
+
+    @property
+    def data(self):
+        return self.rows.data
+
+    def poll(self):
+        """Read and parse any complete rows added since the last poll.
+
+        If the file has got smaller (e.g. the run has been restarted) it's
+        read again from the start.
+
+        Return:
+            int - the number of new rows.
+        """
+        try:
+            size = os.stat(gt.longPathCheck(self.path)).st_size
+        except OSError:
+            return 0
+        if size < self.offset:
+            self.reset()
+        if size == self.offset:
+            return 0
+
+        with open(gt.longPathCheck(self.path), 'rb') as infile:
+            infile.seek(self.offset)
+            new_bytes = infile.read(size - self.offset)
+        text = self._partial + new_bytes
+        line_end = text.rfind(b'\n')
+        if line_end < 0:
+            self._partial = text
+            self.offset += len(new_bytes)
+            return 0
+        lines = text[:line_end + 1]
+
+        header = self.header
+        if header is None:
+            header_end = lines.find(b'\n')
+            header = next(csv.reader([lines[:header_end].decode('utf-8', 'replace')]), [])
+            lines = lines[header_end + 1:]
+            self._parseHeader(header)
+
+        rows = None
+        if lines.strip():
+            try:
+                rows = self._parseRows(lines)
+            except ValueError:
+                rows = self._parseLines(lines)
+        self.header = header
+        self._partial = text[line_end + 1:]
+        self.offset += len(new_bytes)
+        if rows is None or len(rows) == 0:
+            return 0
+        self.rows.append(rows)
+        return len(rows)
+
+    def _parseHeader(self, header):
+        """Set up anything needed from the header row before rows are parsed."""
+        pass
+
+    def _parseLines(self, lines):
+        """Parse complete csv lines one at a time, skipping any that fail.
+
+        Used when _parseRows fails on a block of lines, so that one bad row
+        doesn't stop the rest of the file being read. Rows with a different
+        number of columns to the rows already read are skipped too.
+
+        Return:
+            ndarray - 2D float array of the rows that could be parsed, or None.
+        """
+        width = self.rows.data.shape[1] if len(self.rows) > 0 else None
+        parsed = []
+        for line in lines.splitlines(keepends=True):
+            if not line.strip():
+                continue
+            try:
+                row = self._parseRows(line)
+            except ValueError:
+                self.skipped_rows += 1
+                continue
+            if width is None:
+                width = row.shape[1]
+            if row.shape[1] != width:
+                self.skipped_rows += 1
+                continue
+            parsed.append(row)
+        if not parsed:
+            return None
+        return np.vstack(parsed)
+
+    def _parseRows(self, lines):
+        """Parse complete csv lines (bytes) into a 2D float array."""
+        with warnings.catch_warnings():
+            # numpy warns if there are no data rows
+            warnings.simplefilter('ignore', UserWarning)
+            return np.loadtxt(
+                io.BytesIO(lines), delimiter=',', usecols=self.use_cols, ndmin=2,
+                dtype=np.float64
+            )
+
+
+class MbTailReader(CsvTailReader):
+    """Follow a TUFLOW MB/MB1D/MB2D.csv file, keeping only the wanted columns."""
+
+    def __init__(self, mb_path, headers):
+        self.headers = ['Time (h)'] + [h for h in headers if h != 'Time (h)']
+        self._data_cols = {}
+        super().__init__(mb_path)
+
+    def _parseHeader(self, header):
+        col_lookup = tmb_check.mbColumnLookup(header, self.headers)
+        self.use_cols = sorted(set(col_lookup.values()))
+        index = {col: i for i, col in enumerate(self.use_cols)}
+        self._data_cols = {h: index[col] for h, col in col_lookup.items()}
+
+    def series(self):
+        """Get the rows read so far in the same format as TuflowStabilityCheck.loadMbFile.
+
+        Return:
+            dict - {header: 1D array view}, or None if there are less than two rows.
+        """
+        data = self.data
+        if len(data) < 2:
+            return None
+        return {h: data[:, col] for h, col in self._data_cols.items()}
+
+
+class HpcTailReader(CsvTailReader):
+    """Follow a TUFLOW hpc.dt.csv file.
+
+    data is in the same format as TuflowHpcCheck.loadHpcFile, with the time in
+    column 1 converted from seconds to hours.
+    """
+
+    def _parseRows(self, lines):
+        rows = super()._parseRows(lines)
+        rows[:, 1] /= 3600
+        return rows
+
+
+class RunMonitor(QtCore.QObject):
+    """Poll a set of CsvTailReader's and report when they have new rows.
+
+    Checking a file that hasn't changed is a single os.stat call, so dozens of
+    runs can be followed at once. updated is emitted with the keys of the
+    readers that have new rows, no more often than every update_interval
+    seconds, so the graphs aren't redrawn more than they need to be.
+    """
+    updated = QtCore.pyqtSignal(list)
+
+    def __init__(self, parent=None, poll_interval=POLL_INTERVAL, update_interval=UPDATE_INTERVAL):
+        super().__init__(parent)
+        self.readers = {}
+        self.update_interval = update_interval
+        self._pending = set()
+        self._last_update = 0
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(poll_interval)
+        self.timer.timeout.connect(self.poll)
+
+    def follow(self, key, reader):
+        """Start following a reader, replacing any with the same key."""
+        self.readers[key] = reader
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def unfollow(self, key):
+        self.readers.pop(key, None)
+        self._pending.discard(key)
+        if not self.readers:
+            self.timer.stop()
+
+    def unfollowAll(self, key_filter=None):
+        """Stop following every reader, or those with keys matching key_filter.
+
+        Args:
+            key_filter=None(func): called with each key, return True to unfollow.
+        """
+        for key in list(self.readers.keys()):
+            if key_filter is None or key_filter(key):
+                self.unfollow(key)
+
+    def poll(self):
+        for key, reader in list(self.readers.items()):
+            try:
+                if reader.poll() > 0:
+                    self._pending.add(key)
+            except (OSError, ValueError):
+                # File can't be read or a bad header. It will be tried again next poll
+                pass
+        if self._pending and time.perf_counter() - self._last_update >= self.update_interval:
+            keys = list(self._pending)
+            self._pending.clear()
+            self._last_update = time.perf_counter()
+            self.updated.emit(keys)
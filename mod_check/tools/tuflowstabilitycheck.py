@@ -14,11 +14,112 @@
 import os
 import sys
 import csv
+import time
+import sqlite3
+import warnings
 from pprint import pprint
 from PyQt5 import QtCore
 import numpy as np
 
 from . import globaltools as gt
+from . import resultcache as rcache
+from . import decimation
+from . import resultsindex as ri
+
+
+# Cumulative mass error (%) outside of +/- this value is a fail
+MB_FAIL_LIMIT = 1
+
+# Maximum number of points in the series kept for the summary graph
+PREVIEW_POINTS = 2000
+
+# Minimum number of seconds between load progress status updates
+STATUS_INTERVAL = 0.25
+
+# Maximum recommended values of the HPC control numbers (as drawn on the graph)
+HPC_LIMITS = {'nu': 1.0, 'nc': 1.0, 'nd': 0.3}
+
+# Default timestep (seconds) below which a run is considered to be struggling
+DT_THRESHOLD = 0.1
+
+
+def loadSummaries(files, kind, summarise, args, from_cache, to_cache, use_cache=True,
+                  max_workers=None, status_callback=None, label=''):
+    """Get the summaries of a set of result files, using the resultcache where possible.
+
+    Used by the MB and HPC loadMultipleFiles. Summaries of files that haven't
+    changed since they were last loaded are taken from the resultcache. The
+    rest are calculated in a process pool (see globaltools.mapInProcesses)
+    and added to the cache.
+
+    Args:
+        files(list): result file paths.
+        kind(str): the resultcache summary kind (e.g. MB_SUMMARY).
+        summarise(func): module level function, called as summarise(path, *args)
+            to get the summary of a file. The summary must contain 'error'.
+        args(list): extra arguments for summarise.
+        from_cache(func): called with (path, summary, preview) for each stored
+            summary. Returns the summary to use, or None to load the file again.
+        to_cache(func): called with each new summary. Returns the (summary,
+            preview) to store.
+        use_cache=True(bool): if False every file is loaded and the cache
+            isn't used or updated.
+        max_workers=None(int): number of processes. Defaults to the number
+            of CPUs.
+        status_callback=None(func): called with status update messages.
+        label=''(str): the file type used in the status messages.
+
+    Return:
+        list - the summaries, in the same order as files.
+    """
+    def updateStatus(status):
+        if status_callback is not None:
+            status_callback(status)
+
+    total = len(files)
+    cache = None
+    keys = [rcache.cacheKey(path) for path in files]
+    summaries = [None] * total
+    if use_cache:
+        try:
+            cache = rcache.ResultSummaryCache()
+            cached = cache.getMany(kind, keys)
+        except (OSError, sqlite3.Error):
+            if cache is not None:
+                cache.close()
+            cache = None
+            cached = {}
+        for i, key in enumerate(keys):
+            entry = cached.get(key)
+            if entry is not None:
+                summaries[i] = from_cache(files[i], *entry)
+
+    to_load = [i for i, summary in enumerate(summaries) if summary is None]
+    if use_cache:
+        updateStatus('Found {0} unchanged {1} files, loading {2} ...'.format(
+            total - len(to_load), label, len(to_load)
+        ))
+    new_entries = []
+    last_status = 0
+    loaded = gt.mapInProcesses(
+        summarise, [files[i] for i in to_load], *args, max_workers=max_workers
+    )
+    for done, (i, summary) in enumerate(zip(to_load, loaded), 1):
+        if time.perf_counter() - last_status > STATUS_INTERVAL:
+            updateStatus('Loading {0} file {1} of {2}'.format(label, done, len(to_load)))
+            last_status = time.perf_counter()
+        summaries[i] = summary
+        if not summary['error'] and keys[i] is not None:
+            new_entries.append((keys[i],) + tuple(to_cache(summary)))
+
+    if cache is not None:
+        try:
+            cache.addMany(kind, new_entries)
+        except sqlite3.Error:
+            pass
+        finally:
+            cache.close()
+    return summaries
 
 
 class TuflowHpcCheck(QtCore.QObject):
@@ -38,19 +139,12 @@ class TuflowHpcCheck(QtCore.QObject):
         }
         
     def findHpcFiles(self, root_folder):
-        """
-        """
-        hpc_paths = []
-        for root, dirs, files in os.walk(root_folder):
-            self.status_signal.emit('Searching folder {0} ...'.format(root))
-            for f in files:
-                filepath = os.path.join(root,f)
-
-                # Skip the differently formatted files for section MB
-                if 'hpc.dt.csv' in filepath:
-                    hpc_paths.append(filepath)
+        """Find all of the hpc.dt.csv files under root_folder.
 
-        return hpc_paths
+        Uses the shared results index, so the folders are only read if they
+        have changed since they were last searched (by any of the tools).
+        """
+        return ri.findArtefacts(root_folder, ['hpc'], self.status_signal.emit)
     
     def seriesColumn(self, column_name):
         if not column_name in self.series_columns.keys():
@@ -70,14 +164,153 @@ class TuflowHpcCheck(QtCore.QObject):
         Return:
             nparray: containing the loaded series data
         """
-        
-        # use_cols = (1, 2, 3, 4, 5, 6, 7)
-        converters = {
-            1: lambda x: float(x.strip()) / 3600
-        }
-        self.series_data = np.loadtxt(hpc_path, delimiter=',', skiprows=1, converters=converters)
+        self.series_data = readHpcFile(hpc_path)
         return self.series_data
-            
+
+    def loadMultipleFiles(self, hpc_files, dt_threshold=DT_THRESHOLD, max_workers=None,
+                          use_cache=True):
+        """Load the summary of a set of hpc.dt.csv files, ranked by timestep collapse.
+
+        Works in the same way as TuflowStabilityCheck.loadMultipleFiles. Summaries
+        of unchanged files (calculated with the same dt_threshold) come from the
+        resultcache and the rest are calculated with summariseHpcFile in a
+        process pool.
+
+        The results are ranked with the runs that spent the longest with a
+        timestep below dt_threshold first, then by the smallest timestep.
+
+        Args:
+            hpc_files(list): file paths of the hpc.dt.csv files.
+            dt_threshold=DT_THRESHOLD(float): timestep (seconds) to report the
+                time spent below.
+            max_workers=None(int): number of processes. Defaults to the number
+                of CPUs.
+            use_cache=True(bool): if False every file is loaded and the cache
+                isn't used or updated.
+
+        Return:
+            tuple(list, dict) - the ranked summaries of the loaded files and the
+                files that failed to load as {'error': [], 'empty': []}.
+        """
+        def fromCache(hpc, summary, preview):
+            if summary['dt_threshold'] != dt_threshold:
+                return None
+            return dict(summary, path=hpc, name=hpcRunName(hpc), error='')
+
+        def toCache(summary):
+            return {k: v for k, v in summary.items() if k not in ('path', 'name', 'error')}, None
+
+        total = len(hpc_files)
+        summaries = loadSummaries(
+            hpc_files, rcache.HPC_SUMMARY, summariseHpcFile, [dt_threshold], fromCache, toCache,
+            use_cache, max_workers, self.status_signal.emit, 'HPC'
+        )
+
+        results = []
+        failed_load = {'error': [], 'empty': []}
+        for summary in summaries:
+            if summary['error']:
+                failed_load['error'].append('[Chars {0}] {1}'.format(len(summary['path']), summary['path']))
+            elif summary['empty']:
+                failed_load['empty'].append(summary['path'])
+            else:
+                results.append(summary)
+        results.sort(key=lambda r: (-r['time_below_dt'], r['min_dt']))
+
+        self.status_signal.emit('Loaded {0} files out of {1}'.format(len(results), total))
+        return results, failed_load
+
+
+def readHpcFile(hpc_path):
+    """Read a TUFLOW hpc.dt.csv file into a 2D array.
+
+    The file is parsed in a single np.loadtxt call and the time column is
+    converted from seconds to hours afterwards, rather than calling a
+    converter function on every cell.
+
+    Args:
+        hpc_path(str): file path for the hpc dt log file (hpc.dt.csv)
+
+    Return:
+        ndarray - the file contents with one row per timestep. Column 1 (tEnd)
+            is in hours.
+    """
+    with warnings.catch_warnings():
+        # numpy warns if there are no data rows
+        warnings.simplefilter('ignore', UserWarning)
+        data = np.loadtxt(
+            gt.longPathCheck(hpc_path), delimiter=',', skiprows=1, ndmin=2, dtype=np.float64
+        )
+    if data.size > 0:
+        data[:, 1] /= 3600
+    return data
+
+
+def hpcRunName(hpc_path):
+    name = os.path.split(hpc_path)[1]
+    return name[:-len('.hpc.dt.csv')] if name.lower().endswith('.hpc.dt.csv') else name
+
+
+def summariseHpcFile(hpc_path, dt_threshold=DT_THRESHOLD):
+    """Load an hpc.dt.csv file and calculate the timestep collapse metrics.
+
+    Used by TuflowHpcCheck.loadMultipleFiles in worker processes, so only
+    the metrics are sent back rather than the full series.
+
+    Args:
+        hpc_path(str): file path for the hpc dt log file.
+        dt_threshold=DT_THRESHOLD(float): timestep (seconds) to report the
+            time spent below.
+
+    Return:
+        dict - containing:
+            'path', 'name': the file path and run name.
+            'steps', 'end_time': the number of timesteps and the last tEnd (h).
+            'min_dt', 'min_dt_time': the smallest timestep (s) and the tEnd
+                (h) it occurred at.
+            'dt_threshold': the threshold used.
+            'steps_below_dt', 'time_below_dt': the number of timesteps and the
+                simulated time (h) spent with a timestep below dt_threshold.
+            'nu_exceeded', 'nc_exceeded', 'nd_exceeded': number of timesteps
+                with the control number above the HPC_LIMITS.
+            'eff_p5', 'eff_p50': the 5th percentile and median efficiency (%).
+            'empty': True if the file contained no data.
+            'error': the error message if the file couldn't be loaded.
+    """
+    summary = {
+        'path': hpc_path, 'name': hpcRunName(hpc_path), 'steps': 0, 'end_time': None,
+        'min_dt': None, 'min_dt_time': None, 'dt_threshold': dt_threshold,
+        'steps_below_dt': 0, 'time_below_dt': 0.0, 'nu_exceeded': 0, 'nc_exceeded': 0,
+        'nd_exceeded': 0, 'eff_p5': None, 'eff_p50': None, 'empty': False, 'error': '',
+    }
+    try:
+        data = readHpcFile(hpc_path)
+    except Exception as err:
+        summary['error'] = str(err)
+        return summary
+    if len(data) == 0 or data.shape[1] < 8:
+        summary['empty'] = True
+        return summary
+
+    dt = data[:, 3]
+    below = dt < dt_threshold
+    min_index = int(dt.argmin())
+    eff_p5, eff_p50 = np.percentile(data[:, 7], [5, 50])
+    summary.update({
+        'steps': len(data),
+        'end_time': float(data[-1, 1]),
+        'min_dt': float(dt[min_index]),
+        'min_dt_time': float(data[min_index, 1]),
+        'steps_below_dt': int(below.sum()),
+        'time_below_dt': float(dt[below].sum() / 3600),
+        'nu_exceeded': int((data[:, 4] > HPC_LIMITS['nu']).sum()),
+        'nc_exceeded': int((data[:, 5] > HPC_LIMITS['nc']).sum()),
+        'nd_exceeded': int((data[:, 6] > HPC_LIMITS['nd']).sum()),
+        'eff_p5': float(eff_p5),
+        'eff_p50': float(eff_p50),
+    })
+    return summary
+
 
 def getMbHeaders(mb_path):
     """Get the column headers to load for a specific MB file type.
@@ -117,6 +350,144 @@ def getMbHeaders(mb_path):
     return headers, mb_type, filename
 
 
+def mbColumnLookup(header_row, headers):
+    """Find the column for each header in an MB file header row.
+
+    Headers that aren't in the file get the last column (the same as indexing
+    each row with the -1 default in the old csv loader).
+
+    Args:
+        header_row(list): the column names from the first row of the file.
+        headers(list): header strings for the columns to load.
+
+    Return:
+        dict - {header: column index}.
+    """
+    header_cols = {}
+    for i, col in enumerate(header_row):
+        header_cols[col.strip()] = i
+    last_col = max(len(header_row) - 1, 0)
+    return {h: header_cols.get(h, last_col) for h in headers}
+
+
+def readMbColumns(mb_path, headers):
+    """Load columns from a TUFLOW MB/MB1D/MB2D.csv file into numpy arrays.
+
+    The header row is read first to find the column for each header. The rest
+    of the file is then parsed in one go by numpy, converting only those
+    columns, so the cost of a file doesn't depend on how many columns aren't
+    needed.
+
+    Args:
+        mb_path(str): file path for the mass balance results file.
+        headers(list): header strings for the columns to load.
+
+    Return:
+        dict - {header: 1D float array} for each header, or None if the file
+            contains less than two rows of data.
+    """
+    with open(gt.longPathCheck(mb_path), 'r') as mb_file:
+        header_row = next(csv.reader([mb_file.readline()]), [])
+        col_lookup = mbColumnLookup(header_row, headers)
+        use_cols = sorted(set(col_lookup.values()))
+
+        with warnings.catch_warnings():
+            # numpy warns if there are no data rows, which is handled below
+            warnings.simplefilter('ignore', UserWarning)
+            data = np.loadtxt(
+                mb_file, delimiter=',', usecols=use_cols, ndmin=2, dtype=np.float64
+            )
+
+    # Return None if there is no data in the file
+    if data.shape[0] < 2:
+        return None
+    data_cols = {col: i for i, col in enumerate(use_cols)}
+    return {h: np.ascontiguousarray(data[:, data_cols[col]]) for h, col in col_lookup.items()}
+
+
+def previewSeries(series, max_points=PREVIEW_POINTS):
+    """Reduce a set of series, sharing the same time axis, for plotting.
+
+    The rows holding the minimum and maximum value of each series in equal
+    sized buckets are kept (see decimation.minMaxIndices), so spikes still
+    show up when the preview is plotted.
+
+    Args:
+        series(dict): {header: 1D array}, all the same length.
+        max_points=PREVIEW_POINTS(int): approximate number of rows to keep.
+
+    Return:
+        dict - {header: 1D array} containing the kept rows.
+    """
+    length = len(next(iter(series.values())))
+    if length <= max_points:
+        return series
+    buckets = max(max_points // (2 * len(series)), 1)
+    keep = decimation.sharedMinMaxIndices(list(series.values()), buckets)
+    return {h: values[keep] for h, values in series.items()}
+
+
+def mbRunName(mb_path):
+    return os.path.splitext(os.path.split(mb_path)[1])[0]
+
+
+def mbStatus(cum_me):
+    """Get the largest cumulative mass error and whether it fails.
+
+    Args:
+        cum_me(array): the Cum ME (%) series.
+
+    Return:
+        tuple(float, bool) - the Cum ME with the largest magnitude (rounded to 2
+            decimal places) and True if it's outside of the MB_FAIL_LIMIT.
+    """
+    max_mb = cum_me.max()
+    min_mb = cum_me.min()
+    big_mb = round(float(max_mb), 2) if max_mb > -min_mb else round(float(min_mb), 2)
+    return big_mb, big_mb > MB_FAIL_LIMIT or big_mb < -MB_FAIL_LIMIT
+
+
+def summariseMbFile(mb_path, headers=['Cum ME (%)', 'dVol']):
+    """Load an MB file and reduce it to what's needed for the summary table.
+
+    Used by TuflowStabilityCheck.loadMultipleFiles in worker processes, so
+    only the summary and a small preview of the series are sent back rather
+    than the full series.
+
+    Args:
+        mb_path(str): file path for the mass balance results file.
+        headers(list): series to include in the preview. Time is always included.
+
+    Return:
+        dict - containing:
+            'path', 'name': the file path and run name.
+            'max_mb': the Cum ME (%) with the largest magnitude (rounded).
+            'fail': True if max_mb is outside of the MB_FAIL_LIMIT.
+            'data': the previewSeries of the loaded series.
+            'empty': True if the file contained no data.
+            'error': the error message if the file couldn't be loaded.
+    """
+    summary = {
+        'path': mb_path, 'name': mbRunName(mb_path),
+        'max_mb': None, 'fail': False, 'data': None, 'empty': False, 'error': '',
+    }
+    load_headers = ['Time (h)'] + [h for h in headers if h != 'Time (h)']
+    if 'Cum ME (%)' not in load_headers:
+        load_headers.append('Cum ME (%)')
+    try:
+        contents = readMbColumns(mb_path, load_headers)
+    except Exception as err:
+        summary['error'] = str(err)
+        return summary
+    if contents is None:
+        summary['empty'] = True
+        return summary
+
+    summary['max_mb'], summary['fail'] = mbStatus(contents['Cum ME (%)'])
+    summary['data'] = previewSeries(contents)
+    return summary
+
+
 def getIndividualMbSeriesPresets(series_type, mb_type):
     """Get preset graph series configurations.
     
@@ -172,52 +543,81 @@ class TuflowStabilityCheck(QtCore.QObject):
         super().__init__()
     
     def findMbFiles(self, root_folder, mb_types=['_MB']):
+        """Find all of the MB files of the given types under root_folder.
+
+        Section MB files (_1d_MB.csv) are formatted differently and aren't
+        included. Uses the shared results index (see findHpcFiles).
+
+        Args:
+            root_folder(str): the folder to search.
+            mb_types=['_MB'](list): any of '_MB', '_MB1D' and '_MB2D'.
         """
-        """
-        mb_paths = []
-        for root, dirs, files in os.walk(root_folder):
-            self.status_signal.emit('Searching folder {0} ...'.format(root))
-            for f in files:
-                filepath = os.path.join(root,f)
-                # Skip the differently formatted files for section MB
-                if '_1d_MB.csv' in filepath: continue
-                # Otherwise grab the file path
-                for mbt in mb_types:
-                    if mbt + '.csv' in filepath:
-                        mb_paths.append(filepath)
-        return mb_paths
+        kinds = [ri.MB_TYPE_KINDS[mbt] for mbt in mb_types if mbt in ri.MB_TYPE_KINDS]
+        return ri.findArtefacts(root_folder, kinds, self.status_signal.emit)
     
-    def loadMultipleFiles(self, mb_files, headers=['Cum ME (%)', 'dVol']):
+    def loadMultipleFiles(self, mb_files, headers=['Cum ME (%)', 'dVol'], max_workers=None,
+                          use_cache=True):
+        """Load the summary of a set of MB files for the summary table and graph.
+
+        Summaries of files that haven't changed since they were last loaded
+        are taken from the resultcache. The rest are loaded and summarised 
+        (see summariseMbFile) in a process pool so that only the summary and
+        a preview of the series for the graph come back to this process, then
+        added to the cache. The full series are loaded with loadMbFile when a
+        single run is selected.
+
+        If the process pool can't be started the files are loaded here instead.
+
+        Args:
+            mb_files(list): file paths of the MB files.
+            headers(list): series to include in the previews.
+            max_workers=None(int): number of processes. Defaults to the number
+                of CPUs.
+            use_cache=True(bool): if False every file is loaded and the cache
+                isn't used or updated.
+
+        Return:
+            tuple(list, dict) - the summaries of the loaded files and the files
+                that failed to load as {'error': [], 'empty': []}.
+        """
         results = []
         failed_load = {'error': [], 'empty': []}
         total = len(mb_files)
         count = 0
         empty_count = 0
         fail_count = 0
-        for mb in mb_files:
-            self.status_signal.emit('Loading MB file {0} of {1}'.format(count, total))
-            try:
-                contents = self.loadMbFile(mb, headers)
-                if contents is not None:
-                    run_name = os.path.split(mb)[1]
-                    run_name = os.path.splitext(run_name)[0]
-                    max_mb = max(contents['Cum ME (%)'])
-                    min_mb = min(contents['Cum ME (%)'])
-                    big_mb = round(max_mb, 2) if max_mb > -min_mb else round(min_mb, 2)
-                    fail = big_mb > 1 or big_mb < -1
-                    results.append({
-                        'path': mb, 'name': run_name, 'data': contents, 'max_mb': big_mb,
-                        'fail': fail,
-                    })
-                    count += 1
-                else:
-                    empty_count += 1
-                    failed_load['empty'].append(mb)
-            except Exception as err:
+
+        def fromCache(mb, summary, preview):
+            # The cached preview may not have all of the series wanted now
+            if not summary['empty'] and not all(h in preview for h in headers):
+                return None
+            return dict(summary, path=mb, name=mbRunName(mb), data=preview, error='')
+
+        def toCache(summary):
+            return {
+                'max_mb': summary['max_mb'], 'fail': summary['fail'], 'empty': summary['empty'],
+            }, summary['data']
+
+        summaries = loadSummaries(
+            mb_files, rcache.MB_SUMMARY, summariseMbFile, [headers], fromCache, toCache,
+            use_cache, max_workers, self.status_signal.emit, 'MB'
+        )
+
+        for summary in summaries:
+            if summary['error']:
                 fail_count += 1
-                plen = len(mb)
-                txt = '[Chars {0}] {1}'.format(plen, mb)
+                plen = len(summary['path'])
+                txt = '[Chars {0}] {1}'.format(plen, summary['path'])
                 failed_load['error'].append(txt)
+            elif summary['empty']:
+                empty_count += 1
+                failed_load['empty'].append(summary['path'])
+            else:
+                results.append({
+                    'path': summary['path'], 'name': summary['name'], 'data': summary['data'],
+                    'max_mb': summary['max_mb'], 'fail': summary['fail'],
+                })
+                count += 1
 
         if empty_count > 0 or fail_count > 0:
             self.status_signal.emit('Loaded {0} files out of {1} ({2} files were empty and {3} failed to load)'.format(
@@ -243,36 +643,10 @@ class TuflowStabilityCheck(QtCore.QObject):
                 automatically.
         
         Return:
-            Dict containing {time, header1, header2, etc} for the loaded file.
+            Dict containing {time, header1, header2, etc} for the loaded file,
+            with each series as a numpy array, or None if the file has no data.
         """
-        results = {'Time (h)': []}
-        col_lookup = {'Time (h)': -1}
-        for h in headers:
-            results[h] = []
-            col_lookup[h] = -1
-
-        mb_path = gt.longPathCheck(mb_path)
-        with open(mb_path, 'r') as mb_file:
-            reader = csv.reader(mb_file, delimiter=',')
-            count = 0
-            for r in reader:
-                if count == 0:
-                    # This is a dirty approach but there will only ever be about 20
-                    # columns and it's only run on one row so it shouldn't take too long
-                    for i, col in enumerate(r):
-                        strip_col = col.strip()
-                        for l in col_lookup.keys():
-                            if l == strip_col: col_lookup[l] = i 
-                else:
-                    for res in results.keys():
-                        results[res].append(float(r[col_lookup[res]]))
-                count += 1
-                
-        # Return None if there is no data in the file
-        if len(results['Time (h)']) < 2:
-            return None
-        else:
-            return results
+        return readMbColumns(mb_path, ['Time (h)'] + [h for h in headers if h != 'Time (h)'])
         
 
     
\ No newline at end of file